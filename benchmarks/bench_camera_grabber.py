@@ -0,0 +1,91 @@
+"""
+Camera Grabber Benchmarks
+-------------------------
+Simulates a 30 fps 720p camera whose driver keeps the last 4 frames queued (as V4L2 does) and a control
+loop that spends 50 ms per iteration on other work. Compares the synchronous SensorInput.get_camera_data
+path (read on the caller's thread, BGR->RGB, PIL) with the background CameraGrabber (latest frame from a
+preallocated ring, no copy, colour conversion left to the consumer), reporting how long the loop blocks on
+the camera and how old the frame it gets is.
+Run from the repository root with: python benchmarks/bench_camera_grabber.py
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from sensor import SensorInput
+
+
+class SimulatedCamera:
+    """
+    Produces frames at a fixed rate into a driver queue of limited depth; read() returns the oldest queued
+    frame, blocking until one exists. Every frame carries its index in its first pixels.
+    """
+    def __init__(self, shape=(720, 1280, 3), fps=30.0, driver_buffers=4):
+        self.period = 1.0 / fps
+        self.driver_buffers = driver_buffers
+        self.source = np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+        self.start = time.monotonic()
+        self.next_index = 0
+
+    def capture_time(self, index):
+        return self.start + index * self.period
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        produced = int((time.monotonic() - self.start) / self.period)
+        self.next_index = max(self.next_index, produced - self.driver_buffers + 1)  # The driver dropped older frames
+        time.sleep(max(0.0, self.capture_time(self.next_index) - time.monotonic()))
+        if image is None:
+            image = np.empty_like(self.source)
+        np.copyto(image, self.source)  # Stands in for decoding into the buffer
+        image.reshape(-1)[:8] = np.frombuffer(np.int64(self.next_index).tobytes(), dtype=np.uint8)
+        self.next_index += 1
+        return True, image
+
+    def frame_age(self, frame):
+        index = int(np.frombuffer(np.ascontiguousarray(frame.reshape(-1)[:8]).tobytes(), dtype=np.int64)[0])
+        return time.monotonic() - self.capture_time(index)
+
+    def release(self):
+        pass
+
+
+def control_loop(camera, get_frame, iterations, work=0.05):
+    blocked, ages = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        frame = get_frame()
+        blocked.append(time.perf_counter() - start)
+        ages.append(camera.frame_age(frame))
+        time.sleep(work)  # Detection, planning and control for this iteration
+    return np.array(blocked), np.array(ages)
+
+
+def report(label, blocked, ages):
+    print(f"{label:<28} blocked {blocked.mean() * 1e3:6.2f} ms mean, {blocked.max() * 1e3:6.2f} ms max; "
+          f"frame age {ages.mean() * 1e3:6.1f} ms mean, {ages.max() * 1e3:6.1f} ms max")
+
+
+def bench_grabber(iterations=60):
+    camera = SimulatedCamera()
+    with patch('cv2.VideoCapture', return_value=camera):
+        synchronous = SensorInput(camera_index=0, lidar_config={})
+    # Flipping the RGB image back to BGR restores the frame index the camera wrote
+    get_camera_data = lambda: np.asarray(synchronous.get_camera_data())[..., ::-1]
+    report("synchronous get_camera_data", *control_loop(camera, get_camera_data, iterations))
+
+    camera = SimulatedCamera()
+    with patch('cv2.VideoCapture', return_value=camera):
+        grabbing = SensorInput(camera_index=0, lidar_config={}, background_capture=True)
+    report("background latest frame", *control_loop(camera, lambda: grabbing.get_latest_frame()[0], iterations))
+    grabbing.grabber.stop()
+
+
+if __name__ == '__main__':
+    bench_grabber()
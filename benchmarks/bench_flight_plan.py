@@ -0,0 +1,239 @@
+"""
+Flight Planner Benchmarks
+-------------------------
+Times roadmap construction in FlightPlanner for growing waypoint counts and compares
+incremental replanning and live-position planning with full replanning, and the networkx
+and CSR graph backends for memory and latency, per-edge against batched weather callbacks, and
+building against loading a saved memory-mapped roadmap.
+Run from the repository root with: python benchmarks/bench_flight_plan.py
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import networkx as nx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from flight_plan import FlightPlanner
+
+NO_FLY_ZONES = np.array([[50, 50, 50], [20, 80, 40], [75, 25, 60]])
+
+
+def legacy_build_graph(planner, waypoints):
+    """
+    The original pairwise builder, kept here as the reference for the speed-up.
+    """
+    edges = 0
+    for point in waypoints:
+        for other_point in waypoints:
+            if np.array_equal(point, other_point):
+                continue
+            if not planner.is_point_in_no_fly_zone((point + other_point) / 2):
+                np.linalg.norm(point - other_point)
+                edges += 1
+    return edges
+
+
+def bench_build_graph(sizes=(10, 100, 1000, 10000, 50000), k_neighbors=10, legacy_limit=300):
+    """
+    Print build time and edge count for each roadmap size, with the legacy builder for small sizes.
+    """
+    print(f"{'waypoints':>10} {'edges':>10} {'knn build (s)':>14} {'legacy (s)':>11}")
+    for size in sizes:
+        start = time.perf_counter()
+        planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=NO_FLY_ZONES,
+                                num_waypoints=size, k_neighbors=k_neighbors)
+        build_time = time.perf_counter() - start
+
+        legacy_time = float('nan')
+        if size <= legacy_limit:
+            start = time.perf_counter()
+            legacy_build_graph(planner, planner.waypoints)
+            legacy_time = time.perf_counter() - start
+        print(f"{size:>10} {planner.graph.number_of_edges():>10} {build_time:>14.4f} {legacy_time:>11.4f}")
+
+
+def bench_incremental_replanning(size=20000, k_neighbors=8, rounds=5, seed=0):
+    """
+    Compare repairing the D* Lite solution after small changes against a full rebuild plus search
+    and against a from-scratch A* search on the unchanged graph.
+    """
+    np.random.seed(seed)
+    planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors, incremental=True)
+    start_node = (0.0, 0.0, 0.0)
+    start = time.perf_counter()
+    path = planner.find_path(start_node)
+    initial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors).find_path(start_node)
+    rebuild_time = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    print(f"{size} waypoints: initial D* Lite {initial_time:.4f}s, full rebuild + A* {rebuild_time:.4f}s")
+    print(f"{'change':>16} {'repair (s)':>11} {'A* only (s)':>12} {'speed-up':>9}")
+    for round_index in range(rounds):
+        if round_index % 2 == 0:
+            # Weather makes a few edges along the current path more expensive
+            edge_ids = planner.edge_ids(path[:-1], path[1:])[:3]
+            planner.update_edge_weights(edge_ids, planner.edge_weights[edge_ids] * rng.uniform(2, 4, len(edge_ids)))
+            change = 'weather x3 edges'
+        else:
+            # A small no-fly zone appears on the current path
+            planner.add_no_fly_zone([path[len(path) // 2]], radii=1.0)
+            change = 'new zone'
+        start = time.perf_counter()
+        path = planner.find_path(start_node)
+        repair_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        nx.astar_path(planner.graph, start_node, tuple(planner.destination), weight='weight')
+        search_time = time.perf_counter() - start
+        print(f"{change:>16} {repair_time:>11.4f} {search_time:>12.4f} {search_time / repair_time:>8.1f}x")
+
+
+def bench_live_positions(size=20000, k_neighbors=8, queries=20, seed=0):
+    """
+    Time planning from random off-graph positions, which attaches the start for one search,
+    against rebuilding the roadmap with the position included.
+    """
+    np.random.seed(seed)
+    planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors)
+    positions = np.random.rand(queries, 3) * 100
+    start = time.perf_counter()
+    for position in positions:
+        planner.find_path(position)
+    attach_time = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors)
+    build_time = time.perf_counter() - start
+    print(f"{size} waypoints: attach + search {attach_time:.4f}s per query, roadmap build alone {build_time:.4f}s")
+
+
+def bench_backends(sizes=(1000, 10000, 50000), k_neighbors=8, queries=10, seed=0):
+    """
+    Report planner memory and path query latency for the networkx and CSR backends side by side.
+    Memory is what tracemalloc sees allocated by planner construction (arrays, node index and graph).
+    """
+    print(f"{'waypoints':>10} {'backend':>9} {'memory (MB)':>12} {'build (s)':>10} {'first query (s)':>16} {'next queries (s)':>17}")
+    for size in sizes:
+        for backend in ('networkx', 'csr'):
+            np.random.seed(seed)
+            tracemalloc.start()
+            planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors, backend=backend)
+            memory = tracemalloc.get_traced_memory()[0] / 1e6
+            tracemalloc.stop()
+            del planner
+
+            np.random.seed(seed)
+            start = time.perf_counter()
+            planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors,
+                                    backend=backend, cache_size=0)
+            build_time = time.perf_counter() - start
+            positions = np.random.rand(queries + 1, 3) * 100
+            start = time.perf_counter()
+            planner.find_path(positions[0])
+            first_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for position in positions[1:]:
+                planner.find_path(position)
+            next_time = (time.perf_counter() - start) / queries
+            print(f"{size:>10} {backend:>9} {memory:>12.1f} {build_time:>10.3f} {first_time:>16.4f} {next_time:>17.4f}")
+
+
+def wind_model(point, other_point):
+    """
+    Per-edge wind model: flying against a westerly wind that strengthens with altitude costs more.
+    """
+    heading = (other_point - point) / np.linalg.norm(other_point - point)
+    wind = np.array([-1.0, 0.0, 0.0]) * (0.2 + 0.004 * (point[2] + other_point[2]))
+    return 1.0 + 0.5 * max(0.0, -float(heading @ wind))
+
+
+def batched_wind_model(starts, ends):
+    """
+    The same wind model evaluated for every edge at once.
+    """
+    headings = (ends - starts) / np.linalg.norm(ends - starts, axis=1)[:, None]
+    strength = 0.2 + 0.004 * (starts[:, 2] + ends[:, 2])
+    return 1.0 + 0.5 * np.maximum(0.0, headings[:, 0] * strength)
+
+
+def bench_weather_callbacks(size=50000, k_neighbors=8, seed=0):
+    """
+    Compare weighting a roadmap with a per-edge callback against the batched callback, and time
+    re-weighting existing edges in place after a weather update.
+    """
+    timings = {}
+    for batched, model in ((False, wind_model), (True, batched_wind_model)):
+        np.random.seed(seed)
+        planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors, backend='csr')
+        edges = len(planner.edge_weights)
+        start = time.perf_counter()
+        planner.reweight_edges(model, batched_weather=batched)
+        timings[batched] = time.perf_counter() - start
+    print(f"{size} waypoints, {edges} edges: per-edge callback {timings[False]:.3f}s, "
+          f"batched callback {timings[True]:.3f}s ({timings[False] / timings[True]:.0f}x)")
+
+
+def private_memory_mb():
+    """
+    Return this process's private (unshared) memory in MB, or NaN where /proc is unavailable.
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as handle:
+            fields = dict(line.split(':', 1) for line in handle if ':' in line)
+        return sum(int(fields[name].split()[0]) for name in ('Private_Clean', 'Private_Dirty')) / 1024
+    except (OSError, KeyError, ValueError):
+        return float('nan')
+
+
+def roadmap_worker(roadmap_path, size, k_neighbors, results):
+    """
+    Start a planner in a fresh process, either by building or by loading a saved roadmap.
+    """
+    before = private_memory_mb()
+    start = time.perf_counter()
+    if roadmap_path is None:
+        planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors,
+                                backend='csr', seed=0)
+    else:
+        planner = FlightPlanner(destination=[100, 100, 100], backend='csr', roadmap_path=roadmap_path)
+    startup = time.perf_counter() - start
+    planner.find_path([0, 0, 0])
+    results.put((startup, private_memory_mb() - before))
+
+
+def bench_saved_roadmaps(size=50000, k_neighbors=8, workers=4):
+    """
+    Compare planner startup by building against loading a memory-mapped saved roadmap, in several
+    worker processes, with the private memory each worker adds.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        FlightPlanner(destination=[100, 100, 100], num_waypoints=size, k_neighbors=k_neighbors,
+                      backend='csr', seed=0).save_roadmap(directory)
+        for label, roadmap_path in (('build', None), ('load mmap', directory)):
+            results = multiprocessing.Queue()
+            processes = [multiprocessing.Process(target=roadmap_worker, args=(roadmap_path, size, k_neighbors, results))
+                         for _ in range(workers)]
+            for process in processes:
+                process.start()
+            measurements = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+            startup, private = np.mean(measurements, axis=0)
+            print(f"{size} waypoints, {label:>9}: startup {startup:.3f}s, private memory per worker {private:.1f} MB")
+
+
+if __name__ == '__main__':
+    bench_build_graph()
+    bench_incremental_replanning()
+    bench_live_positions()
+    bench_backends()
+    bench_weather_callbacks()
+    bench_saved_roadmaps()
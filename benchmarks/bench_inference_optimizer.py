@@ -0,0 +1,71 @@
+"""
+CPU Inference Mode Benchmarks
+-----------------------------
+Reports per-call latency of the camera ResNet-50 and of DecisionNet in eager mode under torch.no_grad()
+(the original path) and in each OptimizedModel configuration, with the relative output error against eager,
+for every intra-op thread count up to the number of CPUs.
+Run from the repository root with: python benchmarks/bench_inference_optimizer.py
+"""
+
+import os
+import sys
+import time
+import torch
+from torchvision import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from decision_net import DecisionNet
+from inference_optimizer import OptimizedModel
+
+CONFIGURATIONS = [
+    ('inference_mode only', dict(trace=False, channels_last=False)),
+    ('channels-last', dict(trace=False, channels_last=True)),
+    ('traced', dict(trace=True, channels_last=False)),
+    ('traced + channels-last', dict(trace=True, channels_last=True)),
+    ('dynamic int8', dict(quantize='dynamic')),
+    ('static int8 (traced)', dict(quantize='static')),
+]
+
+
+def time_call(function, inputs, repeats):
+    function(*inputs)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        outputs = function(*inputs)
+    return (time.perf_counter() - start) / repeats, outputs
+
+
+def bench_model(name, model, inputs, calibration, repeats):
+    def eager(*args):
+        with torch.no_grad():
+            return model(*args)
+
+    baseline, expected = time_call(eager, inputs, repeats)
+    print(f"{name}: eager under no_grad {baseline * 1e3:.2f} ms")
+    for label, options in CONFIGURATIONS:
+        optimized = OptimizedModel(model, inputs, calibration_inputs=calibration, **options)
+        elapsed, outputs = time_call(optimized, inputs, repeats)
+        error = ((outputs - expected).abs().max() / expected.abs().max()).item()
+        print(f"  {label:<24} {elapsed * 1e3:>8.2f} ms  {baseline / elapsed:>5.2f}x  relative error {error:.1e}")
+
+
+def bench_configurations(repeats=10):
+    torch.manual_seed(0)
+    camera = models.resnet50(weights=None).eval()
+    decision = DecisionNet().eval()
+    camera_inputs = (torch.randn(1, 3, 224, 224),)
+    decision_inputs = (torch.randn(1, 3, 64, 64), torch.randn(1, 10))
+    camera_calibration = [(torch.randn(1, 3, 224, 224),) for _ in range(4)]
+    decision_calibration = [(torch.randn(1, 3, 64, 64), torch.randn(1, 10)) for _ in range(16)]
+    cpus = os.cpu_count() or 1
+    for threads in sorted({1, max(1, cpus // 2), cpus}):
+        torch.set_num_threads(threads)
+        print(f"--- {threads} intra-op thread(s) ---")
+        bench_model("ResNet-50 camera model", camera, camera_inputs, camera_calibration, repeats)
+        bench_model("DecisionNet", decision, decision_inputs, decision_calibration, repeats * 20)
+
+
+if __name__ == '__main__':
+    import warnings
+    warnings.simplefilter('ignore')  # FX quantization and TorchScript deprecation notices
+    bench_configurations()
@@ -0,0 +1,63 @@
+"""
+Inference Server Benchmarks
+---------------------------
+Reports throughput and p50/p99 latency of camera inference for a swarm of drones sharing one ResNet-50,
+served one frame per forward pass (batch size 1) and through the micro-batching InferenceServer at several
+batch size and deadline settings. Each simulated drone submits a frame, waits for its result and submits
+the next one, so latency includes queueing behind other drones.
+Run from the repository root with: python benchmarks/bench_inference_server.py
+"""
+
+import os
+import sys
+import threading
+import time
+import numpy as np
+import torch
+from torchvision import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from inference_server import InferenceServer
+
+SETTINGS = [(1, 0.0), (4, 0.005), (4, 0.02), (8, 0.02), (8, 0.05)]
+
+
+def run_swarm(server, frames, drones, frames_per_drone):
+    """
+    Drive the server from one thread per drone and return (throughput, latencies in seconds).
+    """
+    latencies = [[] for _ in range(drones)]
+
+    def drone(index):
+        for step in range(frames_per_drone):
+            start = time.perf_counter()
+            server.submit(frames[(index + step) % len(frames)]).result()
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=drone, args=(i,)) for i in range(drones)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return drones * frames_per_drone / elapsed, np.concatenate(latencies)
+
+
+def bench_batching(drones=8, frames_per_drone=6):
+    model = models.resnet50(weights=None).eval()
+    frames = np.random.default_rng(0).integers(0, 256, (drones, 480, 640, 3), dtype=np.uint8)
+    with InferenceServer(model, max_batch_size=1, max_delay=0.0) as warmup:
+        warmup.submit(frames[0]).result()
+    print(f"ResNet-50, {drones} drones x {frames_per_drone} frames, {torch.get_num_threads()} torch threads")
+    print(f"{'batch':>6} {'deadline ms':>12} {'frames/s':>9} {'mean batch':>11} {'p50 ms':>8} {'p99 ms':>8}")
+    for max_batch_size, max_delay in SETTINGS:
+        with InferenceServer(model, max_batch_size=max_batch_size, max_delay=max_delay) as server:
+            throughput, latencies = run_swarm(server, frames, drones, frames_per_drone)
+            mean_batch = server.stats()['mean_batch_size']
+        print(f"{max_batch_size:>6} {max_delay * 1e3:>12.0f} {throughput:>9.1f} {mean_batch:>11.1f} "
+              f"{np.percentile(latencies, 50) * 1e3:>8.0f} {np.percentile(latencies, 99) * 1e3:>8.0f}")
+
+
+if __name__ == '__main__':
+    bench_batching()
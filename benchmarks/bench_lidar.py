@@ -0,0 +1,70 @@
+"""
+LiDAR Obstacle Extraction Benchmarks
+------------------------------------
+Reports per-scan latency of the geometric LidarObstacleExtractor on 360-beam scans, one scan at a time
+and batched across a swarm, next to the ResNet-50 path used by ObstacleDetector.detect_obstacles_lidar
+(forward pass only, on the scan reshaped to an image-sized input).
+Run from the repository root with: python benchmarks/bench_lidar.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import torch
+from torchvision import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from lidar_processing import LidarObstacleExtractor
+
+
+def synthetic_scans(count, beams=360, seed=0):
+    """
+    Scans of a cluttered scene: blocky objects at random ranges, gaps with no return, and sensor noise.
+    """
+    rng = np.random.default_rng(seed)
+    scans = np.repeat(rng.uniform(1, 60, (count, beams // 12)), 12, axis=1)
+    scans += rng.normal(0, 0.02, scans.shape)
+    scans[rng.random(scans.shape) < 0.1] = np.inf
+    return scans
+
+
+def bench_extraction(scans=2000, fleet_sizes=(16, 256)):
+    extractor = LidarObstacleExtractor()
+    data = synthetic_scans(scans)
+    extractor.extract(data[0])
+    start = time.perf_counter()
+    obstacles = 0
+    for scan in data:
+        obstacles += len(extractor.extract(scan)['distances'])
+    single = (time.perf_counter() - start) / scans
+    print(f"Single scan: {single * 1e6:.1f} us/scan ({obstacles / scans:.1f} obstacles per scan)")
+    for drones in fleet_sizes:
+        batch = data[:drones]
+        repeats = max(1, 2000 // drones)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            extractor.extract_batch(batch)
+        per_scan = (time.perf_counter() - start) / (repeats * drones)
+        print(f"Batched x{drones}: {per_scan * 1e6:.1f} us/scan")
+    return single
+
+
+def bench_neural_reference(repeats=5):
+    model = models.resnet50(weights=None).eval()
+    scan = torch.from_numpy(synthetic_scans(1)[0].clip(0, 100).astype(np.float32))
+    image = torch.nn.functional.interpolate(scan.view(1, 1, 1, -1), size=(224, 224)).expand(1, 3, 224, 224)
+    with torch.no_grad():
+        model(image)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(image)
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"ResNet-50 forward pass: {elapsed * 1e3:.1f} ms/scan")
+    return elapsed
+
+
+if __name__ == '__main__':
+    single = bench_extraction()
+    neural = bench_neural_reference()
+    print(f"Geometric extraction is {neural / single:.0f}x faster per scan")
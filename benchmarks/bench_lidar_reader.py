@@ -0,0 +1,108 @@
+"""
+LiDAR Reader Benchmarks
+-----------------------
+Streams recorded revolutions of an LD06-style LiDAR through a pty standing in for the USB serial adapter
+and measures how fast LidarReader turns the byte stream into published scans, against a straightforward
+reader that reads and decodes one packet at a time with struct and assembles each revolution into a new
+array. Also reports the parse cost per revolution, i.e. the CPU share a real 10 Hz sensor costs.
+Run from the repository root with: python benchmarks/bench_lidar_reader.py
+"""
+
+import os
+import pty
+import struct
+import sys
+import time
+import tty
+from threading import Thread
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from lidar_reader import LidarReader, PACKET_SIZE, POINTS_PER_PACKET, CRC8_TABLE
+
+
+def recorded_stream(revolution_count):
+    rng = np.random.default_rng(0)
+    starts = np.tile(np.arange(0.0, 360.0, 12.0), revolution_count)
+    distances = rng.uniform(0.2, 12.0, (len(starts), POINTS_PER_PACKET))
+    distances[rng.random(distances.shape) < 0.1] = 0  # Some beams see nothing
+    return LidarReader.encode_packets(starts, distances, end_angles=starts + 11.0)
+
+
+def write_stream(master, data, chunk=4096):
+    for offset in range(0, len(data), chunk):
+        os.write(master, data[offset:offset + chunk])
+
+
+def per_packet_reader(fd, revolution_count, beams=360):
+    """Read header, then the rest of each packet; decode with struct; build each revolution as a new array."""
+    layout = struct.Struct('<BBHH' + 'HB' * POINTS_PER_PACKET + 'HHB')
+    scans, scan, previous = [], {}, None
+    while len(scans) < revolution_count:
+        if os.read(fd, 1) != b'\x54' or os.read(fd, 1) != b'\x2c':
+            continue
+        packet = b'\x54\x2c'
+        while len(packet) < PACKET_SIZE:
+            packet += os.read(fd, PACKET_SIZE - len(packet))
+        crc = 0
+        for byte in packet[:-1]:
+            crc = CRC8_TABLE[crc ^ byte]
+        if crc != packet[-1]:
+            continue
+        fields = layout.unpack(packet)
+        start, end = fields[3] / 100.0, fields[-3] / 100.0
+        if previous is not None and start < previous:
+            scans.append(np.array([scan.get(b, np.inf) for b in range(beams)]))
+            scan = {}
+        previous = start
+        span = (end - start) % 360.0
+        for k in range(POINTS_PER_PACKET):
+            distance = fields[4 + 2 * k]
+            if distance:
+                scan[int(round(start + span * k / (POINTS_PER_PACKET - 1))) % beams] = distance / 1000.0
+    return scans
+
+
+def bench_stream(label, revolution_count, consume):
+    master, slave = pty.openpty()
+    tty.setraw(slave)  # As LidarReader does on open; set before any byte is written
+    try:
+        data = recorded_stream(revolution_count + 2)
+        writer = Thread(target=write_stream, args=(master, data))
+        start = time.perf_counter()
+        writer.start()
+        consume(slave, revolution_count)
+        elapsed = time.perf_counter() - start
+        writer.join()
+    finally:
+        os.close(master)
+        os.close(slave)
+    packets = revolution_count * 30
+    print(f"{label:<22} {revolution_count / elapsed:8.0f} revolutions/s, {packets / elapsed:9.0f} packets/s, "
+          f"{elapsed / revolution_count * 1e3:6.3f} ms per revolution")
+
+
+def streaming_reader(slave, revolution_count):
+    reader = LidarReader(os.ttyname(slave)).start()
+    try:
+        reader.wait_for_scan(revolution_count - 1, timeout=60.0)
+    finally:
+        reader.stop()
+
+
+def bench_lidar_reader(revolution_count=2000):
+    bench_stream("per-packet struct", revolution_count // 10, per_packet_reader)
+    bench_stream("LidarReader", revolution_count, streaming_reader)
+    # The sensor spins at 10 Hz, so one revolution of parsing per 100 ms is the real load
+    reader = LidarReader('unused')
+    data = recorded_stream(revolution_count)
+    start = time.perf_counter()
+    for offset in range(0, len(data), 4096):
+        reader.feed(data[offset:offset + 4096])
+    elapsed = time.perf_counter() - start
+    print(f"parse only (4 KiB reads) {elapsed / revolution_count * 1e6:6.1f} us per revolution, "
+          f"{elapsed / revolution_count * 10 * 100:.3f}% of one CPU at 10 Hz")
+
+
+if __name__ == '__main__':
+    bench_lidar_reader()
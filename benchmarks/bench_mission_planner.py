@@ -0,0 +1,57 @@
+"""
+Mission Planner Benchmarks
+--------------------------
+Times multi-target mission planning on a FlightPlanner roadmap: the batched cost search, the
+ordering heuristic with 2-opt and Or-opt refinement, and the tour cost against the plain
+nearest-neighbour order.
+Run from the repository root with: python benchmarks/bench_mission_planner.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from flight_plan import FlightPlanner
+from mission_planner import MissionPlanner
+
+NO_FLY_ZONES = np.array([[50, 50, 50], [20, 80, 40], [75, 25, 60]])
+
+
+def bench_mission(target_counts=(50, 100, 500), size=5000, k_neighbors=10, seed=0):
+    """
+    Print the time spent in each planning phase and the improvement over nearest-neighbour ordering.
+    """
+    planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=NO_FLY_ZONES, num_waypoints=size,
+                            k_neighbors=k_neighbors, backend='csr', seed=seed)
+    mission = MissionPlanner(planner)
+    rng = np.random.default_rng(seed)
+    print(f"{'targets':>8} {'costs (s)':>10} {'ordering (s)':>13} {'total (s)':>10} {'nn cost':>10} {'tour cost':>10}")
+    for count in target_counts:
+        targets = rng.random((count, 3)) * 100
+        targets = targets[~planner.points_in_no_fly_zone(targets)]
+        start = time.perf_counter()
+        stops = np.vstack([[0, 0, 0], targets])
+        anchored = [mission.anchor(point) for point in stops]
+        costs, _, _ = mission.cost_matrix(*(np.array([a[i] for a in anchored]) for i in range(3)))
+        cost_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mission.order_targets(costs, return_to_start=True)
+        order_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = mission.plan_mission([0, 0, 0], targets, return_to_start=True)
+        total_time = time.perf_counter() - start
+
+        extended = np.zeros((len(costs) + 1, len(costs) + 1))
+        extended[:len(costs), :len(costs)] = costs
+        extended[:len(costs), -1] = costs[:, 0]
+        nearest = mission.tour_cost(extended, mission.nearest_neighbor(extended, len(costs)))
+        print(f"{len(targets):>8} {cost_time:>10.3f} {order_time:>13.3f} {total_time:>10.3f} "
+              f"{nearest:>10.1f} {result['cost']:>10.1f}")
+
+
+if __name__ == '__main__':
+    bench_mission()
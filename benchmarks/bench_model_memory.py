@@ -0,0 +1,91 @@
+"""
+Model Memory Benchmarks
+-----------------------
+Reports resident memory per worker process holding the camera and LiDAR ResNet-50s, loaded the original
+way (build the model, torch.load into private memory, load_state_dict) and through the ModelRegistry
+(memory-mapped weights), both with each worker loading on its own and with the parent loading before it
+forks the workers. PSS (proportional set size) charges shared pages to each sharing process in equal
+parts, so it shows the real per-worker cost; RSS counts shared pages in full for every worker.
+Linux only (reads /proc/self/smaps_rollup).
+Run from the repository root with: python benchmarks/bench_model_memory.py
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import torch
+from torchvision import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from model_registry import ModelRegistry
+
+
+def memory_usage():
+    """
+    Return (PSS, RSS) of the current process in MB.
+    """
+    values = {}
+    with open('/proc/self/smaps_rollup') as rollup:
+        for line in rollup:
+            fields = line.split()
+            if fields[0] in ('Pss:', 'Rss:'):
+                values[fields[0]] = int(fields[1]) / 1024
+    return values['Pss:'], values['Rss:']
+
+
+def eager_load(path):
+    model = models.resnet50(weights=None)
+    model.load_state_dict(torch.load(path))
+    return model.eval()
+
+
+def worker(mode, paths, registry, barrier, results):
+    if mode == 'original':
+        loaded = [eager_load(path) for path in paths]
+    else:
+        loaded = [registry.get(path, models.resnet50) for path in paths]
+    with torch.no_grad():
+        for model in loaded:
+            model(torch.zeros(1, 3, 224, 224))
+    barrier.wait()  # Measure while every worker holds its models
+    results.put(memory_usage())
+    barrier.wait()
+
+
+def run_workers(mode, paths, workers, registry):
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, paths, registry, barrier, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    usage = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return sum(pss for pss, _ in usage) / workers, sum(rss for _, rss in usage) / workers
+
+
+def bench_worker_memory(workers=4):
+    torch.set_num_threads(1)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for name in ('camera_model.pth', 'lidar_model.pth'):
+            paths.append(os.path.join(directory, name))
+            torch.save(models.resnet50(weights=None).state_dict(), paths[-1])
+        print(f"{workers} workers, 2 ResNet-50 checkpoints of {os.path.getsize(paths[0]) / 2 ** 20:.0f} MB each")
+        print(f"{'loading':<34} {'PSS MB/worker':>14} {'RSS MB/worker':>14}")
+        rows = [('original (torch.load per worker)', 'original', ModelRegistry()),
+                ('registry, loaded in each worker', 'registry', ModelRegistry())]
+        preloaded = ModelRegistry()
+        for path in paths:
+            preloaded.get(path, models.resnet50)
+        rows.append(('registry, loaded before fork', 'registry', preloaded))
+        for label, mode, registry in rows:
+            pss, rss = run_workers(mode, paths, workers, registry)
+            print(f"{label:<34} {pss:>14.0f} {rss:>14.0f}")
+
+
+if __name__ == '__main__':
+    bench_worker_memory()
@@ -0,0 +1,164 @@
+"""
+Navigation Benchmarks
+---------------------
+Compares one predict/update step for a whole swarm through FleetNavigationSystem against
+calling update_navigation_state on one NavigationSystem per drone, the steady-state gain
+fast mode against the full Kalman update, the cost of timestamped multi-rate fusion, the
+navigation history ring buffer against a list of per-step copies, and offline RTS smoothing of
+flight logs against step-by-step filtering.
+Run from the repository root with: python benchmarks/bench_navigation.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from navigation import NavigationSystem
+from fleet_navigation import FleetNavigationSystem
+from sensor_fusion import SensorFusion
+from nav_history import NavigationHistory
+from rts_smoother import RTSSmoother
+
+
+def bench_fleet(sizes=(10, 100, 1000), steps=20, seed=0):
+    """
+    Print the time per swarm step for separate filters and for the batched fleet filter.
+    """
+    rng = np.random.default_rng(seed)
+    print(f"{'drones':>7} {'separate (ms)':>14} {'fleet (ms)':>11} {'speed-up':>9}")
+    for size in sizes:
+        readings = rng.normal(size=(steps, size, 6))
+        singles = [NavigationSystem() for _ in range(size)]
+        start = time.perf_counter()
+        for step in readings:
+            for single, reading in zip(singles, step):
+                single.update_navigation_state(reading)
+        separate = (time.perf_counter() - start) / steps * 1e3
+
+        fleet = FleetNavigationSystem(size)
+        start = time.perf_counter()
+        for step in readings:
+            fleet.update_navigation_state(step)
+        batched = (time.perf_counter() - start) / steps * 1e3
+        print(f"{size:>7} {separate:>14.3f} {batched:>11.3f} {separate / batched:>8.1f}x")
+
+
+def bench_fast_mode(steps=5000, warmup=200, seed=0):
+    """
+    Print the time per update once the filter has converged, with and without fast mode.
+    """
+    readings = np.random.default_rng(seed).normal(size=(warmup + steps, 6))
+    timings = {}
+    for fast_mode in (False, True):
+        nav_system = NavigationSystem(fast_mode=fast_mode)
+        for reading in readings[:warmup]:
+            nav_system.update_navigation_state(reading)
+        start = time.perf_counter()
+        for reading in readings[warmup:]:
+            nav_system.update_navigation_state(reading)
+        timings[fast_mode] = (time.perf_counter() - start) / steps * 1e6
+    print(f"update after convergence: full filter {timings[False]:.1f} us, steady-state gain {timings[True]:.1f} us "
+          f"({timings[False] / timings[True]:.1f}x)")
+
+
+def bench_fusion(duration=60.0, seed=0):
+    """
+    Fuse a 200 Hz IMU, 10 Hz GPS and 20 Hz altimeter stream with jittered arrival order and report
+    the time per measurement.
+    """
+    rng = np.random.default_rng(seed)
+    streams = [('imu', np.arange(0, duration, 0.005), 3), ('gps', np.arange(0, duration, 0.1), 3),
+               ('altimeter', np.arange(0, duration, 0.05), 1)]
+    measurements = [(sensor, t, rng.normal(size=size)) for sensor, times, size in streams for t in times]
+    arrival = np.argsort([m[1] + rng.uniform(0, 0.01) for m in measurements])
+    fusion = SensorFusion(reorder_window=0.02)
+    start = time.perf_counter()
+    for index in arrival:
+        fusion.add_measurement(*measurements[index])
+    fusion.flush()
+    elapsed = time.perf_counter() - start
+    print(f"fusion of {len(measurements)} measurements ({duration:.0f}s of flight): "
+          f"{elapsed / len(measurements) * 1e6:.1f} us per measurement, {fusion.late_measurements} late")
+
+
+def bench_history(samples=100000, capacity=10000, queries=10000, seed=0):
+    """
+    Compare recording estimates and looking up poses at camera timestamps with the ring buffer against
+    appending copies to Python lists and interpolating from them.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = np.cumsum(rng.uniform(0.005, 0.015, samples))
+    states = rng.normal(size=(samples, 6))
+    variances = np.abs(rng.normal(size=(samples, 6)))
+
+    history = NavigationHistory(capacity)
+    start = time.perf_counter()
+    for timestamp, state, variance in zip(timestamps, states, variances):
+        history.append(timestamp, state, variance)
+    ring_append = (time.perf_counter() - start) / samples * 1e6
+
+    recorded_times, recorded_states = [], []
+    start = time.perf_counter()
+    for timestamp, state in zip(timestamps, states):
+        recorded_times.append(timestamp)
+        recorded_states.append(state.copy())
+        if len(recorded_times) > capacity:
+            recorded_times.pop(0)
+            recorded_states.pop(0)
+    list_append = (time.perf_counter() - start) / samples * 1e6
+
+    lookups = rng.uniform(timestamps[-capacity], timestamps[-1], queries)
+    start = time.perf_counter()
+    history.interpolate(lookups)
+    ring_lookup = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    stacked = np.array(recorded_states)
+    for axis in range(6):
+        np.interp(lookups, recorded_times, stacked[:, axis])
+    list_lookup = (time.perf_counter() - start) * 1e3
+    print(f"history append: ring buffer {ring_append:.2f} us, list {list_append:.2f} us; "
+          f"{queries} pose lookups: ring buffer {ring_lookup:.2f} ms, list {list_lookup:.2f} ms")
+
+
+def bench_smoother(hours=1.0, rate=100, logs=8, seed=0):
+    """
+    Time smoothing a flight log against filterpy's batch filter plus RTS smoother and against calling
+    update_navigation_state per sample, then smooth several logs in the process pool.
+    """
+    steps = int(hours * 3600 * rate)
+    rng = np.random.default_rng(seed)
+    log = np.cumsum(rng.normal(scale=0.01, size=(steps, 6)), axis=0)
+    smoother = RTSSmoother()
+    start = time.perf_counter()
+    smoother.smooth(log)
+    smooth_time = time.perf_counter() - start
+
+    sample = log[:steps // 10]
+    kf = NavigationSystem().kalman_filter
+    start = time.perf_counter()
+    means, covariances, _, _ = kf.batch_filter(sample)
+    kf.rts_smoother(means, covariances)
+    filterpy_time = (time.perf_counter() - start) * 10
+
+    nav_system = NavigationSystem()
+    start = time.perf_counter()
+    for reading in sample:
+        nav_system.update_navigation_state(reading)
+    stepwise_time = (time.perf_counter() - start) * 10
+    print(f"{steps} step log: RTS smoother {smooth_time:.3f}s, filterpy batch + RTS {filterpy_time:.1f}s (est.), "
+          f"update_navigation_state loop {stepwise_time:.1f}s (est., filtering only)")
+
+    start = time.perf_counter()
+    smoother.smooth_logs([log] * logs)
+    pool_time = time.perf_counter() - start
+    print(f"{logs} logs in the process pool: {pool_time:.2f}s ({pool_time / logs:.3f}s per log)")
+
+
+if __name__ == '__main__':
+    bench_fleet()
+    bench_fast_mode()
+    bench_fusion()
+    bench_history()
+    bench_smoother()
@@ -0,0 +1,39 @@
+"""
+No-Fly Zone Benchmarks
+----------------------
+Times batched swept-segment checks against spherical and cylindrical no-fly zones.
+Run from the repository root with: python benchmarks/bench_no_fly_zone.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from no_fly_zone import NoFlyZoneMap
+
+
+def bench_segments(edge_counts=(10000, 100000, 1000000), zone_count=200, area=1000.0, edge_length=20.0):
+    """
+    Print the time to validate batches of random edges against a random zone set.
+    """
+    rng = np.random.default_rng(0)
+    centers = rng.random((zone_count, 3)) * area
+    zone_maps = {
+        'sphere': NoFlyZoneMap(centers, radii=10.0),
+        'cylinder': NoFlyZoneMap(centers, radii=10.0, shape='cylinder', heights=50.0),
+    }
+    print(f"{'edges':>10} {'shape':>9} {'blocked':>9} {'time (s)':>9} {'edges/s':>12}")
+    for count in edge_counts:
+        starts = rng.random((count, 3)) * area
+        ends = starts + rng.normal(size=(count, 3)) * edge_length
+        for shape, zone_map in zone_maps.items():
+            start = time.perf_counter()
+            blocked = zone_map.segments_blocked(starts, ends)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>10} {shape:>9} {int(blocked.sum()):>9} {elapsed:>9.3f} {count / elapsed:>12.0f}")
+
+
+if __name__ == '__main__':
+    bench_segments()
@@ -0,0 +1,74 @@
+"""
+Obstacle Detector Benchmarks
+----------------------------
+Reports per-frame latency of the original camera input path (BGR frame -> RGB copy -> PIL image ->
+torchvision transform) against the buffered OpenCV frame path, on its own and with a ResNet-50
+forward pass for scale.
+Run from the repository root with: python benchmarks/bench_obstacle.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import cv2
+import torch
+from PIL import Image
+from torchvision import models, transforms
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from obstacle import FramePreprocessor
+
+LEGACY_TRANSFORM = transforms.Compose([
+    transforms.Resize((224, 224)),
+    transforms.ToTensor(),
+    transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+])
+
+
+def legacy_preprocess(frame):
+    """
+    The original path: SensorInput converted to a PIL image, ObstacleDetector applied the transform.
+    """
+    image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    return LEGACY_TRANSFORM(image.convert('RGB')).unsqueeze(0)
+
+
+def time_per_frame(function, frames):
+    function(frames[0])
+    start = time.perf_counter()
+    for frame in frames:
+        function(frame)
+    return (time.perf_counter() - start) / len(frames) * 1e3
+
+
+def bench_preprocessing(resolutions=((480, 640), (720, 1280), (1080, 1920)), frames=50, seed=0):
+    """
+    Print preprocessing latency per frame for the legacy and buffered paths.
+    """
+    rng = np.random.default_rng(seed)
+    preprocess = FramePreprocessor()
+    print(f"{'frame':>10} {'legacy (ms)':>12} {'frame path (ms)':>16} {'speed-up':>9}")
+    for height, width in resolutions:
+        batch = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(frames)]
+        legacy = time_per_frame(legacy_preprocess, batch)
+        fast = time_per_frame(preprocess, batch)
+        print(f"{width}x{height:<5} {legacy:>12.2f} {fast:>16.2f} {legacy / fast:>8.1f}x")
+
+
+def bench_end_to_end(frames=10, seed=0):
+    """
+    Print per-frame latency including an untrained ResNet-50 forward pass.
+    """
+    model = models.resnet50(weights=None).eval()
+    preprocess = FramePreprocessor()
+    batch = [np.random.default_rng(seed).integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(frames)]
+    with torch.no_grad():
+        legacy = time_per_frame(lambda frame: model(legacy_preprocess(frame)), batch)
+        fast = time_per_frame(lambda frame: model(preprocess(frame)), batch)
+    print(f"640x480 with ResNet-50: legacy {legacy:.1f} ms, frame path {fast:.1f} ms per frame")
+
+
+if __name__ == '__main__':
+    bench_preprocessing()
+    bench_end_to_end()
@@ -0,0 +1,89 @@
+"""
+Perception Gate Benchmarks
+--------------------------
+Runs a simulated 30 fps camera feed through ObstacleDetector (ResNet-50) directly and through the
+PerceptionGate: a hover phase (static scene with sensor noise) followed by a cruise phase (the scene
+pans every frame). Reports the skip ratio per phase, the change-score cost, total detection time with
+and without the gate, and the gate's own latency-saved estimate.
+Run from the repository root with: python benchmarks/bench_perception_gate.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import torch
+from torchvision import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from obstacle import ObstacleDetector
+from perception_gate import PerceptionGate
+
+
+class HoveringNavigation:
+    """
+    Stands in for NavigationSystem: reports a position that the benchmark loop advances.
+    """
+    def __init__(self):
+        self.position = np.zeros(3)
+
+    def get_position(self):
+        return self.position
+
+
+def simulated_feed(hover_frames, cruise_frames, seed=0):
+    """
+    Yield (phase, timestamp, position, frame) for a 480x640 BGR feed at 30 fps.
+    """
+    rng = np.random.default_rng(seed)
+    scene = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    scene = np.kron(scene, np.ones((8, 8, 1), dtype=np.uint8))  # Large flat regions like a real scene
+    for index in range(hover_frames + cruise_frames):
+        hovering = index < hover_frames
+        offset = 0 if hovering else 8 * (index - hover_frames + 1)
+        frame = np.roll(scene, offset, axis=1).astype(np.int16) + rng.normal(0, 2, scene.shape).astype(np.int16)
+        position = np.array([0.0 if hovering else 0.3 * (index - hover_frames + 1), 0.0, 10.0])
+        yield ('hover' if hovering else 'cruise'), index / 30.0, position, np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def bench_gate(hover_frames=45, cruise_frames=15):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'camera_model.pth')
+        torch.save(models.resnet50(weights=None).state_dict(), path)
+        detector = ObstacleDetector(path, path)
+        feed = list(simulated_feed(hover_frames, cruise_frames))
+        detector.detect_obstacles_camera(feed[0][3])  # Load the model and warm up
+
+        start = time.perf_counter()
+        for _, _, _, frame in feed:
+            detector.detect_obstacles_camera(frame)
+        ungated = time.perf_counter() - start
+
+        navigation = HoveringNavigation()
+        gate = PerceptionGate(detector, navigation=navigation)
+        reused = {'hover': 0, 'cruise': 0}
+        start = time.perf_counter()
+        for phase, timestamp, position, frame in feed:
+            navigation.position = position
+            before = gate.reused
+            gate.detect(frame, timestamp=timestamp)
+            reused[phase] += gate.reused - before
+        gated = time.perf_counter() - start
+
+        score_start = time.perf_counter()
+        for _, _, _, frame in feed:
+            gate.change_score(frame)
+        score_cost = (time.perf_counter() - score_start) / len(feed)
+
+    stats = gate.stats()
+    print(f"{len(feed)} frames at 480x640: {hover_frames} hovering, {cruise_frames} cruising")
+    print(f"Skip ratio: hover {reused['hover'] / hover_frames:.2f}, cruise {reused['cruise'] / cruise_frames:.2f}, "
+          f"overall {stats['skip_ratio']:.2f}")
+    print(f"Change score: {score_cost * 1e6:.0f} us/frame")
+    print(f"Detection time: {ungated:.2f} s ungated, {gated:.2f} s gated ({ungated / gated:.1f}x); "
+          f"gate estimate of time saved {stats['latency_saved']:.2f} s")
+
+
+if __name__ == '__main__':
+    bench_gate()
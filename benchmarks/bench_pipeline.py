@@ -0,0 +1,116 @@
+"""
+Pipeline Benchmarks
+-------------------
+Compares running capture -> perception -> planning -> decision back to back in one thread (the original
+main loop) with the staged Pipeline, reporting items per second, end-to-end latency and per-stage queue
+statistics. The first scenario uses waiting stages (sensor I/O, accelerator calls) that overlap on any
+machine; the second uses a 30 fps camera clock with the real preprocessing, models, LiDAR extraction and
+trajectory generation, whose computation can only overlap as far as there are CPU cores for it.
+Run from the repository root with: python benchmarks/bench_pipeline.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import torch
+from torchvision import models
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from decision_net import DecisionNet
+from lidar_processing import LidarObstacleExtractor
+from obstacle import FramePreprocessor
+from pipeline import Pipeline
+from trajectory import TrajectoryGenerator
+
+
+def waiting_stages():
+    def wait(seconds):
+        def stage(data=None):
+            time.sleep(seconds)
+            return data
+        return stage
+    return [('capture', wait(0.033)), ('perception', wait(0.040)), ('planning', wait(0.020)),
+            ('decision', wait(0.010))]
+
+
+def compute_stages():
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, (8, 480, 640, 3), dtype=np.uint8)
+    scans = rng.uniform(1, 60, (8, 360))
+    preprocess = FramePreprocessor()
+    camera_model = models.resnet18(weights=None).eval()
+    extractor = LidarObstacleExtractor()
+    generator = TrajectoryGenerator()
+    decision_model = DecisionNet().eval()
+    path = [(0, 0, 10), (20, 5, 12), (40, 30, 15), (60, 40, 15), (100, 100, 20)]
+    frame_period = 1 / 30.0
+    clock_start = time.perf_counter()
+
+    def capture():
+        # Block until the next frame arrives, like cv2.VideoCapture.read at 30 fps
+        index = int((time.perf_counter() - clock_start) / frame_period) + 1
+        time.sleep(max(0.0, clock_start + index * frame_period - time.perf_counter()))
+        return {'frame': frames[index % len(frames)].copy(), 'scan': scans[index % len(scans)]}
+
+    def perception(data):
+        with torch.inference_mode():
+            data['detections'] = camera_model(preprocess(data['frame']))
+        data['obstacles'] = extractor.extract(data['scan'])
+        return data
+
+    def planning(data):
+        data['trajectory'] = generator.generate(path)
+        return data
+
+    def decision(data):
+        with torch.inference_mode():
+            image = torch.nn.functional.interpolate(preprocess.input_tensor, size=(64, 64))
+            return decision_model(image, torch.zeros(1, 10)).argmax().item()
+
+    return [('capture', capture), ('perception', perception), ('planning', planning), ('decision', decision)]
+
+
+def run_sequential(stages, duration):
+    latencies = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        data = stages[0][1]()
+        start = time.perf_counter()  # Latency counts from capture, as in the pipeline
+        for _, stage in stages[1:]:
+            data = stage(data)
+        latencies.append(time.perf_counter() - start)
+    return len(latencies) / duration, np.array(latencies)
+
+
+def run_pipelined(stages, duration):
+    pipeline = Pipeline(queue_size=1)
+    for name, stage in stages:
+        pipeline.add_stage(name, stage)
+    pipeline.start()
+    time.sleep(duration)
+    pipeline.stop()
+    stats = pipeline.stats()
+    return stats['stages'][stages[-1][0]]['processed'] / duration, stats
+
+
+def bench_scenario(label, stages, duration=4.0):
+    run_sequential(stages, 0.2)  # Warm up lazily initialised kernels
+    rate, latencies = run_sequential(stages, duration)
+    print(f"{label}")
+    print(f"  sequential: {rate:6.1f} items/s, latency p50 {np.percentile(latencies, 50) * 1e3:6.1f} ms, "
+          f"p99 {np.percentile(latencies, 99) * 1e3:6.1f} ms")
+    rate, stats = run_pipelined(stages, duration)
+    print(f"  pipelined:  {rate:6.1f} items/s, latency p50 {stats['latency_p50'] * 1e3:6.1f} ms, "
+          f"p99 {stats['latency_p99'] * 1e3:6.1f} ms")
+    for name, stage in stats['stages'].items():
+        queue = stage['queue']
+        depth = '' if queue is None else (f", input queue mean depth {queue['mean_depth']:.2f}, "
+                                          f"max {queue['max_depth']}, dropped {queue['dropped']}")
+        print(f"    {name:<10} {stage['mean_service_time'] * 1e3:6.1f} ms/item{depth}")
+
+
+if __name__ == '__main__':
+    print(f"{os.cpu_count()} CPU(s), {torch.get_num_threads()} torch thread(s)")
+    bench_scenario("waiting stages (33/40/20/10 ms)", waiting_stages())
+    bench_scenario("compute stages (ResNet-18, LiDAR extraction, trajectory, DecisionNet)", compute_stages())
@@ -0,0 +1,103 @@
+"""
+Sensor Replay Benchmarks
+------------------------
+Records a synthetic 10 second session (30 fps 640x480 camera, 10 Hz LiDAR, 50 Hz navigation fixes) with
+SessionRecorder and with one np.save file per record, then replays both as fast as possible into an
+offline perception loop (grayscale thumbnail plus LiDAR obstacle extraction): the per-record files with
+np.load, the session through ReplaySensorInput. Live sensors would take the full 10 seconds.
+Run from the repository root with: python benchmarks/bench_sensor_replay.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from lidar_processing import LidarObstacleExtractor
+from sensor_replay import ReplaySensorInput, SessionRecorder
+
+
+def synthetic_session(duration=10.0):
+    """Yield (stream, record, timestamp) in time order."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    scan = rng.uniform(0.5, 30.0, 360)
+    events = [(i / 30.0, 'camera') for i in range(int(duration * 30))]
+    events += [(i / 10.0 + 0.01, 'lidar') for i in range(int(duration * 10))]
+    events += [(i / 50.0, 'navigation') for i in range(int(duration * 50))]
+    for timestamp, stream in sorted(events):
+        if stream == 'camera':
+            frame[0, 0, 0] = int(timestamp * 30) % 256
+            yield stream, frame, timestamp
+        elif stream == 'lidar':
+            yield stream, np.roll(scan, int(timestamp * 10)), timestamp
+        else:
+            yield stream, np.full(6, timestamp), timestamp
+
+
+def bench_recording(directory):
+    start = time.perf_counter()
+    with SessionRecorder(os.path.join(directory, 'session')) as recorder:
+        for stream, record, timestamp in synthetic_session():
+            recorder.record(stream, record, timestamp)
+    recorded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_record = os.path.join(directory, 'per_record')
+    os.makedirs(per_record)
+    for index, (stream, record, timestamp) in enumerate(synthetic_session()):
+        np.save(os.path.join(per_record, f'{index:06d}_{stream}_{timestamp:.3f}.npy'), record)
+    saved = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(per_record, name)) for name in os.listdir(per_record)) / 1e6
+    print(f"record {size:.0f} MB: np.save per record {saved:6.2f} s, SessionRecorder {recorded:6.2f} s")
+
+
+def perceive(extractor, frame, scan):
+    cv2.cvtColor(cv2.resize(np.asarray(frame), (32, 24), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+    return len(extractor.extract(scan)['distances'])
+
+
+def report(label, frames, elapsed):
+    print(f"replay {frames} frames, {label:<18} {elapsed:6.2f} s ({frames / elapsed:6.0f} frames/s, "
+          f"{10.0 / elapsed:5.1f}x real time)")
+
+
+def bench_replay(directory):
+    extractor = LidarObstacleExtractor()
+    per_record = os.path.join(directory, 'per_record')
+    frames, scan = 0, None
+    start = time.perf_counter()
+    for name in sorted(os.listdir(per_record)):
+        record = np.load(os.path.join(per_record, name))
+        if '_lidar_' in name:
+            scan = record
+        elif '_camera_' in name and scan is not None:
+            perceive(extractor, record, scan)
+            frames += 1
+    report("np.load per record", frames, time.perf_counter() - start)
+
+    replay = ReplaySensorInput(os.path.join(directory, 'session'))
+    frames = 0
+    start = time.perf_counter()
+    while not replay.exhausted:
+        perceive(extractor, replay.get_camera_frame(), replay.get_lidar_data())
+        replay.get_navigation_data()
+        frames += 1
+    report("ReplaySensorInput", frames, time.perf_counter() - start)
+
+
+def bench_sensor_replay():
+    directory = tempfile.mkdtemp()
+    try:
+        bench_recording(directory)
+        bench_replay(directory)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    bench_sensor_replay()
@@ -0,0 +1,76 @@
+"""
+Trajectory Benchmarks
+---------------------
+Times trajectory generation from planned paths of growing length and compares looking setpoints up
+by index in the precomputed trajectory against re-interpolating the raw waypoint list every tick.
+Run from the repository root with: python benchmarks/bench_trajectory.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from flight_plan import FlightPlanner
+from trajectory import TrajectoryGenerator
+
+NO_FLY_ZONES = np.random.default_rng(0).random((40, 3)) * 100
+
+
+def reinterpolate(path, elapsed, speed):
+    """
+    Per-tick controller lookup on the raw waypoint list at constant speed, the approach the trajectory replaces.
+    """
+    points = np.asarray(path, dtype=float)
+    arc = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+    distance = min(elapsed * speed, arc[-1])
+    return np.array([np.interp(distance, arc, points[:, axis]) for axis in range(3)])
+
+
+def bench_generation(sizes=(1000, 10000, 50000), k_neighbors=10, queries=20, seed=0):
+    """
+    Print raw path length, shortcut length and generation time for paths on growing roadmaps.
+    """
+    print(f"{'waypoints':>10} {'path pts':>9} {'shortcut':>9} {'setpoints':>10} {'generate (ms)':>14}")
+    rng = np.random.default_rng(seed + 1)
+    for size in sizes:
+        planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=NO_FLY_ZONES, num_waypoints=size,
+                                k_neighbors=k_neighbors, backend='csr', seed=seed)
+        generator = TrajectoryGenerator(planner)
+        starts = rng.random((queries, 3)) * 100
+        paths = [planner.find_path(start) for start in starts[~planner.points_in_no_fly_zone(starts)]]
+        start = time.perf_counter()
+        trajectories = [generator.generate(path) for path in paths]
+        elapsed = (time.perf_counter() - start) / len(paths) * 1e3
+        shortcut = np.mean([len(generator.shortcut(path)) for path in paths])
+        print(f"{size:>10} {np.mean([len(p) for p in paths]):>9.1f} {shortcut:>9.1f} "
+              f"{np.mean([len(t) for t in trajectories]):>10.0f} {elapsed:>14.2f}")
+
+
+def bench_setpoint_lookup(size=10000, k_neighbors=10, ticks=10000, seed=0):
+    """
+    Compare the per-tick cost of indexing the trajectory against re-interpolating the path.
+    """
+    planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=NO_FLY_ZONES, num_waypoints=size,
+                            k_neighbors=k_neighbors, backend='csr', seed=seed)
+    path = planner.find_path([0, 0, 0])
+    trajectory = TrajectoryGenerator(planner).generate(path)
+    times = np.linspace(0.0, trajectory.duration, ticks)
+
+    start = time.perf_counter()
+    for elapsed in times:
+        trajectory.setpoint(elapsed)
+    lookup = (time.perf_counter() - start) / ticks * 1e6
+
+    start = time.perf_counter()
+    for elapsed in times:
+        reinterpolate(path, elapsed, 10.0)
+    interpolation = (time.perf_counter() - start) / ticks * 1e6
+    print(f"setpoint per tick: indexed lookup {lookup:.2f} us, re-interpolation {interpolation:.2f} us "
+          f"({interpolation / lookup:.0f}x)")
+
+
+if __name__ == '__main__':
+    bench_generation()
+    bench_setpoint_lookup()
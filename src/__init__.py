@@ -43,10 +43,28 @@ package_logger.info('Initializing the Drone Navigation System package')
 from .frequency_hopper import AdaptiveFrequencyHopper
 from .drone_encryption import DroneEncryption
 from .energy_management import EnergyManager
-from .sensor import SensorInput
+from .sensor import SensorInput, CameraGrabber
 from .navigation import NavigationSystem
+from .fleet_navigation import FleetNavigationSystem
+from .sensor_fusion import SensorFusion
+from .nav_history import NavigationHistory
+from .rts_smoother import RTSSmoother
 from .obstacle import ObstacleDetector
+from .inference_server import InferenceServer
+from .lidar_processing import LidarObstacleExtractor
+from .lidar_reader import LidarReader
+from .sensor_replay import SessionRecorder, ReplaySensorInput
+from .model_registry import ModelRegistry
+from .inference_optimizer import OptimizedModel
+from .perception_gate import PerceptionGate
+from .pipeline import Pipeline, LatestValueQueue
 from .flight_plan import FlightPlanner
+from .no_fly_zone import NoFlyZoneMap
+from .incremental_planner import DStarLite
+from .path_cache import PathCache
+from .roadmap import CSRRoadmap
+from .mission_planner import MissionPlanner
+from .trajectory import Trajectory, TrajectoryGenerator
 from .user_interface import DroneControlPanel
 from .emergency import EmergencyHandler
 from .drone_swarm import DroneSwarm
@@ -61,9 +79,31 @@ __all__ = [
     "DroneEncryption",
     "EnergyManager",
     "SensorInput",
+    "CameraGrabber",
+    "SessionRecorder",
+    "ReplaySensorInput",
     "NavigationSystem",
+    "FleetNavigationSystem",
+    "SensorFusion",
+    "NavigationHistory",
+    "RTSSmoother",
     "ObstacleDetector",
+    "InferenceServer",
+    "LidarObstacleExtractor",
+    "LidarReader",
+    "ModelRegistry",
+    "OptimizedModel",
+    "PerceptionGate",
+    "Pipeline",
+    "LatestValueQueue",
     "FlightPlanner",
+    "NoFlyZoneMap",
+    "DStarLite",
+    "PathCache",
+    "CSRRoadmap",
+    "MissionPlanner",
+    "Trajectory",
+    "TrajectoryGenerator",
     "DecisionMaker",
     "DecisionNet",
     "DroneControlPanel",
@@ -1,34 +1,43 @@
 import torch
+import numpy as np
 from torchvision import transforms
 from PIL import Image
 import os
 from decision_net import DecisionNet
+from model_registry import default_registry
+from inference_optimizer import OptimizedModel
+from obstacle import FramePreprocessor
+from exceptions import NavigationError
 
 class DecisionMaker:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, registry=None):
         """
         Initialize the DecisionMaker with a model.
 
         Args:
         model_path (str): Optional path to a pretrained model. If not provided,
                           the model will be initialized with random weights for testing.
+        registry (ModelRegistry): Registry that loads and shares the pretrained model; defaults to the
+                                  process-wide one.
         """
         # Determine if CUDA is available and set the appropriate device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         
-        # Initialize the DecisionNet model and transfer it to the designated device
-        self.model = DecisionNet().to(self.device)
-        
-        # Load a pretrained model if a path is provided
+        # Use the shared pretrained model if a path is provided; it is memory-mapped on first use
         if model_path:
-            try:
-                self.model.load_state_dict(torch.load(model_path, map_location=self.device))
-                self.model.eval()  # Set the model to evaluation mode
-            except FileNotFoundError:
+            if not os.path.exists(model_path):
                 print("Model file not found. Please check the path and try again.")
-                raise
+                raise FileNotFoundError(f"The specified model path {model_path} does not exist.")
+            registry = registry or default_registry
+            # Fail now rather than at the first decision if the checkpoint cannot be loaded
+            try:
+                registry.check(model_path)
+            except (OSError, ValueError) as e:
+                raise NavigationError(f"Failed to load decision model from {model_path}: {str(e)}")
+            self.model = registry.lazy(model_path, DecisionNet, self.device, error=NavigationError)
         else:
-            # Initialize model with random weights for testing if no model path is provided
+            # Initialize the DecisionNet model with random weights for testing if no model path is provided
+            self.model = DecisionNet().to(self.device)
             self.model.load_state_dict({k: torch.rand(*v.size()) for k, v in self.model.state_dict().items()})
         
         # Define the image transformations
@@ -37,25 +46,66 @@ class DecisionMaker:
             transforms.ToTensor(),  # Convert images to PyTorch tensors
             transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])  # Normalize the images
         ])
+        # Same normalization for in-memory camera frames, without the PIL round trip
+        self.preprocessor = FramePreprocessor(size=(64, 64))
+
+    def optimize_inference(self, threads=None, quantize=None, trace=True, channels_last=True, calibration_inputs=None):
+        """
+        Switch the model to the CPU-optimized inference mode (see OptimizedModel).
+
+        Args:
+        threads (int): Process-wide torch intra-op thread count to set; None leaves it unchanged.
+        quantize (str): None, 'dynamic' or 'static' int8 quantization.
+        trace (bool): Trace the model into a frozen TorchScript graph.
+        channels_last (bool): Run convolutions in NHWC layout.
+        calibration_inputs (list): (image tensor, sensor tensor) pairs used to calibrate static quantization.
+        """
+        example = (torch.zeros(1, 3, 64, 64, device=self.device), torch.zeros(1, 10, device=self.device))
+        try:
+            self.model = OptimizedModel(self.model, example, trace=trace, channels_last=channels_last,
+                                        quantize=quantize, calibration_inputs=calibration_inputs, threads=threads)
+        except Exception as e:
+            raise NavigationError(f"Failed to optimize decision model: {str(e)}")
+
+    @staticmethod
+    def lidar_features(scan, count=10, max_range=100.0):
+        """
+        Reduce a LiDAR scan to the sensor vector DecisionNet takes: the nearest return in each of count
+        equal angular sectors, with no-return beams counted as max_range.
+
+        Args:
+        scan (array): Ranges in meters per beam, inf where nothing returned.
+        count (int): Number of sectors.
+        max_range (float): Range used for beams without a return, and the cap for all others.
 
-    def make_decision(self, image_path, sensor_data):
+        Returns:
+        ndarray: count nearest distances in meters.
+        """
+        scan = np.asarray(scan, dtype=float)
+        ranges = np.minimum(np.where(np.isfinite(scan), scan, max_range), max_range)
+        return np.minimum.reduceat(ranges, np.linspace(0, len(ranges), count, endpoint=False).astype(int))
+
+    def make_decision(self, image, sensor_data):
         """
         Make a decision based on the input image and sensor data.
 
         Args:
-        image_path (str): Path to the input image file.
-        sensor_data (list): Sensor data inputs as a list of numerical values.
+        image (str or ndarray): Path to the input image file, or a camera frame as the HxWx3 uint8 BGR array
+                                OpenCV delivers.
+        sensor_data (list): Sensor data inputs as a list of numerical values (see lidar_features for scans).
 
         Returns:
         int: The decision index predicted by the model.
         """
-        # Check if the image file exists
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"The specified image path {image_path} does not exist.")
-        
-        # Open the image, convert it to RGB, apply transformations, and move it to the device
-        image = Image.open(image_path).convert('RGB')
-        image = self.transform(image).unsqueeze(0).to(self.device)
+        if isinstance(image, np.ndarray):
+            image = self.preprocessor(image).to(self.device)
+        else:
+            # Check if the image file exists
+            if not os.path.exists(image):
+                raise FileNotFoundError(f"The specified image path {image} does not exist.")
+
+            # Open the image, convert it to RGB, apply transformations, and move it to the device
+            image = self.transform(Image.open(image).convert('RGB')).unsqueeze(0).to(self.device)
         
         # Convert sensor data to a PyTorch tensor and move it to the device
         sensor_data = torch.tensor(sensor_data, dtype=torch.float).unsqueeze(0).to(self.device)
@@ -113,5 +113,5 @@ def control_station_callback(event_type, details):
     print(f"Event: {event_type}, Details: {details}")
 
 # Example usage can be :
-swarm = DroneSwarm(['drone1', 'drone2', 'drone3'], control_station_callback)
-swarm.assign_task('drone1', 'photography')
+# swarm = DroneSwarm(['drone1', 'drone2', 'drone3'], control_station_callback)
+# swarm.assign_task('drone1', 'photography')
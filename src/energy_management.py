@@ -71,14 +71,14 @@ class EnergyManager:
         self.logger.info(f"Auto-return {'enabled' if enable else 'disabled'}.")
 
 # Example usage can be :
-def return_home():
-    print("Drone is returning home due to low battery.")
+# def return_home():
+#     print("Drone is returning home due to low battery.")
 
-def user_decision():
-    # Simulate a user deciding whether to allow auto-return
-    print("User decision: Allow auto-return.")
-    return True  # Simulate user approval for auto-return
+# def user_decision():
+#     # Simulate a user deciding whether to allow auto-return
+#     print("User decision: Allow auto-return.")
+#     return True  # Simulate user approval for auto-return
 
-energy_manager = EnergyManager(return_home_callback=return_home, user_decision_callback=user_decision)
-energy_manager.update_energy_usage(10, weather_impact=5)  # Simulate consumption of 10% battery and 5% additional due to weather
-energy_manager.toggle_auto_return(True)
+# energy_manager = EnergyManager(return_home_callback=return_home, user_decision_callback=user_decision)
+# energy_manager.update_energy_usage(10, weather_impact=5)  # Simulate consumption of 10% battery and 5% additional due to weather
+# energy_manager.toggle_auto_return(True)
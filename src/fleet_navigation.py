@@ -0,0 +1,112 @@
+import numpy as np
+from exceptions import CriticalNavigationError, SensorError
+from navigation import NavigationSystem
+
+class FleetNavigationSystem:
+    """
+    Batched navigation for a swarm: the states of N drones live in one (N, 6) array and their covariances
+    in one (N, 6, 6) array, so a single predict or update call runs the Kalman filter for every drone.
+    The motion and measurement model is the one NavigationSystem uses.
+    """
+    def __init__(self, num_drones, initial_states=None):
+        """
+        Args:
+            num_drones (int): Number of drones in the fleet.
+            initial_states (array): Optional (N, 6) starting states; defaults to zeros like NavigationSystem.
+        """
+        model = NavigationSystem().kalman_filter
+        self.F = np.array(model.F, dtype=float)
+        self.H = np.array(model.H, dtype=float)
+        self.Q = np.array(model.Q, dtype=float)
+        self.R = np.array(model.R, dtype=float)
+        self.num_drones = num_drones
+        self.states = np.zeros((num_drones, self.F.shape[0])) if initial_states is None else \
+            np.array(initial_states, dtype=float).reshape(num_drones, self.F.shape[0])
+        self.covariances = np.broadcast_to(model.P, (num_drones,) + model.P.shape).copy()
+
+    def drone_mask(self, mask):
+        """
+        Turn an optional mask (None, N booleans or drone indices) into a boolean array over the fleet.
+        """
+        if mask is None:
+            return np.ones(self.num_drones, dtype=bool)
+        mask = np.asarray(mask)
+        if mask.dtype != bool:
+            selected = np.zeros(self.num_drones, dtype=bool)
+            selected[mask] = True
+            return selected
+        return mask
+
+    def predict(self, mask=None):
+        """
+        Propagate the state and covariance of the selected drones (all by default) one step ahead.
+        """
+        selected = self.drone_mask(mask)
+        self.states[selected] = self.states[selected] @ self.F.T
+        self.covariances[selected] = self.F @ self.covariances[selected] @ self.F.T + self.Q
+
+    def update(self, measurements, mask=None):
+        """
+        Correct the selected drones with their measurements.
+
+        Args:
+            measurements (array): (N, 6) measurements, one row per drone. Rows of unselected drones and
+                                  masked-out components are ignored and may hold NaN.
+            mask (array): None (every drone), an (N,) drone mask or index list, or an (N, 6) boolean mask
+                          of the measurement components each drone actually received.
+        """
+        measurements = np.asarray(measurements, dtype=float)
+        mask = np.ones(measurements.shape, dtype=bool) if mask is None else np.asarray(mask)
+        components = mask if mask.ndim == 2 else np.broadcast_to(self.drone_mask(mask)[:, None], measurements.shape)
+        selected = components.any(axis=1)
+        if not selected.any():
+            return
+        observed = components[selected].astype(float)
+        values = np.where(components[selected], measurements[selected], 0.0)
+        if not np.all(np.isfinite(values)):
+            bad = np.flatnonzero(selected)[~np.all(np.isfinite(values), axis=1)]
+            raise SensorError("Fleet navigation", f"Invalid sensor data received for drones {bad.tolist()}.")
+
+        try:
+            # Missing components get a zero measurement row and a decoupled unit noise entry, which gives
+            # them exactly zero gain; observed components are filtered as in the full-measurement case.
+            H = observed[:, :, None] * self.H
+            R = self.R * observed[:, :, None] * observed[:, None, :] + np.eye(len(self.R)) * (1.0 - observed)[:, None, :]
+            P = self.covariances[selected]
+            x = self.states[selected]
+            innovation = values - np.einsum('nij,nj->ni', H, x)
+            PHT = P @ H.transpose(0, 2, 1)
+            S = H @ PHT + R
+            K = np.linalg.solve(S, PHT.transpose(0, 2, 1)).transpose(0, 2, 1)  # S is symmetric
+            self.states[selected] = x + np.einsum('nij,nj->ni', K, innovation)
+            I_KH = np.eye(P.shape[1]) - K @ H
+            self.covariances[selected] = I_KH @ P @ I_KH.transpose(0, 2, 1) + K @ R @ K.transpose(0, 2, 1)
+        except np.linalg.LinAlgError as e:
+            raise CriticalNavigationError(f"Failed to update fleet navigation state: {str(e)}")
+
+    def update_navigation_state(self, measurements, mask=None):
+        """
+        Predict every drone one step, then correct the drones selected by the mask, mirroring
+        NavigationSystem.update_navigation_state for the whole fleet in one call.
+        """
+        self.predict()
+        self.update(measurements, mask)
+
+    def get_positions(self):
+        """
+        Return the (N, 3) estimated positions as a view into the fleet state.
+        """
+        return self.states[:, :3]
+
+    def get_velocities(self):
+        """
+        Return the (N, 3) estimated velocities as a view into the fleet state.
+        """
+        return self.states[:, 3:6]
+
+
+# Example usage can be:
+# fleet = FleetNavigationSystem(num_drones=3)
+# readings = np.array([[1, 2, 3, 0.1, 0.1, 0.1], [4, 5, 6, 0.0, 0.2, 0.0], [np.nan] * 6])
+# fleet.update_navigation_state(readings, mask=[True, True, False])  # The third drone has no reading
+# print("Fleet positions:", fleet.get_positions())
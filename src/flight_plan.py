@@ -1,68 +1,507 @@
 import numpy as np
 from scipy.spatial import KDTree
 import networkx as nx
-from exceptions import NavigationError, PathfindingError
+from exceptions import NavigationError, PathfindingError, FlightPlanError
+from no_fly_zone import NoFlyZoneMap
+from incremental_planner import DStarLite
+from path_cache import PathCache
+from roadmap import CSRRoadmap, save_roadmap, load_roadmap
 
 class FlightPlanner:
     """
     Manages flight path planning for the drone, incorporating obstacle avoidance,
     no-fly zone compliance, and dynamic adjustment for swarm and weather impacts.
     """
-    def __init__(self, destination, no_fly_zones=None, weather_impact_callback=None):
+    def __init__(self, destination, no_fly_zones=None, weather_impact_callback=None,
+                 num_waypoints=10, k_neighbors=None, connection_radius=None, incremental=False,
+                 cache_size=128, snap_tolerance=0.0, attach_neighbors=8, attach_radius=None, backend='networkx',
+                 batched_weather=False, seed=None, roadmap_path=None):
         self.destination = np.array(destination)
-        self.no_fly_zones = KDTree(no_fly_zones) if no_fly_zones is not None and len(no_fly_zones) > 0 else None
+        # Zones may be given as an array of centres (spheres with a 5 unit buffer) or a prepared NoFlyZoneMap
+        if isinstance(no_fly_zones, NoFlyZoneMap):
+            self.no_fly_zones = no_fly_zones
+        else:
+            self.no_fly_zones = NoFlyZoneMap(no_fly_zones) if no_fly_zones is not None and len(no_fly_zones) > 0 else None
         self.weather_impact_callback = weather_impact_callback
-        self.graph = self.build_graph()
+        # A batched callback takes (E, 3) start and end arrays and returns (E,) multipliers in one call;
+        # otherwise the callback is called once per edge with two points
+        self.batched_weather = batched_weather
+        self.num_waypoints = num_waypoints
+        # Neighbour selection for the roadmap: connect every waypoint pair when neither is set,
+        # otherwise use the k nearest waypoints and/or every waypoint within the radius.
+        self.k_neighbors = k_neighbors
+        self.connection_radius = connection_radius
+        # 'networkx' keeps a DiGraph of tuple nodes; 'csr' keeps a node array and sparse matrices and
+        # searches with scipy.sparse.csgraph, which is far smaller and faster on large roadmaps
+        if backend not in ('networkx', 'csr'):
+            raise FlightPlanError(backend, "Unknown graph backend")
+        if incremental and backend != 'networkx':
+            raise FlightPlanError(backend, "Incremental replanning requires the networkx backend")
+        self.backend = backend
+        # Incremental mode repairs the previous D* Lite solution after edge updates instead of searching again
+        self.incremental = incremental
+        self.incremental_planner = None
+        self.heuristic_scale = 1.0
+        # Paths are cached per (snapped start node, destination, graph version); any edge or zone change
+        # bumps the version so stale paths are never served
+        self.graph_version = 0
+        self.csr_copy = None  # (graph version, CSRRoadmap) built for batched searches on the networkx backend
+        self.path_cache = PathCache(cache_size) if cache_size else None
+        self.snap_tolerance = snap_tolerance
+        # Start or goal positions that are not graph nodes are linked to this many nearby nodes for one search
+        self.attach_neighbors = attach_neighbors
+        self.attach_radius = attach_radius
+        # Seeded waypoint generation makes roadmaps reproducible; a saved roadmap skips generation entirely
+        self.seed = seed
+        self.graph = self.load_graph(roadmap_path) if roadmap_path is not None else self.build_graph()
 
     def build_graph(self):
         """
         Build a graph structure based on waypoints and no-fly zones for path finding,
         considering dynamic conditions.
         """
+        waypoints = np.vstack([
+            self.generate_waypoints(),
+            self.destination,  # Ensure destination is included
+            np.zeros(3),  # Ensure start point is included
+        ]).astype(float)
+        self.waypoints = waypoints
+        # Edge arrays are kept alongside the graph so costs can be updated in place by edge id
+        self.edge_sources, self.edge_targets, self.edge_lengths = self.build_edges(waypoints)
+        self.edge_weights = self.edge_lengths * self.weather_multipliers(
+            waypoints[self.edge_sources], waypoints[self.edge_targets])
+        return self.assemble_graph()
+
+    def load_graph(self, roadmap_path):
+        """
+        Load a roadmap saved with save_roadmap() instead of generating one. The arrays are memory-mapped,
+        so planners in this and other processes share a single read-only copy of the roadmap.
+        Build parameters left as None (seed, k_neighbors, connection_radius) are taken from the roadmap.
+        Raises FlightPlanError if the roadmap was built for different no-fly zones or another destination,
+        or with build parameters other than the ones given.
+        """
+        arrays, metadata = load_roadmap(roadmap_path)
+        if metadata['zone_hash'] != self.zone_fingerprint():
+            raise FlightPlanError(roadmap_path, "Stale roadmap: no-fly zones have changed since it was built")
+        if not np.allclose(metadata['destination'], self.destination):
+            raise FlightPlanError(roadmap_path, "Stale roadmap: it was built for a different destination")
+        for name in ('seed', 'k_neighbors', 'connection_radius'):
+            if getattr(self, name) is not None and getattr(self, name) != metadata[name]:
+                raise FlightPlanError(roadmap_path, f"Roadmap was built with {name}={metadata[name]}, "
+                                                    f"not {getattr(self, name)}")
+        self.seed = metadata['seed']
+        self.num_waypoints = metadata['num_waypoints']
+        self.k_neighbors = metadata['k_neighbors']
+        self.connection_radius = metadata['connection_radius']
+        self.waypoints = arrays['nodes']
+        self.edge_sources = arrays['edge_sources']
+        self.edge_targets = arrays['edge_targets']
+        self.edge_lengths = arrays['edge_lengths']
+        self.edge_weights = arrays['edge_weights']
+        return self.assemble_graph(CSRRoadmap.from_arrays(arrays) if self.backend == 'csr' else None)
+
+    def save_roadmap(self, roadmap_path):
+        """
+        Save the roadmap (node array, CSR edges, lengths and weights) with its seed and zone hash so it
+        can be loaded memory-mapped with FlightPlanner(..., roadmap_path=...).
+        """
+        roadmap = self.graph if self.backend == 'csr' else CSRRoadmap(
+            self.waypoints, self.edge_sources, self.edge_targets, self.edge_weights)
+        arrays = dict(roadmap.to_arrays(), edge_sources=self.edge_sources.astype(np.int32),
+                      edge_lengths=self.edge_lengths)
+        metadata = {
+            'seed': self.seed,
+            'num_waypoints': self.num_waypoints,
+            'k_neighbors': self.k_neighbors,
+            'connection_radius': self.connection_radius,
+            'destination': self.destination.tolist(),
+            'zone_hash': self.zone_fingerprint(),
+        }
+        save_roadmap(roadmap_path, arrays, metadata)
+
+    def csr_roadmap(self):
+        """
+        Return the roadmap in CSR form for batched searches. With the networkx backend a CSR copy is built
+        from the edge arrays and reused until the graph version changes.
+        """
+        if self.backend == 'csr':
+            return self.graph
+        if self.csr_copy is None or self.csr_copy[0] != self.graph_version:
+            roadmap = CSRRoadmap(self.waypoints, self.edge_sources, self.edge_targets, self.edge_weights.copy())
+            self.csr_copy = (self.graph_version, roadmap)
+        return self.csr_copy[1]
+
+    def zone_fingerprint(self):
+        """
+        Hash of the current no-fly zone set, stored with saved roadmaps to detect stale ones.
+        """
+        return self.no_fly_zones.fingerprint() if self.no_fly_zones is not None else 'none'
+
+    def assemble_graph(self, roadmap=None):
+        """
+        Index the nodes and build the graph backend from the waypoint and edge arrays.
+        """
+        self.node_keys = list(map(tuple, self.waypoints.tolist()))
+        self.node_index = {node: index for index, node in enumerate(self.node_keys)}
+        self.node_tree = KDTree(self.waypoints)
+        self.incremental_planner = None
+        self.invalidate_paths()
+
+        if self.backend == 'csr':
+            return roadmap if roadmap is not None else CSRRoadmap(
+                self.waypoints, self.edge_sources, self.edge_targets, self.edge_weights)
         graph = nx.DiGraph()
-        waypoints = list(self.generate_waypoints())
-        waypoints.append(self.destination)  # Ensure destination is included
-        waypoints.append(np.array([0, 0, 0]))  # Ensure start point is included
-
-        for point in waypoints:
-            for other_point in waypoints:
-                if np.array_equal(point, other_point):
-                    continue
-                if not self.is_point_in_no_fly_zone((point + other_point) / 2):
-                    distance = np.linalg.norm(point - other_point)
-                    if self.weather_impact_callback:
-                        distance *= self.weather_impact_callback(point, other_point)  # Adjust distance based on weather
-                    graph.add_edge(tuple(point), tuple(other_point), weight=distance)
+        nodes = self.node_keys
+        graph.add_nodes_from(nodes)
+        open_edges = np.isfinite(self.edge_weights)  # Blocked edges are kept in the arrays only
+        graph.add_weighted_edges_from(
+            zip([nodes[i] for i in self.edge_sources[open_edges]], [nodes[j] for j in self.edge_targets[open_edges]],
+                self.edge_weights[open_edges].tolist()))
         return graph
 
+    def build_edges(self, waypoints):
+        """
+        Select candidate edges between waypoints and filter them against the no-fly zones in one batch.
+        Returns the source indices, target indices and Euclidean lengths of the accepted edges.
+        """
+        sources, targets = self.select_neighbors(waypoints)
+        starts, ends = waypoints[sources], waypoints[targets]
+        distances = np.linalg.norm(ends - starts, axis=1)
+
+        # Skip coincident points, then drop edges whose straight segment passes through a no-fly zone
+        keep = distances > 0
+        keep[keep] = ~self.segments_in_no_fly_zone(starts[keep], ends[keep])
+        return sources[keep], targets[keep], distances[keep]
+
+    def weather_multipliers(self, starts, ends):
+        """
+        Return the weather cost multiplier for each edge given by its (E, 3) start and end points.
+        """
+        if not self.weather_impact_callback:
+            return np.ones(len(starts))
+        if self.batched_weather:
+            multipliers = np.asarray(self.weather_impact_callback(np.asarray(starts), np.asarray(ends)), dtype=float)
+            if multipliers.shape != (len(starts),):
+                raise FlightPlanError(multipliers.shape, "Batched weather callback must return one multiplier per edge")
+            return multipliers
+        # Adjust distance based on weather
+        return np.fromiter(
+            (self.weather_impact_callback(point, other_point) for point, other_point in zip(starts, ends)),
+            dtype=float, count=len(starts))
+
+    def reweight_edges(self, weather_impact_callback=None, batched_weather=None, edge_ids=None):
+        """
+        Re-apply the weather model to existing edges in place, e.g. after a weather update, without
+        rebuilding the graph. Optionally installs a new callback first. Blocked edges stay blocked.
+        Returns the ids of the edges whose weight changed.
+        """
+        if weather_impact_callback is not None:
+            self.weather_impact_callback = weather_impact_callback
+        if batched_weather is not None:
+            self.batched_weather = batched_weather
+        edge_ids = np.arange(len(self.edge_weights)) if edge_ids is None else np.asarray(edge_ids, dtype=np.intp)
+        edge_ids = edge_ids[np.isfinite(self.edge_weights[edge_ids])]
+        weights = self.edge_lengths[edge_ids] * self.weather_multipliers(
+            self.waypoints[self.edge_sources[edge_ids]], self.waypoints[self.edge_targets[edge_ids]])
+        changed = weights != self.edge_weights[edge_ids]
+        if np.any(changed):
+            self.update_edge_weights(edge_ids[changed], weights[changed])
+        return edge_ids[changed]
+
+    def select_neighbors(self, waypoints):
+        """
+        Pick candidate neighbours for every waypoint. Uses a KDTree k-nearest or radius query when
+        k_neighbors or connection_radius is set, and every ordered pair of waypoints otherwise.
+        Returns the source and target indices of the candidate edges.
+        """
+        count = len(waypoints)
+        if self.k_neighbors is None and self.connection_radius is None:
+            return np.nonzero(~np.eye(count, dtype=bool))
+
+        tree = KDTree(waypoints)
+        if self.k_neighbors is not None:
+            k = min(self.k_neighbors + 1, count)  # The closest hit is the waypoint itself
+            upper_bound = self.connection_radius if self.connection_radius is not None else np.inf
+            _, neighbors = tree.query(waypoints, k=k, distance_upper_bound=upper_bound)
+            neighbors = neighbors.reshape(count, k)
+            sources = np.repeat(np.arange(count), k)
+            targets = neighbors.ravel()
+            valid = (targets < count) & (targets != sources)  # Missing neighbours are reported as index == count
+            sources, targets = sources[valid], targets[valid]
+        else:
+            pairs = tree.query_pairs(self.connection_radius, output_type='ndarray')
+            sources, targets = pairs[:, 0], pairs[:, 1]
+
+        # Nearest-neighbour relations are not symmetric, so connect both directions and drop duplicates
+        edge_keys = np.unique(np.concatenate([sources * count + targets, targets * count + sources]))
+        return edge_keys // count, edge_keys % count
+
     def generate_waypoints(self):
         """
         Generate waypoints for the graph. Ideally, these should cover the operational area
         and consider swarm flight paths.
         """
         # Random waypoints generated across a defined space
-        return np.random.rand(10, 3) * 100
+        if self.seed is not None:
+            return np.random.default_rng(self.seed).random((self.num_waypoints, 3)) * 100
+        return np.random.rand(self.num_waypoints, 3) * 100
 
     def is_point_in_no_fly_zone(self, point):
         """
         Check if a point is within a no-fly zone.
         """
-        if self.no_fly_zones:
-            distance, _ = self.no_fly_zones.query(point)
-            return distance < 5  # no-fly zones have a buffer of 5 units
-        return False
+        return bool(self.points_in_no_fly_zone(point)[0])
+
+    def points_in_no_fly_zone(self, points):
+        """
+        Check a batch of points against the no-fly zones. Returns a boolean array with one entry per point.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self.no_fly_zones is not None:
+            return self.no_fly_zones.contains_points(points)
+        return np.zeros(len(points), dtype=bool)
+
+    def segments_in_no_fly_zone(self, starts, ends):
+        """
+        Check a batch of straight segments against the no-fly zones, testing the whole swept segment
+        rather than a sample point. Returns a boolean array with one entry per segment.
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        if self.no_fly_zones is not None:
+            return self.no_fly_zones.segments_blocked(starts, ends)
+        return np.zeros(len(starts), dtype=bool)
+
+    def edge_ids(self, sources, targets):
+        """
+        Look up the ids of the edges between the given source and target nodes (node tuples or indices).
+        Returns -1 for pairs that are not connected.
+        """
+        sources = np.array([self.node_index[tuple(node)] if np.ndim(node) else node for node in sources], dtype=np.intp)
+        targets = np.array([self.node_index[tuple(node)] if np.ndim(node) else node for node in targets], dtype=np.intp)
+        if len(self.edge_sources) == 0:
+            return np.full(len(sources), -1, dtype=np.intp)
+        count = len(self.node_keys)
+        # Edge arrays are ordered by source then target, so the combined key is sorted
+        edge_keys = self.edge_sources.astype(np.int64) * count + self.edge_targets
+        wanted = sources * count + targets
+        positions = np.minimum(np.searchsorted(edge_keys, wanted), len(edge_keys) - 1)
+        return np.where(edge_keys[positions] == wanted, positions, -1)
 
-    def find_path(self, start_point):
+    def update_edge_weights(self, edge_ids, weights):
         """
-        Calculate a path from the start point to the destination using A* algorithm,
-        adaptable for weather and swarm.
+        Change the cost of existing edges in place. An infinite weight blocks the edge and removes it from
+        the graph; a finite weight on a blocked edge restores it. Only the incremental planner's affected
+        nodes are repaired, the graph is never rebuilt. Ids outside the edge arrays, such as the -1 edge_ids
+        reports for unconnected pairs, raise FlightPlanError before any weight is written.
         """
-        start_point = tuple(start_point)
-        destination = tuple(self.destination)
-        if nx.has_path(self.graph, start_point, destination):
-            return nx.astar_path(self.graph, start_point, destination, weight='weight')
+        edge_ids = np.asarray(edge_ids, dtype=np.intp).reshape(-1)
+        invalid = (edge_ids < 0) | (edge_ids >= len(self.edge_weights))
+        if np.any(invalid):
+            raise FlightPlanError(edge_ids[invalid].tolist(), "No such edge")
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), edge_ids.shape)
+        self.edge_weights[edge_ids] = weights
+        self.invalidate_paths()
+        if self.backend == 'csr':
+            self.graph.set_weights(edge_ids, weights)
+            return
+
+        changed = []
+        for edge_id, weight in zip(edge_ids.tolist(), weights.tolist()):
+            u = self.node_keys[self.edge_sources[edge_id]]
+            v = self.node_keys[self.edge_targets[edge_id]]
+            if np.isinf(weight):
+                if self.graph.has_edge(u, v):
+                    self.graph.remove_edge(u, v)
+            else:
+                self.graph.add_edge(u, v, weight=weight)
+            changed.append((u, v))
+
+        if self.incremental_planner is not None:
+            finite = np.isfinite(weights)
+            if np.any(weights[finite] < self.heuristic_scale * self.edge_lengths[edge_ids[finite]]):
+                # The distance heuristic would overestimate the new costs, so the stored search is discarded
+                self.incremental_planner = None
+            else:
+                self.incremental_planner.update_edges(changed)
+
+    def add_no_fly_zone(self, centers, radii=0.0, heights=None, shape='sphere'):
+        """
+        Add no-fly zones at runtime and block every edge whose segment now crosses one.
+        The shape applies when this creates the zone map; an existing map keeps its own.
+        Returns the ids of the edges that were blocked.
+        """
+        if self.no_fly_zones is None:
+            self.no_fly_zones = NoFlyZoneMap(centers, radii=radii, shape=shape, heights=heights)
+        else:
+            if shape != self.no_fly_zones.shape:
+                raise FlightPlanError(shape, f"The no-fly zone map holds {self.no_fly_zones.shape} zones")
+            self.no_fly_zones.add_zones(centers, radii=radii, heights=heights)
+        open_edges = np.flatnonzero(np.isfinite(self.edge_weights))
+        blocked = open_edges[self.segments_in_no_fly_zone(
+            self.waypoints[self.edge_sources[open_edges]], self.waypoints[self.edge_targets[open_edges]])]
+        if len(blocked) > 0:
+            self.update_edge_weights(blocked, np.inf)
+        else:
+            self.invalidate_paths()
+        return blocked
+
+    def invalidate_paths(self):
+        """
+        Advance the graph version and drop cached paths after the graph or the no-fly zones changed.
+        """
+        self.graph_version += 1
+        if self.path_cache is not None:
+            self.path_cache.clear()
+
+    def snap_to_node(self, point):
+        """
+        Return the graph node closest to the point if it lies within snap_tolerance, otherwise None.
+        """
+        distance, index = self.node_tree.query(np.asarray(point, dtype=float))
+        return self.node_keys[index] if distance <= self.snap_tolerance else None
+
+    def get_incremental_planner(self):
+        """
+        Return the D* Lite planner for the current destination, creating it on first use.
+        The heuristic is the straight-line distance scaled down to the cheapest cost per unit length,
+        so it never overestimates even when weather makes some edges cheaper than their length.
+        """
+        goal = tuple(self.destination)
+        if self.incremental_planner is None or self.incremental_planner.goal != goal:
+            finite = np.isfinite(self.edge_weights)
+            ratios = self.edge_weights[finite] / self.edge_lengths[finite]
+            self.heuristic_scale = min(1.0, float(ratios.min())) if len(ratios) else 1.0
+            scale = self.heuristic_scale
+            self.incremental_planner = DStarLite(
+                self.graph, goal, heuristic=lambda a, b: scale * np.sqrt(
+                    (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2))
+        return self.incremental_planner
+
+    def attach_point(self, point, outgoing=True):
+        """
+        Find temporary connector edges between an off-graph position and its nearest graph nodes.
+        Connectors are collision-checked against the no-fly zones and weighted like roadmap edges.
+        Returns the position as a node key, the indices of the connected nodes and the connector weights.
+        """
+        point = np.asarray(point, dtype=float)
+        radius = self.attach_radius if self.attach_radius is not None else (
+            self.connection_radius if self.connection_radius is not None else np.inf)
+        k = min(self.attach_neighbors, len(self.node_keys))
+        distances, indices = self.node_tree.query(point, k=k, distance_upper_bound=radius)
+        distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        found = indices < len(self.node_keys)
+        distances, indices = distances[found], indices[found]
+
+        neighbors = self.waypoints[indices]
+        here = np.broadcast_to(point, neighbors.shape)
+        starts, ends = (here, neighbors) if outgoing else (neighbors, here)
+        clear = ~self.segments_in_no_fly_zone(starts, ends)
+        weights = distances[clear] * self.weather_multipliers(starts[clear], ends[clear])
+        return tuple(point.tolist()), indices[clear], weights
+
+    def locate(self, point, outgoing=True):
+        """
+        Resolve a position to a graph node, attaching it with connector edges when it does not snap to one.
+        Returns the node key and None, or the position key and its (indices, weights) connectors.
+        """
+        node = self.snap_to_node(point)
+        if node is not None:
+            return node, None
+        node, indices, weights = self.attach_point(point, outgoing=outgoing)
+        if len(indices) == 0:
+            side = "start position to the roadmap" if outgoing else "roadmap to the goal position"
+            raise PathfindingError(f"No clear connection from the {side}")
+        return node, (indices, weights)
+
+    def find_path(self, start_point, goal_point=None):
+        """
+        Calculate a path from the start point to the destination (or goal_point) using A* algorithm,
+        adaptable for weather and swarm. In incremental mode the previous search is repaired instead.
+        Positions that are not graph nodes are attached to nearby nodes for this query only, so live
+        position estimates cost one search and no rebuild. Results between graph nodes are served from
+        the path cache while the graph is unchanged.
+        """
+        goal_point = self.destination if goal_point is None else np.asarray(goal_point)
+        start_node, start_links = self.locate(start_point, outgoing=True)
+        goal_node, goal_links = self.locate(goal_point, outgoing=False)
+        if start_node == goal_node:
+            return [start_node]
+
+        direct = None
+        if start_links is not None and goal_links is not None and not self.segments_in_no_fly_zone(start_point, goal_point)[0]:
+            # Both ends are off the roadmap, so the direct hop is a candidate too
+            hop = np.reshape(np.asarray(start_point, dtype=float), (1, 3)), np.reshape(np.asarray(goal_point, dtype=float), (1, 3))
+            direct = np.linalg.norm(hop[1] - hop[0]) * self.weather_multipliers(*hop)[0]
+
+        cacheable = start_links is None and goal_links is None
+        cache_key = (start_node, goal_node, self.graph_version)
+        if self.path_cache is not None and cacheable:
+            cached = self.path_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        if self.backend == 'csr':
+            path = self.search_roadmap(start_node, start_links, goal_node, goal_links, direct)
         else:
-            raise PathfindingError("Either source or target is not in the graph")
+            path = self.search_with_connectors(start_node, start_links, goal_node, goal_links, direct)
+
+        if self.path_cache is not None and cacheable:
+            self.path_cache.put(cache_key, path)
+        return path
+
+    def search_with_connectors(self, start_node, start_links, goal_node, goal_links, direct):
+        """
+        Search the networkx graph after temporarily adding the connector edges of attached positions.
+        """
+        temporary_edges = []
+        if start_links is not None:
+            temporary_edges += [(start_node, self.node_keys[i], w) for i, w in zip(*start_links)]
+        if goal_links is not None:
+            temporary_edges += [(self.node_keys[i], goal_node, w) for i, w in zip(*goal_links)]
+        if direct is not None:
+            temporary_edges.append((start_node, goal_node, direct))
+        temporary_nodes = {node for node, links in ((start_node, start_links), (goal_node, goal_links)) if links is not None}
+        try:
+            self.graph.add_weighted_edges_from(temporary_edges)
+            return self.search(start_node, goal_node)
+        except nx.NetworkXException as e:
+            raise PathfindingError(f"Search between attached positions failed: {str(e)}")
+        finally:
+            for node in temporary_nodes:
+                self.graph.remove_node(node)
+                if self.incremental_planner is not None:
+                    self.incremental_planner.forget(node)
+
+    def search_roadmap(self, start_node, start_links, goal_node, goal_links, direct):
+        """
+        Search the CSR roadmap. Connectors are passed to the search instead of being added to the graph.
+        """
+        start = self.node_index[start_node] if start_links is None else start_links
+        goal = self.node_index[goal_node] if goal_links is None else goal_links
+        try:
+            indices, cost = self.graph.shortest_path(start, goal)
+        except PathfindingError:
+            if direct is None:
+                raise
+            return [start_node, goal_node]
+        if direct is not None and direct < cost:
+            return [start_node, goal_node]
+        path = [self.node_keys[i] for i in indices]
+        if start_links is not None:
+            path.insert(0, start_node)
+        if goal_links is not None:
+            path.append(goal_node)
+        return path
+
+    def search(self, start_node, goal_node):
+        """
+        Run one graph search between two nodes already present in the networkx graph.
+        """
+        if self.incremental and goal_node == tuple(self.destination):
+            return self.get_incremental_planner().plan(start_node)
+        if nx.has_path(self.graph, start_node, goal_node):
+            return nx.astar_path(self.graph, start_node, goal_node, weight='weight')
+        raise PathfindingError("Either source or target is not in the graph")
 
 def weather_impact_adjustment(point1, point2):
     """
@@ -70,11 +509,17 @@ def weather_impact_adjustment(point1, point2):
     """
     return 1.1  # Simulates a 10% increase in path cost due to weather
 
+def batched_weather_impact_adjustment(starts, ends):
+    """
+    Dummy batched weather model: one call receives every edge as (E, 3) start and end arrays.
+    """
+    return np.full(len(starts), 1.1)  # Simulates a 10% increase in path cost due to weather
+
 # Example usage can be:
-planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]), weather_impact_callback=weather_impact_adjustment)
-start_point = np.array([0, 0, 0])
-try:
-    path = planner.find_path(start_point)
-    print("Path:", path)
-except NavigationError as e:
-    print(e)
+# planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]), weather_impact_callback=weather_impact_adjustment)
+# start_point = np.array([0, 0, 0])
+# try:
+#     path = planner.find_path(start_point)
+#     print("Path:", path)
+# except NavigationError as e:
+#     print(e)
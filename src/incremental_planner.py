@@ -0,0 +1,146 @@
+import heapq
+import math
+from exceptions import PathfindingError
+
+class DStarLite:
+    """
+    Incremental shortest-path planner (D* Lite) over a weighted networkx DiGraph.
+    The search runs backwards from the goal, so after edge costs change or the drone moves only the
+    affected part of the previous solution is repaired instead of searching the whole graph again.
+    """
+    def __init__(self, graph, goal, heuristic=None, weight='weight'):
+        """
+        Args:
+            graph (nx.DiGraph): Roadmap to plan on. The planner reads it directly, so edge changes must be
+                                reported through update_edges() after the graph is modified.
+            goal (tuple): Goal node.
+            heuristic (callable): Consistent estimate heuristic(a, b) of the cost between two nodes.
+                                  Defaults to zero, which turns the search into incremental Dijkstra.
+            weight (str): Edge attribute holding the cost.
+        """
+        self.graph = graph
+        self.goal = goal
+        self.heuristic = heuristic or (lambda a, b: 0.0)
+        self.weight = weight
+        self.reset()
+
+    def reset(self):
+        """
+        Discard every stored estimate so the next plan() searches from scratch.
+        """
+        self.g = {}
+        self.rhs = {self.goal: 0.0}
+        self.queue = []
+        self.queued = {}
+        self.km = 0.0
+        self.start = None
+        self.expansions = 0
+        self.push(self.goal, (self.heuristic_to_start(self.goal), 0.0))
+
+    def heuristic_to_start(self, node):
+        return self.heuristic(self.start, node) if self.start is not None else 0.0
+
+    def calculate_key(self, node):
+        best = min(self.g.get(node, math.inf), self.rhs.get(node, math.inf))
+        return (best + self.heuristic_to_start(node) + self.km, best)
+
+    def push(self, node, key):
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def top(self):
+        """
+        Return the smallest valid queue entry, discarding entries superseded by a later push.
+        """
+        while self.queue:
+            key, node = self.queue[0]
+            if self.queued.get(node) == key:
+                return key, node
+            heapq.heappop(self.queue)
+        return (math.inf, math.inf), None
+
+    def update_vertex(self, node):
+        """
+        Recompute the one-step lookahead cost of a node and (re)queue it if it became inconsistent.
+        """
+        if node != self.goal:
+            best = math.inf
+            for successor, data in self.graph.succ[node].items() if node in self.graph else ():
+                cost = data[self.weight] + self.g.get(successor, math.inf)
+                if cost < best:
+                    best = cost
+            self.rhs[node] = best
+        if self.g.get(node, math.inf) != self.rhs.get(node, math.inf):
+            self.push(node, self.calculate_key(node))
+        else:
+            self.queued.pop(node, None)
+
+    def compute_shortest_path(self):
+        """
+        Expand inconsistent nodes until the start node is consistent and no cheaper entry remains.
+        """
+        while True:
+            top_key, node = self.top()
+            if node is None:
+                break
+            start_key = self.calculate_key(self.start)
+            if not (top_key < start_key or self.rhs.get(self.start, math.inf) > self.g.get(self.start, math.inf)):
+                break
+            self.expansions += 1
+            new_key = self.calculate_key(node)
+            if top_key < new_key:
+                self.push(node, new_key)
+            elif self.g.get(node, math.inf) > self.rhs.get(node, math.inf):
+                self.g[node] = self.rhs[node]
+                self.queued.pop(node, None)
+                for predecessor in self.graph.pred[node]:
+                    self.update_vertex(predecessor)
+            else:
+                self.g[node] = math.inf
+                for predecessor in list(self.graph.pred[node]) + [node]:
+                    self.update_vertex(predecessor)
+
+    def update_edges(self, edges):
+        """
+        Notify the planner that the cost of the given (u, v) edges changed or that they were added or removed.
+        """
+        for source, _ in edges:
+            self.update_vertex(source)
+
+    def forget(self, node):
+        """
+        Drop the stored estimates of a node that was removed from the graph, e.g. a temporary start.
+        """
+        self.g.pop(node, None)
+        self.rhs.pop(node, None)
+        self.queued.pop(node, None)
+
+    def plan(self, start):
+        """
+        Return the cheapest path from start to the goal, repairing the previous solution where possible.
+        """
+        if start not in self.graph or self.goal not in self.graph:
+            raise PathfindingError("Either source or target is not in the graph")
+        if self.start is None:
+            self.start = start
+            # Keys pushed before the start was known carry no heuristic term, so requeue them
+            for node, key in list(self.queued.items()):
+                self.push(node, self.calculate_key(node))
+        elif start != self.start:
+            self.km += self.heuristic(self.start, start)
+            self.start = start
+        # A start that was just attached to the graph has no lookahead cost yet
+        self.update_vertex(start)
+        self.compute_shortest_path()
+
+        if math.isinf(self.g.get(start, math.inf)) and math.isinf(self.rhs.get(start, math.inf)):
+            raise PathfindingError("No available path from start to destination.")
+        path = [start]
+        node = start
+        while node != self.goal:
+            node = min(self.graph.succ[node].items(),
+                       key=lambda item: item[1][self.weight] + self.g.get(item[0], math.inf))[0]
+            if len(path) > len(self.graph):
+                raise PathfindingError("Incremental planner failed to extract a path.")
+            path.append(node)
+        return path
@@ -0,0 +1,79 @@
+import copy
+import warnings
+import torch
+from model_registry import LazyModel
+
+try:
+    from torch.ao.quantization import get_default_qconfig_mapping, quantize_dynamic
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+except ImportError:  # PyTorch builds without the quantization toolkit
+    quantize_dynamic = None
+
+QUANTIZATION_MODES = (None, 'dynamic', 'static')
+
+class OptimizedModel:
+    """
+    CPU inference wrapper around an eval-mode model. It works on a private copy of the model, optionally
+    quantized to int8 (dynamic: Linear layers; static: the whole graph, calibrated on sample inputs),
+    converted to channels-last memory layout and traced into a frozen TorchScript graph. Calls run under
+    torch.inference_mode, with 4-D inputs converted to the model's memory layout.
+    """
+    def __init__(self, model, example_inputs, trace=True, channels_last=True, quantize=None,
+                 calibration_inputs=None, threads=None):
+        """
+        Args:
+            model (torch.nn.Module or LazyModel): Model to optimize; it is copied, never modified.
+            example_inputs (tuple): Inputs of the shapes the model is called with, used for tracing.
+            trace (bool): Trace and freeze the model into a TorchScript graph.
+            channels_last (bool): Store convolution weights and inputs in NHWC layout (float models only).
+            quantize (str): None, 'dynamic' (int8 Linear layers) or 'static' (int8 graph, needs calibration).
+            calibration_inputs (list): Input tuples run through the model to calibrate static quantization;
+                                       defaults to the example inputs.
+            threads (int): Intra-op thread count to set once the model is built. torch keeps a single
+                           process-wide count, so it applies to every model in the process; None leaves it.
+        """
+        if quantize not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode {quantize!r}; expected one of {QUANTIZATION_MODES}")
+        if quantize and quantize_dynamic is None:
+            raise RuntimeError("Quantization needs torch.ao.quantization, which this PyTorch build does not provide")
+        example_inputs = tuple(example_inputs)
+        model = copy.deepcopy(model.resolve() if isinstance(model, LazyModel) else model).eval()
+        self.quantize = quantize
+        self.channels_last = channels_last and quantize != 'static'
+        if quantize == 'dynamic':
+            model = quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif quantize == 'static':
+            prepared = prepare_fx(model, get_default_qconfig_mapping(torch.backends.quantized.engine), example_inputs)
+            with torch.no_grad():
+                for inputs in calibration_inputs or [example_inputs]:
+                    prepared(*inputs)
+            model = convert_fx(prepared)
+        if self.channels_last:
+            model = model.to(memory_format=torch.channels_last)
+            example_inputs = self.prepare_inputs(example_inputs)
+        if trace:
+            with torch.no_grad(), warnings.catch_warnings():
+                # TorchScript is deprecated in favour of torch.compile, which needs a C++ toolchain at runtime
+                warnings.simplefilter('ignore', FutureWarning)
+                model = torch.jit.freeze(torch.jit.trace(model, example_inputs))
+                if not quantize:
+                    model = torch.jit.optimize_for_inference(model)
+        self.model = model
+        if threads:
+            torch.set_num_threads(threads)
+
+    def prepare_inputs(self, inputs):
+        if not self.channels_last:
+            return inputs
+        return tuple(tensor.contiguous(memory_format=torch.channels_last) if tensor.dim() == 4 else tensor
+                     for tensor in inputs)
+
+    def __call__(self, *inputs):
+        with torch.inference_mode():
+            return self.model(*self.prepare_inputs(inputs))
+
+# Example usage can be:
+# model = DecisionNet().eval()
+# example = (torch.zeros(1, 3, 64, 64), torch.zeros(1, 10))
+# fast_model = OptimizedModel(model, example, quantize='dynamic', threads=4)
+# outputs = fast_model(image_tensor, sensor_tensor)
@@ -0,0 +1,154 @@
+import logging
+import queue
+import time
+from concurrent.futures import Future
+from threading import Thread
+import torch
+from exceptions import ObstacleDetectionError
+from obstacle import FramePreprocessor
+
+class InferenceServer:
+    """
+    Local micro-batching service for camera models shared by many drones.
+    Frames are queued from any thread; a worker thread groups them into batches of up to max_batch_size,
+    waiting at most max_delay after the first queued frame, and runs one forward pass per batch.
+    Each caller gets a Future that resolves to the model output for its own frame.
+    """
+    def __init__(self, model, max_batch_size=8, max_delay=0.01, preprocess=None, postprocess=None):
+        """
+        Args:
+            model (torch.nn.Module): Model taking an (N, C, H, W) batch.
+            max_batch_size (int): Largest batch run in one forward pass.
+            max_delay (float): Seconds the first frame of a batch may wait for more frames.
+            preprocess (callable): Turns a submitted frame into a (1, C, H, W) or (C, H, W) tensor.
+                                   Defaults to FramePreprocessor for raw BGR camera frames.
+            postprocess (callable): Applied to each frame's output row before it is returned.
+        """
+        if max_batch_size < 1 or max_delay < 0:
+            raise ObstacleDetectionError(f"Invalid batching settings: max_batch_size={max_batch_size}, max_delay={max_delay}")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.preprocess = preprocess or FramePreprocessor()
+        self.postprocess = postprocess
+        self.requests = queue.Queue()
+        self.batch = None  # Preallocated input batch, created from the first frame's shape
+        self.worker = None
+        self.batches = 0
+        self.frames = 0
+        self.logger = logging.getLogger('InferenceServer')
+
+    def start(self):
+        """
+        Start the worker thread. Returns the server so it can be used as `server = InferenceServer(...).start()`.
+        """
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = Thread(target=self.serve, daemon=True)
+            self.worker.start()
+        return self
+
+    def stop(self):
+        """
+        Finish the batches already queued, then stop the worker thread.
+        """
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker.join()
+            self.worker = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def submit(self, frame):
+        """
+        Queue a frame for inference and return a Future for its result.
+        """
+        if self.worker is None:
+            raise ObstacleDetectionError("Inference server is not running")
+        future = Future()
+        self.requests.put((frame, future, time.perf_counter()))
+        return future
+
+    def collect(self, first):
+        """
+        Gather up to max_batch_size requests, waiting until the first one's deadline for more to arrive.
+        Returns the requests and whether the stop marker was seen.
+        """
+        pending = [first]
+        deadline = first[2] + self.max_delay
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return pending, True
+            pending.append(request)
+        return pending, False
+
+    def serve(self):
+        """
+        Worker loop: wait for a request, form a batch, run it, and resolve the futures.
+        """
+        stopping = False
+        while not stopping:
+            first = self.requests.get()
+            if first is None:
+                break
+            pending, stopping = self.collect(first)
+            self.run_batch(pending)
+        # Anything submitted after stop() was called never runs
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[1].set_exception(ObstacleDetectionError("Inference server stopped"))
+
+    def run_batch(self, pending):
+        """
+        Preprocess the frames into the preallocated batch, run one forward pass and resolve the futures.
+        """
+        live = [request for request in pending if request[1].set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            for index, (frame, _, _) in enumerate(live):
+                tensor = self.preprocess(frame)
+                tensor = tensor[0] if tensor.dim() == 4 else tensor
+                if self.batch is None or self.batch.shape[1:] != tensor.shape:
+                    self.batch = torch.empty((self.max_batch_size,) + tuple(tensor.shape), dtype=tensor.dtype)
+                self.batch[index].copy_(tensor)
+            with torch.inference_mode():
+                outputs = self.model(self.batch[:len(live)])
+        except Exception as e:
+            self.logger.error(f"Batch of {len(live)} frames failed: {str(e)}")
+            for _, future, _ in live:
+                future.set_exception(ObstacleDetectionError(f"Batched inference failed: {str(e)}"))
+            return
+        self.batches += 1
+        self.frames += len(live)
+        for row, (_, future, _) in enumerate(live):
+            output = outputs[row:row + 1].clone()  # Detach each result from the shared batch output
+            future.set_result(self.postprocess(output) if self.postprocess else output)
+
+    def stats(self):
+        """
+        Return the number of batches run, frames served and the mean batch size.
+        """
+        return {
+            'batches': self.batches,
+            'frames': self.frames,
+            'mean_batch_size': self.frames / self.batches if self.batches else 0.0,
+        }
+
+# Example usage can be:
+# detector = ObstacleDetector('camera_model.pth', 'lidar_model.pth')
+# with detector.create_inference_server(max_batch_size=8, max_delay=0.02) as server:
+#     futures = [server.submit(frame) for frame in frames_from_drones]
+#     detections = [future.result() for future in futures]
@@ -0,0 +1,125 @@
+import numpy as np
+from exceptions import ObstacleDetectionError
+
+class LidarObstacleExtractor:
+    """
+    Geometric obstacle extraction for planar LiDAR scans, with no neural network.
+    Ranges are converted to Cartesian points, split into segments wherever the range jumps between
+    neighbouring beams (or a beam has no return), and every segment with enough points is reported as an
+    obstacle with its centroid, bounding extent and closest distance. Segments wrap around the end of the
+    scan, and any number of scans can be processed in one vectorized call.
+    """
+    def __init__(self, min_range=0.1, max_range=100.0, jump_threshold=0.5, relative_jump=0.05, min_points=2,
+                 start_angle=0.0):
+        """
+        Args:
+            min_range (float): Returns closer than this (sensor housing, noise) are ignored.
+            max_range (float): Returns at or beyond this are treated as "no hit".
+            jump_threshold (float): Absolute range change in meters between neighbouring beams that starts a new segment.
+            relative_jump (float): Extra allowed change as a fraction of the nearer range, since beams spread with distance.
+            min_points (int): Smallest number of returns reported as an obstacle.
+            start_angle (float): Bearing of beam 0 in radians; beams are evenly spaced over a full turn.
+        """
+        self.min_range = min_range
+        self.max_range = max_range
+        self.jump_threshold = jump_threshold
+        self.relative_jump = relative_jump
+        self.min_points = min_points
+        self.start_angle = start_angle
+        self.beam_cache = (None, None, None)  # (beam count, cos, sin)
+
+    def beam_directions(self, beams):
+        """
+        Return the cosine and sine of every beam bearing for scans with the given number of beams.
+        """
+        if self.beam_cache[0] != beams:
+            angles = self.start_angle + np.arange(beams) * (2 * np.pi / beams)
+            self.beam_cache = (beams, np.cos(angles), np.sin(angles))
+        return self.beam_cache[1], self.beam_cache[2]
+
+    def extract(self, scan):
+        """
+        Extract obstacles from one scan.
+
+        Args:
+            scan (array): Ranges in meters, one per beam, as returned by SensorInput.get_lidar_data.
+
+        Returns:
+            dict: 'centroids' (K, 2) and 'extents' (K, 2) in meters in the sensor frame, 'distances' (K,)
+                  to the closest return, 'bearings' (K,) of the centroids in radians and 'counts' (K,) returns.
+        """
+        result = self.extract_batch(np.asarray(scan, dtype=float)[None, :])
+        del result['drones']
+        return result
+
+    def extract_batch(self, scans):
+        """
+        Extract obstacles from many scans (one per drone) at once.
+
+        Args:
+            scans (array): (D, N) ranges, one row per scan.
+
+        Returns:
+            dict: The arrays returned by extract for all obstacles of all scans, plus 'drones' (K,) giving
+                  the row each obstacle came from. Obstacles are ordered by drone.
+        """
+        ranges = np.array(scans, dtype=float)
+        if ranges.ndim != 2 or ranges.shape[1] < 2:
+            raise ObstacleDetectionError(f"Expected (D, N) LiDAR scans with N >= 2, got shape {ranges.shape}")
+        drones, beams = ranges.shape
+        valid = np.isfinite(ranges) & (ranges >= self.min_range) & (ranges < self.max_range)
+        ranges[~valid] = np.nan
+
+        # breaks[d, i]: beam i and beam i + 1 (circularly) belong to different segments
+        following = np.roll(ranges, -1, axis=1)
+        with np.errstate(invalid='ignore'):
+            limit = self.jump_threshold + self.relative_jump * np.fmin(ranges, following)
+            breaks = ~(np.abs(following - ranges) <= limit)  # NaN (no return) always breaks
+
+        # Rotate each scan to start just after its first break, so no segment wraps around the end
+        offsets = (np.argmax(breaks, axis=1) + 1) % beams
+        order = (np.arange(beams) + offsets[:, None]) % beams
+        rows = np.arange(drones)[:, None]
+        ranges, breaks = ranges[rows, order], breaks[rows, order]
+        cos, sin = self.beam_directions(beams)
+        x, y = ranges * cos[order], ranges * sin[order]
+
+        starts = np.empty((drones, beams), dtype=bool)
+        starts[:, 0] = True
+        starts[:, 1:] = breaks[:, :-1]
+        starts = np.flatnonzero(starts)
+        ranges, x, y = ranges.ravel(), x.ravel(), y.ravel()
+        counts = np.diff(np.append(starts, ranges.size))
+        keep = (counts >= self.min_points) & ~np.isnan(ranges[starts])  # Segments of missing returns are singletons
+        starts, counts = starts[keep], counts[keep]
+        if not len(starts):
+            empty = np.empty((0, 2))
+            return {'centroids': empty, 'extents': empty.copy(), 'distances': np.empty(0), 'bearings': np.empty(0),
+                    'counts': np.empty(0, dtype=int), 'drones': np.empty(0, dtype=int)}
+
+        # reduceat over the kept starts only would merge dropped segments into their predecessor, so
+        # reduce over every boundary (kept starts plus their ends) and take every other result
+        bounds = np.column_stack((starts, starts + counts)).ravel()
+        if bounds[-1] == ranges.size:
+            bounds = bounds[:-1]
+        def reduce(ufunc, values):
+            return ufunc.reduceat(values, bounds)[::2]
+        centroids = np.column_stack((reduce(np.add, x), reduce(np.add, y))) / counts[:, None]
+        extents = np.column_stack((reduce(np.maximum, x) - reduce(np.minimum, x),
+                                   reduce(np.maximum, y) - reduce(np.minimum, y)))
+        return {
+            'centroids': centroids,
+            'extents': extents,
+            'distances': reduce(np.minimum, ranges),
+            'bearings': np.arctan2(centroids[:, 1], centroids[:, 0]),
+            'counts': counts,
+            'drones': starts // beams,
+        }
+
+# Example usage can be:
+# extractor = LidarObstacleExtractor(jump_threshold=0.5, max_range=100.0)
+# scan = np.full(360, np.inf)           # Nothing in range...
+# scan[80:100] = 12.0                    # ...except a wall section ahead and to the left
+# obstacles = extractor.extract(scan)
+# print("Obstacle centroids:", obstacles['centroids'], "closest distances:", obstacles['distances'])
+# fleet = extractor.extract_batch(np.stack([scan, np.roll(scan, 90)]))  # Scans from two drones
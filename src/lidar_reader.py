@@ -0,0 +1,271 @@
+import os
+import select
+import time
+import termios
+import tty
+from threading import Condition, Event, Thread
+import numpy as np
+from exceptions import SensorError
+
+PACKET_SIZE = 47
+POINTS_PER_PACKET = 12
+HEADER = (0x54, 0x2C)
+
+# Little-endian packet layout of LD06-style 360 degree LiDARs
+PACKET_DTYPE = np.dtype([
+    ('header', 'u1'), ('ver_len', 'u1'),
+    ('speed', '<u2'),                      # Rotation speed in degrees per second
+    ('start_angle', '<u2'),                # Hundredths of a degree
+    ('points', [('distance', '<u2'), ('intensity', 'u1')], (POINTS_PER_PACKET,)),  # Distances in millimeters
+    ('end_angle', '<u2'),                  # Hundredths of a degree
+    ('timestamp', '<u2'),                  # Sensor milliseconds, wrapping at 30000
+    ('crc', 'u1'),                         # CRC-8 (polynomial 0x4D) over the preceding bytes
+])
+
+
+def crc8_table(polynomial=0x4D):
+    table = np.zeros(256, dtype=np.uint8)
+    for value in range(256):
+        crc = value
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[value] = crc
+    return table
+
+CRC8_TABLE = crc8_table()
+
+
+class LidarReader:
+    """
+    Streaming reader for a 360 degree LiDAR that sends fixed-size binary packets of 12 returns over a serial
+    port. Bytes are read into one preallocated buffer and parsed a chunk at a time with vectorized header
+    search, CRC check and field decoding; returns are binned by angle straight into a preallocated ring of
+    scan arrays. Each completed revolution is published with its arrival time, and consumers read the latest
+    scan as a view without copying.
+    """
+    def __init__(self, port, beams=360, baudrate=230400, ring_size=3, buffer_size=65536):
+        """
+        Args:
+            port (str): Serial device (or pty, FIFO or recorded file) the packets are read from.
+            beams (int): Number of angular bins per scan; ranges are in meters, inf where nothing returned.
+            baudrate (int): Line speed set on serial devices.
+            ring_size (int): Number of scan buffers; a published scan stays valid for ring_size - 1 revolutions.
+            buffer_size (int): Size of the receive buffer in bytes.
+        """
+        if ring_size < 2:
+            raise SensorError("LiDAR", f"Scan ring needs at least 2 buffers, got {ring_size}")
+        self.port = port
+        self.beams = beams
+        self.baudrate = baudrate
+        self.buffer = np.zeros(buffer_size, dtype=np.uint8)
+        self.length = 0
+        self.scans = np.full((ring_size, beams), np.inf)
+        self.filling = 0  # Ring slot of the revolution being assembled
+        self.published = None
+        self.timestamp = None
+        self.sequence = 0
+        self.previous_start = None  # Start angle of the last packet, to detect the revolution wrap
+        self.partial = True  # The revolution in progress when reading starts is incomplete
+        self.packets = 0
+        self.crc_errors = 0
+        self.condition = Condition()
+        self.stop_event = Event()
+        self.finished = Event()  # Set when a file-backed stream reaches its end
+        self.stream = None
+        self.thread = None
+
+    def open(self):
+        """
+        Open the port, switching serial devices to raw mode at the configured baud rate.
+        """
+        try:
+            fd = os.open(self.port, os.O_RDONLY | os.O_NOCTTY)
+        except OSError as e:
+            raise SensorError("LiDAR", f"Failed to open {self.port}: {str(e)}")
+        if os.isatty(fd):
+            tty.setraw(fd)
+            attributes = termios.tcgetattr(fd)
+            speed = getattr(termios, f'B{self.baudrate}', None)
+            if speed is not None:
+                attributes[4] = attributes[5] = speed
+                termios.tcsetattr(fd, termios.TCSANOW, attributes)
+        self.stream = os.fdopen(fd, 'rb', buffering=0)
+        return self
+
+    def start(self):
+        """
+        Open the port if needed and start reading in a background thread.
+        """
+        if self.stream is None:
+            self.open()
+        self.stop_event.clear()
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def run(self):
+        view = memoryview(self.buffer)
+        while not self.stop_event.is_set():
+            ready, _, _ = select.select([self.stream], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                received = self.stream.readinto(view[self.length:])
+            except OSError:
+                received = 0  # The other end of a pty was closed
+            if not received:
+                self.finished.set()
+                with self.condition:
+                    self.condition.notify_all()
+                return
+            self.length += received
+            self.process(time.monotonic())
+
+    def feed(self, data, timestamp=None):
+        """
+        Parse bytes received by other means (tests, replays). Returns the number of packets decoded.
+        """
+        data = np.frombuffer(data, dtype=np.uint8)
+        decoded = 0
+        while len(data):
+            count = min(len(data), len(self.buffer) - self.length)
+            self.buffer[self.length:self.length + count] = data[:count]
+            self.length += count
+            data = data[count:]
+            decoded += self.process(time.monotonic() if timestamp is None else timestamp)
+        return decoded
+
+    def process(self, timestamp):
+        """
+        Decode every complete packet in the receive buffer and keep only the unparsed tail.
+        """
+        received = self.buffer[:self.length]
+        candidates = np.flatnonzero((received[:-1] == HEADER[0]) & (received[1:] == HEADER[1]))
+        candidates = candidates[candidates <= self.length - PACKET_SIZE]
+        decoded, consumed = 0, 0
+        if len(candidates):
+            raw = received[candidates[:, None] + np.arange(PACKET_SIZE)]
+            valid = self.crc8(raw) == raw[:, -1]
+            starts, raw = candidates[valid], raw[valid]
+            # A header pattern inside a valid packet that happens to pass the CRC is not a packet
+            keep = np.ones(len(starts), dtype=bool)
+            keep[1:] = np.diff(starts) >= PACKET_SIZE
+            starts, raw = starts[keep], raw[keep]
+            # Rejected candidates lying inside accepted packets are payload bytes, not corrupted packets
+            rejected = candidates[~valid]
+            corrupted = len(rejected)
+            if len(starts) and corrupted:
+                owner = np.searchsorted(starts, rejected, side='right') - 1
+                inside = (owner >= 0) & (rejected - starts[np.maximum(owner, 0)] < PACKET_SIZE)
+                corrupted -= int(np.count_nonzero(inside))
+            self.crc_errors += corrupted
+            decoded = len(starts)
+            if decoded:
+                self.assemble(raw.view(PACKET_DTYPE).ravel(), timestamp)
+                consumed = starts[-1] + PACKET_SIZE
+        # Keep what may still become a packet: everything after the last one, up to a packet's worth of bytes
+        keep_from = max(consumed, self.length - (PACKET_SIZE - 1), 0)
+        tail = self.length - keep_from
+        self.buffer[:tail] = self.buffer[keep_from:self.length]
+        self.length = tail
+        self.packets += decoded
+        return decoded
+
+    @staticmethod
+    def crc8(raw):
+        """
+        CRC-8 of the first PACKET_SIZE - 1 bytes of each row of raw, computed for all rows at once.
+        """
+        crc = np.zeros(len(raw), dtype=np.uint8)
+        for column in range(PACKET_SIZE - 1):
+            crc = CRC8_TABLE[crc ^ raw[:, column]]
+        return crc
+
+    def assemble(self, packets, timestamp):
+        """
+        Bin the returns of decoded packets into the scan being filled, publishing each completed revolution.
+        """
+        start = packets['start_angle'] / 100.0
+        span = (packets['end_angle'] / 100.0 - start) % 360.0
+        angles = start[:, None] + span[:, None] * (np.arange(POINTS_PER_PACKET) / (POINTS_PER_PACKET - 1))
+        bins = np.rint(angles * (self.beams / 360.0)).astype(np.intp) % self.beams
+        distances = packets['points']['distance'] / 1000.0
+        previous = start[0] if self.previous_start is None else self.previous_start
+        wraps = np.flatnonzero(np.diff(np.concatenate(([previous], start))) < 0)
+        self.previous_start = start[-1]
+        returned = distances > 0
+        # Packets before each wrap finish the revolution being filled; those after the last wrap start the next
+        for first, last in zip(np.concatenate(([0], wraps)), np.concatenate((wraps, [len(packets)]))):
+            hits = returned[first:last]
+            self.scans[self.filling][bins[first:last][hits]] = distances[first:last][hits]
+            if last < len(packets):
+                self.complete_revolution(timestamp)
+
+    def complete_revolution(self, timestamp):
+        if self.partial:
+            self.partial = False
+        else:
+            with self.condition:
+                self.published = self.filling
+                self.timestamp = timestamp
+                self.sequence += 1
+                self.condition.notify_all()
+            self.filling = (self.filling + 1) % len(self.scans)
+        self.scans[self.filling].fill(np.inf)
+
+    def latest(self):
+        """
+        Return (scan, timestamp, sequence) for the last complete revolution without copying it.
+        """
+        with self.condition:
+            if self.published is None:
+                raise SensorError("LiDAR", "No complete scan received yet")
+            return self.scans[self.published], self.timestamp, self.sequence
+
+    def wait_for_scan(self, after_sequence=0, timeout=1.0):
+        """
+        Wait for a revolution newer than after_sequence and return it like latest().
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.sequence > after_sequence or self.finished.is_set(), timeout):
+                raise SensorError("LiDAR", f"No new scan within {timeout} seconds")
+        return self.latest()
+
+    @staticmethod
+    def encode_packets(start_angles, distances, end_angles=None, speed=3600, timestamps=None, intensities=200):
+        """
+        Build the byte stream a device would send, for stand-in devices, tests and benchmarks.
+
+        Args:
+            start_angles (array): (P,) start angle of each packet in degrees.
+            distances (array): (P, 12) ranges in meters; 0 for no return.
+            end_angles (array): (P,) end angles in degrees; defaults to start + 11 degrees' worth of spacing.
+        """
+        start_angles = np.asarray(start_angles, dtype=float)
+        packets = np.zeros(len(start_angles), dtype=PACKET_DTYPE)
+        packets['header'], packets['ver_len'] = HEADER
+        packets['speed'] = speed
+        packets['start_angle'] = np.rint(start_angles * 100) % 36000
+        if end_angles is None:
+            end_angles = start_angles + 11.0
+        packets['end_angle'] = np.rint(np.asarray(end_angles, dtype=float) * 100) % 36000
+        packets['points']['distance'] = np.rint(np.asarray(distances, dtype=float) * 1000)
+        packets['points']['intensity'] = intensities
+        packets['timestamp'] = 0 if timestamps is None else timestamps
+        packets['crc'] = LidarReader.crc8(packets.view(np.uint8).reshape(len(packets), PACKET_SIZE))
+        return packets.tobytes()
+
+# Example usage can be:
+# reader = LidarReader('/dev/ttyUSB0').start()
+# scan, received_at, _ = reader.wait_for_scan()  # 360 ranges in meters, inf where nothing returned
+# obstacles = LidarObstacleExtractor().extract(scan)
+# reader.stop()
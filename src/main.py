@@ -1,15 +1,18 @@
 import tkinter as tk
-from threading import Thread
-import time
+from threading import Event, Thread
 
 # Import system components
 from frequency_hopper import AdaptiveFrequencyHopper
 from drone_encryption import DroneEncryption
 from energy_management import EnergyManager
 from sensor import SensorInput
+from sensor_replay import ReplaySensorInput, SessionRecorder
 from navigation import NavigationSystem
 from obstacle import ObstacleDetector
+from perception_gate import PerceptionGate
+from pipeline import Pipeline
 from flight_plan import FlightPlanner
+from trajectory import TrajectoryGenerator
 from decision_maker import DecisionMaker 
 from user_interface import DroneControlPanel
 from emergency import EmergencyHandler
@@ -22,9 +25,20 @@ class DroneNavigationSystem:
     Integrates various modules to control and monitor drone operations comprehensively.
     Includes management of drone swarms and interactions with weather systems.
     """
-    def __init__(self, master):
+    def __init__(self, master, record_session=None, replay_session=None):
+        """
+        Args:
+            master (tk.Tk): Root window of the control panel.
+            record_session (str): Directory to record the camera and LiDAR streams into.
+            replay_session (str): Directory of a recorded session to replay in real time instead of reading
+                                  the sensors.
+        """
         self.master = master
+        self.record_session = record_session
+        self.replay_session = replay_session
         self.ui = DroneControlPanel(master)
+        self.stop_requested = Event()
+        self.pipeline = None
         self.setup_components()
 
     def setup_components(self):
@@ -35,10 +49,18 @@ class DroneNavigationSystem:
         self.hopper = AdaptiveFrequencyHopper(available_frequencies=[2.4, 2.425, 2.45, 2.475, 2.5])
         self.encryption = DroneEncryption()
         self.energy_manager = EnergyManager(return_home_callback=self.return_home)
-        self.sensor = SensorInput(camera_index=0, lidar_config={'port': '/dev/ttyUSB0'})
-        self.navigation = NavigationSystem()
+        if self.replay_session is not None:
+            self.sensor = ReplaySensorInput(self.replay_session, realtime=True)
+        else:
+            recorder = SessionRecorder(self.record_session) if self.record_session is not None else None
+            self.sensor = SensorInput(camera_index=0, lidar_config={'port': '/dev/ttyUSB0'}, recorder=recorder)
+        self.navigation = NavigationSystem(fast_mode=True, history_capacity=1000)
         self.obstacle_detector = ObstacleDetector('camera_model.pth', 'lidar_model.pth')
-        self.flight_planner = FlightPlanner(destination=[100, 100, 100])
+        self.perception_gate = PerceptionGate(self.obstacle_detector, navigation=self.navigation)
+        # Live positions rarely coincide with a roadmap node and are attached for each query instead,
+        # so a path cache keyed on the start node would almost never hit here
+        self.flight_planner = FlightPlanner(destination=[100, 100, 100], cache_size=0)
+        self.trajectory_generator = TrajectoryGenerator(self.flight_planner)
         self.decision_maker = DecisionMaker('decision_model.pth')  # Path to your trained model
         self.emergency_handler = EmergencyHandler(self.handle_emergency)
         
@@ -55,27 +77,55 @@ class DroneNavigationSystem:
         self.operation_thread = Thread(target=self.start_operation)
         self.operation_thread.start()
 
+    def build_pipeline(self):
+        """Chain the drone operation tasks into pipeline stages that each run in their own worker."""
+        pipeline = Pipeline(queue_size=1, source_period=1.0, error_handler=self.handle_operation_error)
+        pipeline.add_stage('capture', self.capture_stage)
+        pipeline.add_stage('perception', self.perception_stage)
+        pipeline.add_stage('planning', self.planning_stage)
+        pipeline.add_stage('decision', self.decision_stage)
+        return pipeline
+
+    def capture_stage(self):
+        """Read the sensors and the current position estimate."""
+        return {'camera': self.sensor.get_camera_frame(), 'lidar': self.sensor.get_lidar_data(),
+                'position': self.navigation.get_position()}
+
+    def perception_stage(self, data):
+        """Detect obstacles in the captured camera frame and LiDAR scan."""
+        data['obstacles'] = self.perception_gate.detect(data['camera'])
+        data['lidar_obstacles'] = self.obstacle_detector.locate_lidar_obstacles(data['lidar'])
+        return data
+
+    def planning_stage(self, data):
+        """Plan the path and trajectory from the captured position."""
+        data['path'] = self.flight_planner.find_path(data['position'])
+        trajectory = self.trajectory_generator.generate(data['path'])
+        data['setpoint'], _ = trajectory.setpoint(1.0)  # Target for the next capture
+        return data
+
+    def decision_stage(self, data):
+        """Run the decision model and report the navigation update."""
+        decision = self.decision_maker.make_decision(data['camera'], DecisionMaker.lidar_features(data['lidar']))
+        self.ui.log_data(f"Navigation update: Position {data['position']}, Path {data['path']}, "
+                         f"Setpoint {data['setpoint']}, LiDAR obstacles {len(data['lidar_obstacles']['distances'])}, "
+                         f"Decision {decision}")
+        return decision
+
     def start_operation(self):
-        """Main operational loop integrating all drone systems, with enhanced error handling and logging."""
-        running = True
+        """Main operational loop: runs the stage pipeline while supervising weather conditions."""
+        self.stop_requested.clear()
+        self.pipeline = self.build_pipeline().start()
         try:
-            while running:
-                # Check weather conditions before starting operations
+            while self.pipeline.running and not self.stop_requested.is_set():
+                # Check weather conditions while operations run
                 weather_data = self.weather_interaction.get_weather_data("New York")
                 if not self.weather_interaction.evaluate_weather_conditions(weather_data, user_override=True):
                     self.ui.log_data("Weather conditions are not suitable for flying.")
                     break
-
-                # Drone operation tasks
-                camera_data = self.sensor.get_camera_data()
-                lidar_data = self.sensor.get_lidar_data()
-                position = self.navigation.get_position()
-                obstacles = self.obstacle_detector.detect_obstacles_camera(camera_data)
-                flight_path = self.flight_planner.find_path(position)
-                decision = self.decision_maker.make_decision(camera_data, lidar_data) 
-                self.ui.log_data(f"Navigation update: Position {position}, Path {flight_path}, Decision {decision}")
-                time.sleep(1)  # Simulate operational delay
+                self.stop_requested.wait(1)
         finally:
+            self.pipeline.stop()
             self.ui.log_data("Cleaning up operations...")
             self.cleanup_operations()
 
@@ -94,10 +144,16 @@ class DroneNavigationSystem:
     def cleanup_operations(self):
         """Clean up resources and ensure system is in a safe state before closing."""
         self.sensor.release_resources()
+        if self.flight_planner.path_cache is not None:
+            self.ui.log_data(f"Path cache statistics: {self.flight_planner.path_cache.stats()}")
+        self.ui.log_data(f"Perception gate statistics: {self.perception_gate.stats()}")
+        if self.pipeline is not None:
+            self.ui.log_data(f"Pipeline statistics: {self.pipeline.stats()}")
         self.ui.log_data("System cleaned up and ready to close.")
 
     def stop_operation(self):
         """Safely stop all drone operations."""
+        self.stop_requested.set()
         if self.operation_thread.is_alive():
             self.operation_thread.join()
         self.ui.log_data("Drone operations stopped.")
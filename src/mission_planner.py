@@ -0,0 +1,206 @@
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+from exceptions import PathfindingError
+
+class MissionPlanner:
+    """
+    Orders a set of survey targets into one mission on top of a FlightPlanner roadmap.
+    Pairwise costs come from a single batched multi-source search on the CSR form of the roadmap; the
+    visiting order is built with a nearest-neighbour tour and refined with 2-opt and Or-opt moves.
+    """
+    def __init__(self, planner, max_rounds=50, segment_lengths=(1, 2, 3)):
+        """
+        Args:
+            planner (FlightPlanner): Planner whose roadmap, no-fly zones and weather weights are used.
+            max_rounds (int): Upper bound on refinement sweeps over the tour.
+            segment_lengths (tuple): Lengths of the target runs that Or-opt tries to relocate.
+        """
+        self.planner = planner
+        self.max_rounds = max_rounds
+        self.segment_lengths = segment_lengths
+
+    def anchor(self, point):
+        """
+        Tie a position to one roadmap node. Returns the node index, the cost of flying from the position
+        to the node, the cost of flying back, and whether the position is off the roadmap.
+        """
+        node = self.planner.snap_to_node(point)
+        if node is not None:
+            return self.planner.node_index[node], 0.0, 0.0, False
+        _, out_indices, out_weights = self.planner.attach_point(point, outgoing=True)
+        _, in_indices, in_weights = self.planner.attach_point(point, outgoing=False)
+        if len(out_indices) == 0 or len(in_indices) == 0:
+            raise PathfindingError(f"No clear connection between target {tuple(np.asarray(point).tolist())} and the roadmap")
+        # Connectors are collision-checked symmetrically, so the cheapest outgoing node is reachable both ways
+        best = int(np.argmin(out_weights))
+        index = int(out_indices[best])
+        return index, float(out_weights[best]), float(in_weights[in_indices == index][0]), True
+
+    def cost_matrix(self, anchors, leave_costs, reach_costs):
+        """
+        Return the (M, M) matrix of travel costs between stops, and the predecessor rows of the search
+        with the row used by each stop. One Dijkstra run covers every distinct anchor node.
+        """
+        roadmap = self.planner.csr_roadmap()
+        sources, rows = np.unique(anchors, return_inverse=True)
+        distances, predecessors = dijkstra(roadmap.forward, indices=sources, return_predecessors=True)
+        costs = leave_costs[:, None] + distances[rows][:, anchors] + reach_costs[None, :]
+        np.fill_diagonal(costs, 0.0)
+        return costs, predecessors, rows
+
+    @staticmethod
+    def tour_cost(costs, sequence):
+        return float(costs[sequence[:-1], sequence[1:]].sum())
+
+    @staticmethod
+    def nearest_neighbor(costs, terminal):
+        """
+        Build a tour from stop 0 by repeatedly flying to the cheapest unvisited target; the terminal stop
+        is appended last.
+        """
+        unvisited = np.ones(len(costs), dtype=bool)
+        unvisited[[0, terminal]] = False
+        sequence = [0]
+        for _ in range(len(costs) - 2):
+            row = np.where(unvisited, costs[sequence[-1]], np.inf)
+            nearest = int(np.argmin(row))
+            unvisited[nearest] = False
+            sequence.append(nearest)
+        sequence.append(terminal)
+        return np.array(sequence)
+
+    @staticmethod
+    def prefix_costs(costs, sequence):
+        """
+        Return cumulative leg costs along the sequence, flown forwards and flown in reverse.
+        """
+        forward = np.concatenate([[0.0], np.cumsum(costs[sequence[:-1], sequence[1:]])])
+        backward = np.concatenate([[0.0], np.cumsum(costs[sequence[1:], sequence[:-1]])])
+        return forward, backward
+
+    @staticmethod
+    def two_opt(costs, sequence):
+        """
+        Apply the best improving segment reversal for each segment start in one sweep.
+        The reversed part is re-costed in the opposite direction, so asymmetric (weather) costs are exact.
+        Returns the new sequence and whether it improved.
+        """
+        improved = False
+        last = len(sequence) - 2  # Stops 0 and the terminal never move
+        forward, backward = MissionPlanner.prefix_costs(costs, sequence)
+        for i in range(1, last):
+            j = np.arange(i + 1, last + 1)
+            before, first = sequence[i - 1], sequence[i]
+            ends, after = sequence[j], sequence[j + 1]
+            delta = (costs[before, ends] + costs[first, after] + backward[j] - backward[i]
+                     - costs[before, first] - costs[ends, after] - forward[j] + forward[i])
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                stop = j[best]
+                sequence[i:stop + 1] = sequence[i:stop + 1][::-1].copy()
+                forward, backward = MissionPlanner.prefix_costs(costs, sequence)
+                improved = True
+        return sequence, improved
+
+    def or_opt(self, costs, sequence):
+        """
+        Apply the best improving relocation of a short run of targets, for each run start in one sweep.
+        Returns the new sequence and whether it improved.
+        """
+        improved = False
+        last = len(sequence) - 2
+        for length in self.segment_lengths:
+            i = 1
+            while i + length - 1 <= last:
+                before, first = sequence[i - 1], sequence[i]
+                end, after = sequence[i + length - 1], sequence[i + length]
+                removal = costs[before, first] + costs[end, after] - costs[before, after]
+                # Candidate insertion between sequence[p] and sequence[p + 1]
+                positions = np.arange(len(sequence) - 1)
+                positions = positions[(positions < i - 1) | (positions > i + length - 1)]
+                left, right = sequence[positions], sequence[positions + 1]
+                delta = costs[left, first] + costs[end, right] - costs[left, right] - removal
+                if len(delta) and delta.min() < -1e-9:
+                    position = int(positions[np.argmin(delta)])
+                    run = sequence[i:i + length].copy()
+                    rest = np.concatenate([sequence[:i], sequence[i + length:]])
+                    at = position + 1 if position < i else position + 1 - length
+                    sequence = np.concatenate([rest[:at], run, rest[at:]])
+                    improved = True
+                i += 1
+        return sequence, improved
+
+    def order_targets(self, costs, return_to_start=False):
+        """
+        Return the visiting sequence over stops (0 is the start, 1..M-1 the targets) and its cost.
+        An open mission ends at a virtual terminal reached for free from any target.
+        """
+        count = len(costs)
+        extended = np.zeros((count + 1, count + 1))
+        extended[:count, :count] = costs
+        extended[:count, count] = costs[:, 0] if return_to_start else 0.0
+        sequence = self.nearest_neighbor(extended, count)
+        for _ in range(self.max_rounds):
+            sequence, reversed_any = self.two_opt(extended, sequence)
+            sequence, moved_any = self.or_opt(extended, sequence)
+            if not (reversed_any or moved_any):
+                break
+        return sequence, self.tour_cost(extended, sequence)
+
+    def plan_mission(self, start_point, targets, return_to_start=False):
+        """
+        Plan a mission from the start point through every target.
+
+        Args:
+            start_point (array): Position the mission starts from.
+            targets (array): (T, 3) target positions.
+            return_to_start (bool): Whether the mission ends back at the start point.
+
+        Returns:
+            dict: 'order' (target indices in visiting order), 'path' (list of positions) and 'cost'.
+        """
+        targets = np.asarray(targets, dtype=float).reshape(-1, 3)
+        stops = np.vstack([np.asarray(start_point, dtype=float).reshape(1, 3), targets])
+        anchored = [self.anchor(point) for point in stops]
+        anchors = np.array([a[0] for a in anchored], dtype=np.intp)
+        leave_costs = np.array([a[1] for a in anchored])
+        reach_costs = np.array([a[2] for a in anchored])
+        costs, predecessors, rows = self.cost_matrix(anchors, leave_costs, reach_costs)
+        unreachable = np.flatnonzero(~np.isfinite(costs[0, 1:]))
+        if len(unreachable):
+            raise PathfindingError(f"No available path to targets {unreachable.tolist()}")
+
+        sequence, cost = self.order_targets(costs, return_to_start)
+        if not np.isfinite(cost):
+            raise PathfindingError("No available path through every target.")
+        visits = list(sequence[:-1]) + ([0] if return_to_start else [])
+        path = self.stop_position(stops, anchored, visits[0])
+        for current, following in zip(visits[:-1], visits[1:]):
+            leg = self.leg(predecessors[rows[current]], anchors[current], anchors[following])
+            path += leg if not path or path[-1] != leg[0] else leg[1:]
+            position = self.stop_position(stops, anchored, following)
+            if position and position[0] != path[-1]:
+                path += position
+        return {'order': sequence[1:-1] - 1, 'path': path, 'cost': cost}
+
+    def stop_position(self, stops, anchored, stop):
+        """
+        Return the path entry for a stop: its own position when it is off the roadmap, else its node.
+        """
+        if anchored[stop][3]:
+            return [tuple(stops[stop].tolist())]
+        return [self.planner.node_keys[anchored[stop][0]]]
+
+    def leg(self, predecessors, source, target):
+        """
+        Walk a predecessor row back from target to source and return the node keys in flying order.
+        """
+        indices = [int(target)]
+        while indices[-1] != source:
+            indices.append(int(predecessors[indices[-1]]))
+        return [self.planner.node_keys[i] for i in reversed(indices)]
+
+# Example usage can be:
+# planner = FlightPlanner(destination=[100, 100, 100], num_waypoints=2000, k_neighbors=10, backend='csr')
+# mission = MissionPlanner(planner).plan_mission([0, 0, 0], np.random.rand(50, 3) * 100, return_to_start=True)
+# print("Visiting order:", mission['order'], "cost:", mission['cost'])
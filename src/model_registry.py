@@ -0,0 +1,134 @@
+import logging
+import os
+from threading import Lock
+import torch
+
+class ModelRegistry:
+    """
+    Loads each model checkpoint once per process and hands the same module to every caller.
+    Modules are built on the meta device (no weight allocation) and then take their tensors directly from
+    the checkpoint, memory-mapped with torch.load(mmap=True). The weights therefore live in the page cache:
+    processes loading the same file share those pages, and workers forked after a model is loaded
+    share it copy-on-write.
+    """
+    def __init__(self):
+        self.models = {}  # (checkpoint path, builder, device) -> loaded module
+        self.lock = Lock()
+        self.logger = logging.getLogger('ModelRegistry')
+
+    def key(self, model_path, builder, device):
+        return os.path.realpath(model_path), builder, str(torch.device(device))
+
+    def get(self, model_path, builder, device='cpu'):
+        """
+        Return the module for a checkpoint, loading it on first use.
+
+        Args:
+            model_path (str): Path of a state_dict saved with torch.save.
+            builder (callable): Builds the untrained module, e.g. torchvision.models.resnet50 or DecisionNet.
+            device (str or torch.device): Device the module runs on. Weights stay memory-mapped only on the CPU.
+
+        Returns:
+            torch.nn.Module: The shared module, in evaluation mode.
+        """
+        key = self.key(model_path, builder, device)
+        model = self.models.get(key)
+        if model is None:
+            with self.lock:
+                model = self.models.get(key)
+                if model is None:
+                    model = self.load(model_path, builder, key[2])
+                    self.models[key] = model
+        return model
+
+    def load(self, model_path, builder, device):
+        """
+        Build the module without allocating weights and attach the memory-mapped checkpoint tensors.
+        """
+        with torch.device('meta'):
+            model = builder()
+        state_dict = torch.load(model_path, map_location='cpu', mmap=True, weights_only=True)
+        model.load_state_dict(state_dict, assign=True)
+        unloaded = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+                    if tensor.is_meta]
+        if unloaded:
+            raise RuntimeError(f"Checkpoint {model_path} does not provide {', '.join(unloaded)}")
+        if device != 'cpu':
+            model.to(device)
+        self.logger.info(f"Loaded {model_path} onto {device}")
+        return model.eval()
+
+    @staticmethod
+    def check(model_path):
+        """
+        Cheap check that a checkpoint can be loaded later: the file exists, is readable and starts like a
+        torch.save archive. Only the header is read.
+        Raises FileNotFoundError or another OSError if the file cannot be read, ValueError if it is not an archive.
+        """
+        with open(model_path, 'rb') as f:
+            header = f.read(4)
+        if header != b'PK\x03\x04':
+            raise ValueError(f"{model_path} is not a checkpoint saved with torch.save")
+
+    def lazy(self, model_path, builder, device='cpu', error=None):
+        """
+        Return a LazyModel that loads the checkpoint through this registry the first time it is used.
+        Load failures are raised as error(message) when an exception type is given.
+        """
+        return LazyModel(self, model_path, builder, device, error)
+
+    def is_loaded(self, model_path, builder, device='cpu'):
+        return self.key(model_path, builder, device) in self.models
+
+    def clear(self):
+        """
+        Forget every loaded module; later requests load the checkpoints again.
+        """
+        with self.lock:
+            self.models.clear()
+
+
+class LazyModel:
+    """
+    Stand-in for a registry model that is only loaded when it is first called.
+    Calling it runs the shared module; other attributes (eval, parameters, ...) are forwarded to it.
+    """
+    def __init__(self, registry, model_path, builder, device='cpu', error=None):
+        self.registry = registry
+        self.model_path = model_path
+        self.builder = builder
+        self.device = device
+        self.error = error  # Exception type load failures are raised as; None leaves them unchanged
+
+    def resolve(self):
+        """
+        Return the shared module, loading it if needed. Call before forking workers to share it copy-on-write.
+        """
+        try:
+            return self.registry.get(self.model_path, self.builder, self.device)
+        except Exception as e:
+            if self.error is None:
+                raise
+            raise self.error(f"Failed to load model from {self.model_path}: {str(e)}") from e
+
+    @property
+    def loaded(self):
+        return self.registry.is_loaded(self.model_path, self.builder, self.device)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
+# Shared by every ObstacleDetector and DecisionMaker in the process
+default_registry = ModelRegistry()
+
+# Example usage can be:
+# from torchvision import models
+# camera_model = default_registry.lazy('camera_model.pth', models.resnet50)  # Nothing is loaded yet
+# outputs = camera_model(image_tensor)  # First call maps the weights in
+# same_model = default_registry.get('camera_model.pth', models.resnet50)  # The module camera_model now uses
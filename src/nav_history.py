@@ -0,0 +1,107 @@
+import numpy as np
+from exceptions import NavigationError
+
+class NavigationHistory:
+    """
+    Fixed-capacity record of navigation estimates: timestamps, states and covariance diagonals.
+    Storage is a mirrored ring buffer: every sample is written twice, capacity rows apart, so the most
+    recent n samples are always one contiguous slice. Appends are O(1) and windows are views, not copies.
+    """
+    def __init__(self, capacity=1024, state_dim=6):
+        """
+        Args:
+            capacity (int): Number of samples kept; older samples are overwritten.
+            state_dim (int): Length of the state vector.
+        """
+        if capacity < 1:
+            raise NavigationError(f"History capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.timestamps = np.zeros(2 * capacity)
+        self.states = np.zeros((2 * capacity, state_dim))
+        self.variances = np.zeros((2 * capacity, state_dim))
+        self.head = 0  # Next write position in [0, capacity)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, state, variances=None):
+        """
+        Record one estimate. Timestamps must not decrease.
+
+        Args:
+            timestamp (float): Time of the estimate in seconds.
+            state (array): State vector.
+            variances (array): Diagonal of the state covariance; zeros when omitted.
+        """
+        if self.count and timestamp < self.timestamps[self.head + self.capacity - 1]:
+            raise NavigationError(f"History timestamps must not decrease ({timestamp} after "
+                                  f"{self.timestamps[self.head + self.capacity - 1]})")
+        for row in (self.head, self.head + self.capacity):
+            self.timestamps[row] = timestamp
+            self.states[row] = state
+            self.variances[row] = 0.0 if variances is None else variances
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, size=None):
+        """
+        Return views (timestamps, states, variances) of the latest samples in chronological order.
+        The views are invalidated once newer samples overwrite them.
+        """
+        size = self.count if size is None else min(size, self.count)
+        end = self.head + self.capacity
+        rows = slice(end - size, end)
+        return self.timestamps[rows], self.states[rows], self.variances[rows]
+
+    def since(self, timestamp):
+        """
+        Return views of the samples taken at or after the timestamp.
+        """
+        timestamps = self.window()[0]
+        return self.window(self.count - int(np.searchsorted(timestamps, timestamp, side='left')))
+
+    def latest(self):
+        """
+        Return (timestamp, state, variances) of the most recent sample.
+        """
+        if not self.count:
+            raise NavigationError("Navigation history is empty")
+        row = self.head + self.capacity - 1
+        return self.timestamps[row], self.states[row], self.variances[row]
+
+    def interpolate(self, times):
+        """
+        Linearly interpolate the state and variances at arbitrary times in one vectorized pass.
+        Times outside the recorded span give NaN rows.
+
+        Args:
+            times (float or array): Query timestamps.
+
+        Returns:
+            tuple: (states, variances) with one row per query time.
+        """
+        if not self.count:
+            raise NavigationError("Navigation history is empty")
+        timestamps, states, variances = self.window()
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        if self.count == 1:
+            lower = upper = np.zeros(len(times), dtype=np.intp)
+        else:
+            upper = np.clip(np.searchsorted(timestamps, times, side='right'), 1, self.count - 1)
+            lower = upper - 1
+        span = timestamps[upper] - timestamps[lower]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(span > 0, (times - timestamps[lower]) / span, 0.0)[:, None]
+        result = [values[lower] + weight * (values[upper] - values[lower]) for values in (states, variances)]
+        outside = (times < timestamps[0]) | (times > timestamps[-1])
+        for values in result:
+            values[outside] = np.nan
+        return result[0], result[1]
+
+# Example usage can be:
+# history = NavigationHistory(capacity=500)
+# for step in range(10):
+#     history.append(step * 0.1, np.array([step, 0, 10, 1, 0, 0], dtype=float))
+# states, _ = history.interpolate([0.25, 0.55])  # Poses at camera capture times
+# print("Interpolated positions:", states[:, :3])
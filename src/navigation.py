@@ -1,15 +1,28 @@
+import time
 import numpy as np
 from filterpy.kalman import KalmanFilter
-from exceptions import CriticalNavigationError, SensorError
+from exceptions import NavigationError, CriticalNavigationError, SensorError
+from nav_history import NavigationHistory
 
 class NavigationSystem:
     """
     Manages the drone's navigation by continuously updating its position and orientation based on sensor inputs.
     """
-    def __init__(self):
+    def __init__(self, fast_mode=False, convergence_tolerance=1e-10, history_capacity=None):
+        """
+        Args:
+            fast_mode (bool): Switch to a precomputed steady-state gain once the covariance has converged.
+            convergence_tolerance (float): Relative change of the covariance between updates below which
+                                           the filter counts as converged.
+            history_capacity (int): Number of past estimates to record in a NavigationHistory; None disables it.
+        """
         # Initialize the state vector with position and velocity (x, y, z, vx, vy, vz)
         self.state = np.zeros(6)
         self.kalman_filter = self.initialize_kalman_filter()
+        self.fast_mode = fast_mode
+        self.convergence_tolerance = convergence_tolerance
+        self.steady_state = None  # (model fingerprint, transition (I - KH)F, gain K) once converged
+        self.history = NavigationHistory(history_capacity) if history_capacity else None
 
     def initialize_kalman_filter(self):
         """
@@ -28,19 +41,69 @@ class NavigationSystem:
         kf.Q = np.eye(6) * 0.01  # Process noise
         return kf
 
-    def update_navigation_state(self, sensor_data):
+    def update_navigation_state(self, sensor_data, timestamp=None):
         """
         Update the navigation state based on new sensor data.
         Raise SensorError if sensor data is invalid.
+        With a history enabled the new estimate is recorded at the timestamp (monotonic clock by default).
         """
         if np.any(np.isnan(sensor_data)) or np.any(np.isinf(sensor_data)):
             raise SensorError("Invalid sensor data received.")
         try:
-            self.kalman_filter.predict()
-            self.kalman_filter.update(sensor_data)
-            self.state = self.kalman_filter.x
+            fingerprint = self.model_fingerprint(sensor_data) if self.fast_mode else None
+            if fingerprint is not None and self.steady_state is not None and self.steady_state[0] == fingerprint:
+                self.steady_state_update(sensor_data)
+            else:
+                self.steady_state = None
+                previous = self.kalman_filter.P.copy() if self.fast_mode else None
+                self.kalman_filter.predict()
+                self.kalman_filter.update(sensor_data)
+                self.state = self.kalman_filter.x
+                if self.fast_mode:
+                    self.check_convergence(previous, fingerprint)
         except Exception as e:
             raise CriticalNavigationError(f"Failed to update navigation state: {str(e)}")
+        if self.history is not None:
+            self.history.append(time.monotonic() if timestamp is None else timestamp,
+                                np.ravel(self.state), np.diag(self.kalman_filter.P))
+
+    def pose_at(self, timestamps):
+        """
+        Return the recorded (position, velocity) estimates interpolated at the given timestamps, e.g. the
+        capture times of camera frames. Requires a history; times outside it give NaN.
+        """
+        if self.history is None:
+            raise NavigationError("Navigation history is disabled; set history_capacity to query past poses.")
+        states, _ = self.history.interpolate(timestamps)
+        return states[:, :3], states[:, 3:6]
+
+    def model_fingerprint(self, sensor_data):
+        """
+        Snapshot of everything the steady-state gain depends on: F, H, Q, R and the measurement layout.
+        """
+        kf = self.kalman_filter
+        return (np.shape(sensor_data),) + tuple(np.asarray(m, dtype=float).tobytes() for m in (kf.F, kf.H, kf.Q, kf.R))
+
+    def check_convergence(self, previous, fingerprint):
+        """
+        Store the current gain as the steady-state gain once the covariance stopped changing.
+        """
+        P = self.kalman_filter.P
+        if np.abs(P - previous).max() <= self.convergence_tolerance * max(np.abs(P).max(), 1.0):
+            kf = self.kalman_filter
+            gain = np.array(kf.K, dtype=float)
+            transition = (np.eye(len(P)) - gain @ kf.H) @ kf.F
+            self.steady_state = (fingerprint, transition, gain)
+
+    def steady_state_update(self, sensor_data):
+        """
+        Predict and update with the steady-state gain: x = (I - KH)F x + K z. The covariance keeps its
+        converged value, so no innovation covariance is inverted.
+        """
+        _, transition, gain = self.steady_state
+        x = transition @ self.kalman_filter.x.ravel() + gain @ np.ravel(sensor_data)
+        self.kalman_filter.x = x.reshape(self.kalman_filter.x.shape)
+        self.state = self.kalman_filter.x
 
     def get_position(self):
         """
@@ -56,7 +119,7 @@ class NavigationSystem:
 
 
 # Example usage can be:
-# navigation_system = NavigationSystem()
+# navigation_system = NavigationSystem(fast_mode=True)
 # try:
 #     new_sensor_data = np.array([1, 2, 3, 0.1, 0.1, 0.1])  # Example sensor data (position and velocity)
 #     navigation_system.update_navigation_state(new_sensor_data)
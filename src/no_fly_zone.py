@@ -0,0 +1,180 @@
+import hashlib
+import numpy as np
+from scipy.spatial import KDTree
+from exceptions import FlightPlanError
+
+class NoFlyZoneMap:
+    """
+    Holds the no-fly zones of the operating area and answers batched point and flight-segment queries.
+    Zones are spheres or vertical cylinders inflated by a safety buffer; a KDTree over the zone centres
+    prunes candidate zones before the exact segment tests run in NumPy.
+    """
+    SHAPES = ('sphere', 'cylinder')
+
+    def __init__(self, centers, radii=0.0, buffer=5.0, shape='sphere', heights=None, chunk_size=65536):
+        """
+        Args:
+            centers (array): (Z, 3) zone centres. For cylinders this is the centre of the base.
+            radii (float or array): Zone radius, scalar or one per zone.
+            buffer (float): Safety margin added around every zone.
+            shape (str): 'sphere' or 'cylinder' (vertical axis).
+            heights (float or array): Cylinder heights above the base. None, or an infinite height, means
+                                      unbounded vertically.
+            chunk_size (int): Number of segments tested per batch, bounding temporary memory.
+        """
+        if shape not in self.SHAPES:
+            raise FlightPlanError(shape, "Unsupported no-fly zone shape")
+        self.centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        self.shape = shape
+        self.buffer = float(buffer)
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=float), (len(self.centers),)).copy()
+        self.heights = None if heights is None else np.broadcast_to(
+            np.asarray(heights, dtype=float), (len(self.centers),)).copy()
+        self.chunk_size = chunk_size
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recompute the derived zone extents and the KDTree after the zone set changes.
+        """
+        self.reach = self.radii + self.buffer  # Horizontal (or spherical) extent including the buffer
+        if self.shape == 'cylinder':
+            bottom = self.centers[:, 2]
+            heights = np.full(len(self.centers), np.inf) if self.heights is None else self.heights
+            self.z_range = np.stack([bottom - self.buffer, bottom + heights + self.buffer], axis=1)
+            self.z_range[np.isinf(heights), 0] = -np.inf
+        self.tree = KDTree(self.tree_coordinates(self.centers)) if len(self.centers) > 0 else None
+
+    def add_zones(self, centers, radii=0.0, heights=None):
+        """
+        Add zones to the map and rebuild the KDTree. Zones without a height are unbounded vertically.
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        if heights is not None and self.heights is None:
+            self.heights = np.full(len(self.centers), np.inf)  # The zones so far are unbounded
+        if self.heights is not None:
+            heights = np.inf if heights is None else heights
+            self.heights = np.concatenate([self.heights, np.broadcast_to(np.asarray(heights, dtype=float), (len(centers),))])
+        self.centers = np.vstack([self.centers, centers])
+        self.radii = np.concatenate([self.radii, np.broadcast_to(np.asarray(radii, dtype=float), (len(centers),))])
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.centers)
+
+    def fingerprint(self):
+        """
+        Return a hash of the zone definitions, used to detect roadmaps built for a different zone set.
+        """
+        digest = hashlib.sha256(f"{self.shape}:{self.buffer!r}".encode())
+        for array in (self.centers, self.radii, self.heights):
+            if array is not None:
+                digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+        return digest.hexdigest()
+
+    def tree_coordinates(self, points):
+        """
+        Project points into the space the KDTree is built in (3-D for spheres, the ground plane for cylinders).
+        """
+        return points[:, :2] if self.shape == 'cylinder' else points
+
+    def contains_points(self, points):
+        """
+        Check a batch of points against every zone. Returns a boolean array with one entry per point.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        inside = np.zeros(len(points), dtype=bool)
+        if self.tree is None or len(points) == 0:
+            return inside
+        candidates, zones = self.candidate_pairs(points, np.zeros(len(points)))
+        if len(candidates) == 0:
+            return inside
+        offset = self.tree_coordinates(points[candidates]) - self.tree_coordinates(self.centers[zones])
+        hit = np.einsum('ij,ij->i', offset, offset) < self.reach[zones] ** 2
+        if self.shape == 'cylinder':
+            z = points[candidates, 2]
+            hit &= (z >= self.z_range[zones, 0]) & (z <= self.z_range[zones, 1])
+        inside[candidates[hit]] = True
+        return inside
+
+    def segments_blocked(self, starts, ends):
+        """
+        Check straight flight segments against every zone. A segment is blocked if any point along it
+        lies inside a buffered zone. Returns a boolean array with one entry per segment.
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        blocked = np.zeros(len(starts), dtype=bool)
+        if self.tree is None:
+            return blocked
+        for first in range(0, len(starts), self.chunk_size):
+            last = first + self.chunk_size
+            blocked[first:last] = self._segments_blocked_chunk(starts[first:last], ends[first:last])
+        return blocked
+
+    def _segments_blocked_chunk(self, starts, ends):
+        """
+        Exact segment-versus-zone test for one chunk of segments.
+        """
+        blocked = np.zeros(len(starts), dtype=bool)
+        directions = ends - starts
+        projected = self.tree_coordinates(directions)
+        half_lengths = 0.5 * np.sqrt(np.einsum('ij,ij->i', projected, projected))
+        candidates, zones = self.candidate_pairs((starts + ends) / 2, half_lengths)
+        if len(candidates) == 0:
+            return blocked
+
+        seg_start = starts[candidates]
+        seg_dir = directions[candidates]
+        t_low = np.zeros(len(candidates))
+        t_high = np.ones(len(candidates))
+        if self.shape == 'cylinder':
+            t_low, t_high = self.vertical_overlap(seg_start[:, 2], seg_dir[:, 2], self.z_range[zones])
+
+        # Closest point of the (clipped) segment to the zone centre or axis
+        offset = self.tree_coordinates(self.centers[zones]) - self.tree_coordinates(seg_start)
+        direction = self.tree_coordinates(seg_dir)
+        length_sq = np.einsum('ij,ij->i', direction, direction)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = np.where(length_sq > 0, np.einsum('ij,ij->i', offset, direction) / length_sq, 0.0)
+        t = np.clip(t, t_low, t_high)
+        gap = offset - direction * t[:, None]
+        hit = (t_low <= t_high) & (np.einsum('ij,ij->i', gap, gap) < self.reach[zones] ** 2)
+        blocked[candidates[hit]] = True
+        return blocked
+
+    def vertical_overlap(self, z_start, z_delta, z_range):
+        """
+        Return the parameter interval [t_low, t_high] of each segment that lies inside the zone's
+        vertical extent. Empty intervals have t_low > t_high.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t_a = (z_range[:, 0] - z_start) / z_delta
+            t_b = (z_range[:, 1] - z_start) / z_delta
+        flat = z_delta == 0
+        inside = (z_start >= z_range[:, 0]) & (z_start <= z_range[:, 1])
+        t_low = np.where(flat, np.where(inside, 0.0, 1.0), np.maximum(0.0, np.fmin(t_a, t_b)))
+        t_high = np.where(flat, np.where(inside, 1.0, -1.0), np.minimum(1.0, np.fmax(t_a, t_b)))
+        return t_low, t_high
+
+    def candidate_pairs(self, points, extents):
+        """
+        Use the KDTree to find the (query, zone) pairs that can possibly intersect.
+        Each query is a point with an extent (e.g. a segment midpoint and half-length); a zone is a
+        candidate when its centre lies within extent + the largest zone reach.
+        Returns two index arrays: query indices and zone indices.
+        """
+        coords = self.tree_coordinates(points)
+        radius = extents + self.reach.max()
+        counts = self.tree.query_ball_point(coords, radius, return_length=True)
+        k = int(counts.max()) if len(counts) else 0
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        # The zones inside each ball are the nearest ones, so a k-nearest query with k = largest ball
+        # population returns every candidate in a fixed-shape array.
+        distances, zones = self.tree.query(coords, k=k, distance_upper_bound=radius.max())
+        distances = distances.reshape(len(coords), k)
+        zones = zones.reshape(len(coords), k)
+        valid = (zones < len(self.centers)) & (distances <= radius[:, None])
+        queries = np.broadcast_to(np.arange(len(coords))[:, None], zones.shape)
+        return queries[valid], zones[valid]
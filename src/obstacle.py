@@ -4,12 +4,65 @@ from PIL import Image
 import torch
 from torchvision import models, transforms
 from exceptions import ObstacleDetectionError
+from lidar_processing import LidarObstacleExtractor
+from model_registry import default_registry
+from inference_optimizer import OptimizedModel
+
+class FramePreprocessor:
+    """
+    Converts raw camera frames into normalized model input with as few copies as possible.
+    The frame is resized with OpenCV into a reused buffer, then channel order, scaling to [0, 1] and
+    mean/std normalization happen in one multiply-add into a reused float buffer that the returned
+    tensor shares.
+    """
+    MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+    STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+    def __init__(self, size=(224, 224)):
+        """
+        Args:
+            size (tuple): (height, width) of the model input.
+        """
+        self.size = size
+        height, width = size
+        self.resized_frame = np.empty((height, width, 3), dtype=np.uint8)
+        self.halfway_frame = np.empty((2 * height, 2 * width, 3), dtype=np.uint8)
+        self.input_buffer = np.empty((3, height, width), dtype=np.float32)
+        self.input_tensor = torch.from_numpy(self.input_buffer).unsqueeze(0)  # Shares memory with input_buffer
+        self.channel_scale = (1.0 / (255.0 * self.STD))[:, None, None]
+        self.channel_offset = (-self.MEAN / self.STD)[:, None, None]
+
+    def __call__(self, frame, bgr=True):
+        """
+        Return the normalized 1x3xHxW tensor for an HxWx3 uint8 frame. The tensor is overwritten by the next call.
+
+        Args:
+            frame (ndarray): Camera frame as returned by cv2.VideoCapture.read (BGR) or an RGB array.
+            bgr (bool): Whether the frame is in OpenCV's BGR channel order.
+        """
+        frame = np.asarray(frame)
+        if frame.ndim != 3 or frame.shape[2] != 3 or frame.dtype != np.uint8:
+            raise ObstacleDetectionError(f"Expected an HxWx3 uint8 frame, got {frame.shape} {frame.dtype}")
+        height, width = self.size
+        if frame.shape[0] > 2 * height and frame.shape[1] > 2 * width:
+            # Bilinear to twice the size, then an exact 2:1 area average: close to an antialiased
+            # resize at a fraction of the cost of INTER_AREA with a non-integer ratio
+            cv2.resize(frame, (2 * width, 2 * height), dst=self.halfway_frame, interpolation=cv2.INTER_LINEAR)
+            cv2.resize(self.halfway_frame, (width, height), dst=self.resized_frame, interpolation=cv2.INTER_AREA)
+        else:
+            cv2.resize(frame, (width, height), dst=self.resized_frame, interpolation=cv2.INTER_LINEAR)
+        channels = self.resized_frame.transpose(2, 0, 1)
+        np.multiply(channels[::-1] if bgr else channels, self.channel_scale, out=self.input_buffer)
+        self.input_buffer += self.channel_offset
+        return self.input_tensor
+
 
 class ObstacleDetector:
     """
     Uses computer vision and LiDAR data to detect and avoid obstacles in the drone's path.
     """
-    def __init__(self, camera_model_path, lidar_model_path):
+    def __init__(self, camera_model_path, lidar_model_path, registry=None):
+        self.registry = registry or default_registry
         self.camera_model = self.load_model(camera_model_path, 'camera')
         self.lidar_model = self.load_model(lidar_model_path, 'lidar')
         self.transform = transforms.Compose([
@@ -17,23 +70,44 @@ class ObstacleDetector:
             transforms.ToTensor(),
             transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
         ])
+        self.preprocess_frame = FramePreprocessor((224, 224))
+        self.lidar_extractor = LidarObstacleExtractor()
 
     def load_model(self, model_path, model_type):
         """
-        Load a pre-trained deep learning model from the specified path.
+        Return the pre-trained model at the specified path. The weights are memory-mapped through the model
+        registry on first use, so every detector in the process, and forked workers, share one copy.
+        The checkpoint header is checked here, so missing or corrupt files fail at construction.
         """
         try:
-            model = models.resnet50(pretrained=True)
-            model.load_state_dict(torch.load(model_path))
-            model.eval()
-            return model
-        except Exception as e:
+            self.registry.check(model_path)
+        except (OSError, ValueError) as e:
             raise ObstacleDetectionError(f"Failed to load {model_type} model from {model_path}: {str(e)}")
+        return self.registry.lazy(model_path, models.resnet50, error=ObstacleDetectionError)
+
+    def detect_obstacles_frame(self, frame, bgr=True):
+        """
+        Detect obstacles in a raw camera frame (HxWx3 uint8 ndarray, BGR by default) without PIL or file decoding.
+        """
+        try:
+            image_tensor = self.preprocess_frame(frame, bgr=bgr)
+            with torch.no_grad():
+                outputs = self.camera_model(image_tensor)
+            return self.process_outputs(outputs)
+        except ObstacleDetectionError:
+            raise
+        except Exception as e:
+            raise ObstacleDetectionError(f"Camera obstacle detection failed: {str(e)}")
 
     def detect_obstacles_camera(self, camera_image):
         """
-        Detect obstacles using the camera model.
+        Detect obstacles using the camera model. Accepts an image file path, a PIL image, or a raw
+        OpenCV frame (BGR ndarray), which takes the zero-copy frame path.
         """
+        if isinstance(camera_image, np.ndarray):
+            return self.detect_obstacles_frame(camera_image)
+        if isinstance(camera_image, Image.Image):
+            return self.detect_obstacles_frame(np.asarray(camera_image.convert('RGB')), bgr=False)
         try:
             image = Image.open(camera_image).convert('RGB')
             image_tensor = self.transform(image).unsqueeze(0)
@@ -57,6 +131,44 @@ class ObstacleDetector:
         except Exception as e:
             raise ObstacleDetectionError(f"Lidar obstacle detection failed: {str(e)}")
 
+    def locate_lidar_obstacles(self, lidar_data):
+        """
+        Locate obstacles in a LiDAR scan geometrically (see LidarObstacleExtractor), without the LiDAR model.
+        A (D, N) array of scans from several drones is processed in one batch and gets a 'drones' entry.
+        """
+        scans = np.asarray(lidar_data, dtype=float)
+        if scans.ndim == 2:
+            return self.lidar_extractor.extract_batch(scans)
+        return self.lidar_extractor.extract(scans)
+
+    def optimize_inference(self, threads=None, quantize=None, trace=True, channels_last=True, calibration_frames=None):
+        """
+        Switch the camera model to the CPU-optimized inference mode (see OptimizedModel).
+
+        Args:
+            threads (int): Process-wide torch intra-op thread count to set; None leaves it unchanged.
+            quantize (str): None, 'dynamic' or 'static' int8 quantization.
+            trace (bool): Trace the model into a frozen TorchScript graph.
+            channels_last (bool): Run convolutions in NHWC layout.
+            calibration_frames (list): Raw BGR frames used to calibrate static quantization.
+        """
+        example = (torch.zeros(1, 3, 224, 224),)
+        calibration = [(self.preprocess_frame(frame).clone(),) for frame in calibration_frames or []]
+        try:
+            self.camera_model = OptimizedModel(self.camera_model, example, trace=trace, channels_last=channels_last,
+                                               quantize=quantize, calibration_inputs=calibration, threads=threads)
+        except Exception as e:
+            raise ObstacleDetectionError(f"Failed to optimize camera model: {str(e)}")
+
+    def create_inference_server(self, max_batch_size=8, max_delay=0.01):
+        """
+        Create an InferenceServer that batches raw BGR frames from many drones through the camera model.
+        The server has its own preprocessing buffers, so it can run alongside detect_obstacles_frame.
+        """
+        from inference_server import InferenceServer
+        return InferenceServer(self.camera_model, max_batch_size=max_batch_size, max_delay=max_delay,
+                               preprocess=FramePreprocessor((224, 224)), postprocess=self.process_outputs)
+
     def process_outputs(self, outputs):
         """
         Process model outputs to extract obstacle information.
@@ -68,7 +180,9 @@ class ObstacleDetector:
 # try:
 #     detector = ObstacleDetector('camera_model.pth', 'lidar_model.pth')
 #     camera_obstacles = detector.detect_obstacles_camera('path_to_image.jpg')
+#     frame_obstacles = detector.detect_obstacles_frame(frame)  # Raw BGR frame from cv2.VideoCapture.read
 #     lidar_obstacles = detector.detect_obstacles_lidar([0.1, 0.2, ..., 0.3])  # Example LiDAR data array
+#     lidar_geometry = detector.locate_lidar_obstacles(lidar_scan)  # Centroids, extents and distances
 #     print("Camera Detected Obstacles:", camera_obstacles)
 #     print("LiDAR Detected Obstacles:", lidar_obstacles)
 # except ObstacleDetectionError as e:
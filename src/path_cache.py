@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from threading import Lock
+
+class PathCache:
+    """
+    Bounded least-recently-used cache of planned paths.
+    Keys are expected to include a graph version so that entries computed on an older graph are never returned.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()  # The operation loop and UI callbacks may query the planner from different threads
+
+    def get(self, key):
+        """
+        Return the cached path for the key, or None on a miss. A hit marks the entry as most recently used.
+        """
+        with self.lock:
+            path = self.entries.get(key)
+            if path is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def put(self, key, path):
+        """
+        Store a path, evicting the least recently used entry when the cache is full.
+        """
+        with self.lock:
+            self.entries[key] = tuple(path)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every cached path. Hit and miss counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters as a dictionary.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self.entries)
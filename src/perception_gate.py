@@ -0,0 +1,127 @@
+import time
+import numpy as np
+import cv2
+from PIL import Image
+
+class PerceptionGate:
+    """
+    Temporal reuse in front of ObstacleDetector.detect_obstacles_camera. Each frame is reduced to a small
+    grayscale thumbnail and compared with the thumbnail of the last frame that went through the model.
+    While the scene has barely changed, the drone has not moved far and the detections are not too old,
+    the last detections are reused (shifted by the drone's own motion) instead of running the model.
+    """
+    def __init__(self, detector, navigation=None, threshold=3.0, max_staleness=0.5, max_displacement=2.0,
+                 thumbnail_size=(32, 24), shift=None):
+        """
+        Args:
+            detector (ObstacleDetector): Detector run on frames that change the scene.
+            navigation (NavigationSystem): Source of the drone position for ego-motion; optional.
+            threshold (float): Mean absolute thumbnail difference (0-255 gray levels) below which a frame
+                               counts as unchanged.
+            max_staleness (float): Seconds after which the model is run again regardless of the score.
+            max_displacement (float): Distance in meters the drone may move before the model is run again.
+            thumbnail_size (tuple): (width, height) of the thumbnail the change score is computed on.
+            shift (callable): shift(detections, displacement) returning detections moved by the drone's
+                              displacement since they were computed; see shift_detections for the default.
+        """
+        self.detector = detector
+        self.navigation = navigation
+        self.threshold = threshold
+        self.max_staleness = max_staleness
+        self.max_displacement = max_displacement
+        self.thumbnail_size = thumbnail_size
+        self.shift = shift or self.shift_detections
+        self.thumbnail = np.empty(thumbnail_size[::-1], dtype=np.float32)
+        self.reference = None  # (thumbnail, timestamp, position, detections) of the last model run
+        self.last_score = None
+        self.frames = 0
+        self.reused = 0
+        self.inference_time = 0.0
+        self.gate_time = 0.0
+
+    @staticmethod
+    def shift_detections(detections, displacement):
+        """
+        Default ego-motion compensation: obstacle positions given as a dict with 'centroids' in the drone
+        frame move opposite to the drone. Other detection formats carry no geometry and are returned as they are.
+        """
+        if isinstance(detections, dict) and 'centroids' in detections:
+            shifted = dict(detections)
+            centroids = np.asarray(detections['centroids'])
+            shifted['centroids'] = centroids - displacement[:centroids.shape[-1]]
+            return shifted
+        return detections
+
+    def change_score(self, frame):
+        """
+        Compute the thumbnail of a frame and its mean absolute difference from the reference thumbnail.
+        Returns infinity when there is no reference yet.
+        """
+        frame = np.asarray(frame)
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)  # Channel order barely matters for the score
+        self.thumbnail[:] = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        if self.reference is None:
+            return np.inf
+        return float(cv2.norm(self.thumbnail, self.reference[0], cv2.NORM_L1)) / self.thumbnail.size
+
+    def current_position(self):
+        if self.navigation is None:
+            return None
+        return np.asarray(self.navigation.get_position(), dtype=float).ravel()
+
+    def detect(self, camera_image, timestamp=None):
+        """
+        Return obstacle detections for a camera image, running the detector only when needed.
+
+        Args:
+            camera_image: Raw BGR frame, PIL image or image path, as accepted by detect_obstacles_camera.
+                          Paths cannot be compared cheaply and always run the model.
+            timestamp (float): Capture time in seconds; defaults to time.monotonic().
+        """
+        start = time.perf_counter()
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        position = self.current_position()
+        self.frames += 1
+        gated = isinstance(camera_image, (np.ndarray, Image.Image))
+        score = self.change_score(camera_image) if gated else np.inf
+        self.last_score = score
+        if self.reference is not None and score <= self.threshold:
+            _, reference_time, reference_position, detections = self.reference
+            displacement = None if position is None or reference_position is None else position - reference_position
+            fresh = timestamp - reference_time <= self.max_staleness
+            nearby = displacement is None or np.linalg.norm(displacement) <= self.max_displacement
+            if fresh and nearby:
+                self.reused += 1
+                result = detections if displacement is None else self.shift(detections, displacement)
+                self.gate_time += time.perf_counter() - start
+                return result
+        gate_end = time.perf_counter()
+        self.gate_time += gate_end - start
+        detections = self.detector.detect_obstacles_camera(camera_image)
+        self.inference_time += time.perf_counter() - gate_end
+        # Without a thumbnail there is nothing to compare the next frame against
+        self.reference = (self.thumbnail.copy(), timestamp, position, detections) if gated else None
+        return detections
+
+    def stats(self):
+        """
+        Return the frame counts, the fraction of frames that skipped the model, and the estimated time saved:
+        the mean model latency times the skipped frames, minus the time spent computing change scores.
+        """
+        inferred = self.frames - self.reused
+        mean_latency = self.inference_time / inferred if inferred else 0.0
+        return {
+            'frames': self.frames,
+            'inferred': inferred,
+            'reused': self.reused,
+            'skip_ratio': self.reused / self.frames if self.frames else 0.0,
+            'mean_inference_latency': mean_latency,
+            'latency_saved': self.reused * mean_latency - self.gate_time,
+        }
+
+# Example usage can be:
+# gate = PerceptionGate(detector, navigation=navigation_system, threshold=3.0, max_staleness=0.5)
+# for frame in frames:
+#     obstacles = gate.detect(frame)
+# print("Skip ratio:", gate.stats()['skip_ratio'], "seconds saved:", gate.stats()['latency_saved'])
@@ -0,0 +1,215 @@
+import logging
+import time
+from collections import deque
+from threading import Condition, Event, Thread
+import numpy as np
+
+class PipelineClosed(Exception):
+    """
+    Raised by LatestValueQueue.get once the queue is closed and drained.
+    """
+
+class LatestValueQueue:
+    """
+    Bounded hand-off between pipeline stages. When the queue is full, put drops the oldest item, so a slow
+    consumer always works on the freshest data instead of a growing backlog.
+    """
+    def __init__(self, maxsize=1):
+        self.items = deque(maxlen=maxsize)
+        self.condition = Condition()
+        self.closed = False
+        self.dropped = 0
+        self.max_depth = 0
+        self.depth_total = 0  # Sum of depths seen by put, for the mean depth
+        self.puts = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def put(self, item):
+        """
+        Add an item, dropping the oldest one if the queue is full. Returns whether an item was dropped.
+        """
+        with self.condition:
+            dropped = len(self.items) == self.items.maxlen
+            self.items.append(item)
+            self.dropped += dropped
+            self.puts += 1
+            self.depth_total += len(self.items)
+            self.max_depth = max(self.max_depth, len(self.items))
+            self.condition.notify()
+        return dropped
+
+    def get(self, timeout=None):
+        """
+        Remove and return the oldest item, waiting for one if needed.
+        Raises PipelineClosed once the queue is closed and empty, and TimeoutError if the timeout expires.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items or self.closed, timeout):
+                raise TimeoutError("No item arrived before the timeout")
+            if not self.items:
+                raise PipelineClosed()
+            return self.items.popleft()
+
+    def close(self):
+        """
+        Wake every waiting consumer; items already queued can still be taken.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            return {
+                'depth': len(self.items),
+                'max_depth': self.max_depth,
+                'mean_depth': self.depth_total / self.puts if self.puts else 0.0,
+                'dropped': self.dropped,
+            }
+
+
+class Pipeline:
+    """
+    Runs a chain of stages, each in its own worker thread, linked by LatestValueQueues.
+    The first stage is a source called repeatedly with no arguments (e.g. sensor capture); every later stage
+    is called with the previous stage's output. Each item carries the time its source produced it, so the
+    end-to-end latency to the last stage is measured per item. Throughput is set by the slowest stage rather
+    than the sum of all stages.
+    """
+    def __init__(self, queue_size=1, source_period=0.0, error_handler=None, latency_window=1000):
+        """
+        Args:
+            queue_size (int): Capacity of each queue between stages.
+            source_period (float): Minimum seconds between source calls, for sources that do not block
+                                   until new data arrives.
+            error_handler (callable): Called with any exception a stage raises; the item is dropped and the
+                                      pipeline keeps running if it returns True, or stops if it returns False.
+                                      By default errors are logged and the pipeline keeps running.
+            latency_window (int): Number of recent end-to-end latencies kept for the statistics.
+        """
+        self.queue_size = queue_size
+        self.source_period = source_period
+        self.error_handler = error_handler
+        self.stages = []  # (name, function)
+        self.queues = []  # queues[i] feeds stage i + 1
+        self.counts = {}
+        self.busy_time = {}
+        self.errors = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.latest = None
+        self.stop_event = Event()
+        self.workers = []
+        self.logger = logging.getLogger('Pipeline')
+
+    def add_stage(self, name, function):
+        """
+        Append a stage. Returns the pipeline so stages can be chained.
+        """
+        if self.workers:
+            raise RuntimeError("Stages cannot be added to a running pipeline")
+        if self.stages:
+            self.queues.append(LatestValueQueue(self.queue_size))
+        self.stages.append((name, function))
+        self.counts[name] = 0
+        self.busy_time[name] = 0.0
+        return self
+
+    @property
+    def running(self):
+        return bool(self.workers) and not self.stop_event.is_set()
+
+    def start(self):
+        if not self.stages:
+            raise RuntimeError("The pipeline has no stages")
+        self.stop_event.clear()
+        self.workers = [Thread(target=self.run_stage, args=(index,), daemon=True) for index in range(len(self.stages))]
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def stop(self, timeout=None):
+        """
+        Stop every stage. A stage busy with an item finishes it first.
+        """
+        self.stop_event.set()
+        for stage_queue in self.queues:
+            stage_queue.close()
+        for worker in self.workers:
+            worker.join(timeout)
+        self.workers = []
+
+    def run_stage(self, index):
+        name, function = self.stages[index]
+        inbox = self.queues[index - 1] if index else None
+        outbox = self.queues[index] if index < len(self.queues) else None
+        next_call = time.perf_counter()
+        while not self.stop_event.is_set():
+            try:
+                if inbox is None:
+                    if self.stop_event.wait(max(0.0, next_call - time.perf_counter())):
+                        break
+                    next_call = time.perf_counter() + self.source_period
+                    created, value = None, ()
+                else:
+                    created, value = inbox.get()
+                    value = (value,)
+            except PipelineClosed:
+                break
+            start = time.perf_counter()
+            try:
+                result = function(*value)
+            except Exception as e:
+                self.errors += 1
+                if not self.handle_error(name, e):
+                    self.stop_event.set()
+                    for stage_queue in self.queues:
+                        stage_queue.close()
+                continue
+            end = time.perf_counter()
+            self.busy_time[name] += end - start
+            self.counts[name] += 1
+            created = end if created is None else created  # Items are timed from when the source returned them
+            if outbox is not None:
+                outbox.put((created, result))
+            else:
+                self.latest = result
+                self.latencies.append(end - created)
+
+    def handle_error(self, name, error):
+        if self.error_handler is not None:
+            return self.error_handler(error)
+        self.logger.error(f"Stage {name} failed: {str(error)}")
+        return True
+
+    def stats(self):
+        """
+        Return per-stage item counts, mean service times and input queue statistics, plus end-to-end latency.
+        """
+        stages = {}
+        for index, (name, _) in enumerate(self.stages):
+            count = self.counts[name]
+            stages[name] = {
+                'processed': count,
+                'mean_service_time': self.busy_time[name] / count if count else 0.0,
+                'queue': self.queues[index - 1].stats() if index else None,
+            }
+        latencies = np.array(self.latencies)
+        return {
+            'stages': stages,
+            'errors': self.errors,
+            'latency_mean': float(latencies.mean()) if len(latencies) else 0.0,
+            'latency_p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            'latency_p99': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+        }
+
+# Example usage can be:
+# pipeline = Pipeline(queue_size=1, source_period=1 / 30)
+# pipeline.add_stage('capture', sensor.get_camera_frame)
+# pipeline.add_stage('detect', detector.detect_obstacles_frame)
+# pipeline.add_stage('report', lambda obstacles: print("Obstacles:", obstacles))
+# pipeline.start()
+# time.sleep(10)
+# pipeline.stop()
+# print(pipeline.stats())
@@ -0,0 +1,193 @@
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from exceptions import PathfindingError, FlightPlanError
+
+ROADMAP_FORMAT = 2
+ROADMAP_METADATA = 'roadmap.json'
+
+class CSRRoadmap:
+    """
+    Compact roadmap backend: node positions in an (N, 3) array and edge weights in scipy.sparse CSR matrices.
+    Searches run in compiled code through scipy.sparse.csgraph. A shortest-path tree towards the goal is
+    kept between queries, so repeated queries to the same goal only walk the tree.
+    """
+    def __init__(self, nodes, sources, targets, weights):
+        """
+        Args:
+            nodes (array): (N, 3) node positions.
+            sources, targets (array): Edge endpoint indices, ordered by source then target.
+            weights (array): Edge costs. np.inf marks a blocked edge.
+        """
+        self.nodes = np.asarray(nodes, dtype=float)
+        count = len(self.nodes)
+        sources = np.asarray(sources)
+        targets = np.asarray(targets)
+        weights = np.asarray(weights, dtype=float)
+        # Edge ids are positions in the forward CSR data array because edges are sorted by source
+        self.forward = csr_matrix((weights, targets.astype(np.int32), self.row_pointers(sources, count)),
+                                  shape=(count, count))
+        # The reverse graph lets a single search from the goal serve every start node
+        order = np.lexsort((sources, targets))
+        self.reverse_position = np.empty(len(order), dtype=np.intp)
+        self.reverse_position[order] = np.arange(len(order))
+        self.reverse = csr_matrix((weights[order], sources[order].astype(np.int32), self.row_pointers(targets, count)),
+                                  shape=(count, count))
+        self.goal_tree = None
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a roadmap from the arrays returned by to_arrays() without copying them, so memory-mapped
+        arrays stay shared between every planner that maps the same files.
+        """
+        roadmap = cls.__new__(cls)
+        roadmap.nodes = arrays['nodes']
+        count = len(roadmap.nodes)
+        roadmap.forward = csr_matrix((arrays['edge_weights'], arrays['edge_targets'], arrays['indptr']),
+                                     shape=(count, count), copy=False)
+        roadmap.reverse = csr_matrix((arrays['reverse_weights'], arrays['reverse_indices'], arrays['reverse_indptr']),
+                                     shape=(count, count), copy=False)
+        roadmap.reverse_position = arrays['reverse_position']
+        roadmap.goal_tree = None
+        return roadmap
+
+    def to_arrays(self):
+        """
+        Return the arrays that fully describe the roadmap, keyed by the file names used on disk.
+        """
+        return {
+            'nodes': self.nodes,
+            'indptr': self.forward.indptr,
+            'edge_targets': self.forward.indices,
+            'edge_weights': self.forward.data,
+            'reverse_indptr': self.reverse.indptr,
+            'reverse_indices': self.reverse.indices,
+            'reverse_weights': self.reverse.data,
+            'reverse_position': self.reverse_position,
+        }
+
+    @staticmethod
+    def row_pointers(rows, count):
+        return np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=count))]).astype(np.int32)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return int(np.count_nonzero(np.isfinite(self.forward.data)))
+
+    def nbytes(self):
+        """
+        Return the memory held by the node array and both CSR matrices, in bytes.
+        """
+        total = self.nodes.nbytes + self.reverse_position.nbytes
+        for matrix in (self.forward, self.reverse):
+            total += matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        return total
+
+    def set_weights(self, edge_ids, weights):
+        """
+        Overwrite the cost of existing edges in place and drop the stored goal tree.
+        """
+        self.forward.data[edge_ids] = weights
+        self.reverse.data[self.reverse_position[edge_ids]] = weights
+        self.goal_tree = None
+
+    def tree_to_goal(self, goal):
+        """
+        Return (cost, next hop) arrays describing the cheapest way from every node to the goal.
+        The goal is a node index, or (indices, weights) of the connectors into an off-graph goal position;
+        in that case one search per connector runs and the cheapest connector is chosen per node.
+        The next hop is negative at the node where the path reaches the goal.
+        """
+        key = goal if np.ndim(goal) == 0 else (tuple(goal[0]), tuple(goal[1]))
+        if self.goal_tree is not None and self.goal_tree[0] == key:
+            return self.goal_tree[1]
+        if np.ndim(goal) == 0:
+            costs, next_hop = dijkstra(self.reverse, indices=int(goal), return_predecessors=True)
+        else:
+            indices, weights = np.asarray(goal[0]), np.asarray(goal[1], dtype=float)
+            all_costs, all_next = dijkstra(self.reverse, indices=indices, return_predecessors=True)
+            all_costs = all_costs + weights[:, None]
+            best = np.argmin(all_costs, axis=0)
+            columns = np.arange(len(self.nodes))
+            costs, next_hop = all_costs[best, columns], all_next[best, columns]
+        self.goal_tree = (key, (costs, next_hop))
+        return self.goal_tree[1]
+
+    def shortest_path(self, start, goal):
+        """
+        Return the node indices of the cheapest path and its cost.
+        Start and goal are node indices or (indices, weights) connector lists for off-graph positions;
+        the off-graph endpoints themselves are not part of the returned index list.
+        """
+        costs, next_hop = self.tree_to_goal(goal)
+        if np.ndim(start) == 0:
+            node = int(start)
+            total = costs[node]
+        else:
+            indices, weights = np.asarray(start[0]), np.asarray(start[1], dtype=float)
+            if len(indices) == 0:
+                raise PathfindingError("No available path from start to destination.")
+            through = weights + costs[indices]
+            node = int(indices[np.argmin(through)])
+            total = float(through.min())
+        if not np.isfinite(total):
+            raise PathfindingError("No available path from start to destination.")
+
+        path = [node]
+        while next_hop[node] >= 0:
+            node = int(next_hop[node])
+            path.append(node)
+        return path, total
+
+
+def save_roadmap(directory, arrays, metadata):
+    """
+    Write roadmap arrays as .npy files into a new generation subdirectory, then switch the JSON metadata
+    over to it with a single rename. Loaders see either the previous or the new roadmap as a whole, never
+    a mix of both. Older generations are removed afterwards; processes that already map them keep their
+    mappings.
+    """
+    os.makedirs(directory, exist_ok=True)
+    generation = f"generation-{uuid.uuid4().hex}"
+    os.makedirs(os.path.join(directory, generation))
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, generation, f"{name}.npy"), np.ascontiguousarray(array))
+    temporary = os.path.join(directory, f".{ROADMAP_METADATA}.tmp")
+    with open(temporary, 'w') as handle:
+        json.dump(dict(metadata, format=ROADMAP_FORMAT, generation=generation, arrays=sorted(arrays)), handle,
+                  indent=2)
+    os.replace(temporary, os.path.join(directory, ROADMAP_METADATA))
+    for entry in os.listdir(directory):
+        if entry.startswith('generation-') and entry != generation:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def load_roadmap(directory):
+    """
+    Memory-map a saved roadmap. Arrays are opened copy-on-write: unmodified pages are shared with every
+    other process mapping the same files, and in-place weight updates stay private to this process.
+    Returns the arrays and the metadata dictionary.
+    """
+    for attempt in range(3):
+        try:
+            with open(os.path.join(directory, ROADMAP_METADATA)) as handle:
+                metadata = json.load(handle)
+        except (OSError, ValueError) as e:
+            raise FlightPlanError(directory, f"Failed to read roadmap metadata: {str(e)}")
+        if metadata.get('format') != ROADMAP_FORMAT:
+            raise FlightPlanError(directory, f"Unsupported roadmap format {metadata.get('format')}")
+        try:
+            arrays = {name: np.load(os.path.join(directory, metadata['generation'], f"{name}.npy"), mmap_mode='c')
+                      for name in metadata['arrays']}
+        except FileNotFoundError as e:
+            error = e  # A concurrent save replaced this generation after its metadata was read
+            continue
+        return arrays, metadata
+    raise FlightPlanError(directory, f"Failed to read roadmap arrays: {str(error)}")
@@ -0,0 +1,188 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.signal import lfilter
+from exceptions import CriticalNavigationError, SensorError
+from navigation import NavigationSystem
+
+class RTSSmoother:
+    """
+    Offline forward Kalman filter plus Rauch-Tung-Striebel smoother over whole recorded flight logs,
+    using the NavigationSystem model. The covariance recursion does not depend on the data, so it is run
+    step by step only until it converges; from then on the filter and smoother are linear time-invariant
+    recursions, which are decoupled with an eigen-decomposition and run through scipy.signal.lfilter.
+    """
+    def __init__(self, tolerance=1e-12, max_transient=10000, max_condition=1e8):
+        """
+        Args:
+            tolerance (float): Relative covariance change below which the recursion counts as converged.
+            max_transient (int): Longest covariance transient computed step by step.
+            max_condition (float): Largest eigenvector condition number accepted for the decoupled
+                                   recursion; worse-conditioned models are run step by step instead.
+        """
+        model = NavigationSystem().kalman_filter
+        self.F = np.array(model.F, dtype=float)
+        self.H = np.array(model.H, dtype=float)
+        self.Q = np.array(model.Q, dtype=float)
+        self.R = np.array(model.R, dtype=float)
+        self.P0 = np.array(model.P, dtype=float)
+        self.x0 = np.array(model.x, dtype=float).ravel()
+        self.tolerance = tolerance
+        self.max_transient = max_transient
+        self.max_condition = max_condition
+
+    def converged(self, current, previous):
+        return np.abs(current - previous).max() <= self.tolerance * max(np.abs(current).max(), 1.0)
+
+    def covariance_transient(self, steps):
+        """
+        Run the filter covariance recursion until it converges (or for every step of a short log).
+        Returns per-step arrays of the gains K, posterior covariances P, next-step prior covariances and
+        smoother gains C; past the last transient step every quantity keeps its final value.
+        """
+        gains, posteriors = [], []
+        P = self.P0
+        for _ in range(min(steps, self.max_transient)):
+            P_pred = self.F @ P @ self.F.T + self.Q
+            S = self.H @ P_pred @ self.H.T + self.R
+            K = np.linalg.solve(S, self.H @ P_pred).T  # S is symmetric
+            I_KH = np.eye(len(P)) - K @ self.H
+            updated = I_KH @ P_pred @ I_KH.T + K @ self.R @ K.T
+            gains.append(K)
+            posteriors.append(updated)
+            if len(posteriors) > 1 and self.converged(updated, P):
+                break
+            P = updated
+        # predicted[k] is the prior covariance of step k + 1, and C_k = P_k F^T predicted[k]^-1
+        predicted = [self.F @ P @ self.F.T + self.Q for P in posteriors]
+        smoother_gains = [np.linalg.solve(prior, self.F @ P).T for P, prior in zip(posteriors, predicted)]
+        return np.array(gains), np.array(posteriors), np.array(predicted), np.array(smoother_gains)
+
+    def validate(self, measurements):
+        measurements = np.asarray(measurements, dtype=float)
+        if measurements.ndim != 2 or measurements.shape[1] != self.H.shape[0]:
+            raise SensorError("Flight log", f"Expected an (N, {self.H.shape[0]}) measurement array, got {measurements.shape}")
+        if not np.all(np.isfinite(measurements)):
+            raise SensorError("Flight log", "Invalid sensor data received")
+        return measurements
+
+    def linear_recursion(self, A, inputs, initial):
+        """
+        Evaluate x_k = A x_(k-1) + u_k for every row of inputs, starting from x_(-1) = initial.
+        Each eigen-mode of A is a scalar first-order IIR filter, run with lfilter.
+        """
+        eigenvalues, vectors = np.linalg.eig(A)
+        if np.linalg.cond(vectors) > self.max_condition:
+            states = np.empty_like(inputs)
+            state = initial
+            for k, u in enumerate(inputs):
+                state = A @ state + u
+                states[k] = state
+            return states
+        inverse = np.linalg.inv(vectors)
+        modal_inputs = inputs @ inverse.T
+        modal_initial = inverse @ initial
+        modes = np.empty(modal_inputs.shape, dtype=complex)
+        for i, eigenvalue in enumerate(eigenvalues):
+            modes[:, i], _ = lfilter([1.0], [1.0, -eigenvalue], modal_inputs[:, i], zi=[eigenvalue * modal_initial[i]])
+        return np.real(modes @ vectors.T)
+
+    def filter(self, measurements, transient=None):
+        """
+        Run the forward Kalman filter over a whole log.
+
+        Args:
+            measurements (array): (N, 6) measurements, one row per filter step.
+
+        Returns:
+            tuple: (N, 6) filtered states and (N, 6) filtered variances.
+        """
+        measurements = self.validate(measurements)
+        gains, posteriors, _, _ = transient if transient is not None else self.covariance_transient(len(measurements))
+        steps, length = len(measurements), len(gains)
+        states = np.empty((steps, len(self.x0)))
+        try:
+            x = self.x0
+            for k in range(min(length, steps)):
+                prior = self.F @ x
+                x = prior + gains[k] @ (measurements[k] - self.H @ prior)
+                states[k] = x
+            if steps > length:
+                K = gains[-1]
+                A = (np.eye(len(x)) - K @ self.H) @ self.F
+                states[length:] = self.linear_recursion(A, measurements[length:] @ K.T, x)
+        except np.linalg.LinAlgError as e:
+            raise CriticalNavigationError(f"Failed to filter flight log: {str(e)}")
+        variances = np.empty_like(states)
+        variances[:length] = np.diagonal(posteriors[:steps], axis1=1, axis2=2)
+        variances[length:] = np.diag(posteriors[-1])
+        return states, variances
+
+    def smooth(self, measurements):
+        """
+        Filter a whole log forwards and smooth it backwards (RTS).
+
+        Args:
+            measurements (array): (N, 6) measurements, one row per filter step.
+
+        Returns:
+            tuple: (N, 6) smoothed states and (N, 6) smoothed variances.
+        """
+        measurements = self.validate(measurements)
+        transient = self.covariance_transient(len(measurements))
+        filtered, _ = self.filter(measurements, transient)
+        _, posteriors, predicted, smoother_gains = transient
+        steps, length = len(filtered), len(smoother_gains)
+        smoothed = np.empty_like(filtered)
+        variances = np.empty_like(filtered)
+        smoothed[-1] = filtered[-1]
+        P_s = posteriors[min(steps, length) - 1]
+        variances[-1] = np.diag(P_s)
+
+        def gain_terms(k):
+            step = min(k, length - 1)
+            return smoother_gains[step], posteriors[step], predicted[step]
+
+        # Steady backward pass: s_k = (I - CF) x_k + C s_(k+1) while the filter covariance is constant
+        steady_end = length - 1
+        if steps - 1 > steady_end:
+            C = smoother_gains[-1]
+            backward = self.linear_recursion(C, filtered[steady_end:steps - 1][::-1] @ (np.eye(len(C)) - C @ self.F).T,
+                                             smoothed[-1])
+            smoothed[steady_end:steps - 1] = backward[::-1]
+            # The smoothed covariance starts at the filtered one and settles a few steps into the backward pass
+            C, P, P_pred = gain_terms(steady_end)
+            k = steps - 2
+            while k >= steady_end:
+                updated = P + C @ (P_s - P_pred) @ C.T
+                settled = self.converged(updated, P_s)
+                P_s = updated
+                variances[k] = np.diag(P_s)
+                k -= 1
+                if settled:
+                    variances[steady_end:k + 1] = np.diag(P_s)
+                    k = steady_end - 1
+        # Exact backward steps through the transient
+        for k in range(min(steady_end, steps - 1) - 1, -1, -1):
+            C, P, P_pred = gain_terms(k)
+            smoothed[k] = filtered[k] + C @ (smoothed[k + 1] - self.F @ filtered[k])
+            P_s = P + C @ (P_s - P_pred) @ C.T
+            variances[k] = np.diag(P_s)
+        return smoothed, variances
+
+    def smooth_logs(self, logs, workers=None):
+        """
+        Smooth several logs in a process pool. Returns one (states, variances) tuple per log, in order.
+
+        Args:
+            logs (list): (N_i, 6) measurement arrays.
+            workers (int): Number of worker processes; defaults to the CPU count.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.smooth, logs))
+
+
+# Example usage can be:
+# smoother = RTSSmoother()
+# log = np.cumsum(np.random.randn(360000, 6) * 0.01, axis=0)  # One hour at 100 Hz
+# smoothed_states, smoothed_variances = smoother.smooth(log)
+# results = smoother.smooth_logs([log, log[:1000]])
@@ -1,15 +1,144 @@
+import os
+import time
+from threading import Condition, Event, Thread
 import numpy as np
 import cv2
 from PIL import Image
 from exceptions import SensorError
+from lidar_reader import LidarReader
+
+class CameraGrabber:
+    """
+    Background capture thread for a cv2.VideoCapture. Frames are read straight into a small preallocated
+    ring of arrays and the freshest one is published with its capture time, so consumers never block on
+    camera I/O and never see frames left over in the driver's buffer. Published frames are views into the
+    ring, not copies: a frame stays valid for ring_size - 1 further captures, so consumers that keep frames
+    longer than that must copy them.
+    """
+    def __init__(self, camera, ring_size=3, convert_to_rgb=False, max_failures=30):
+        """
+        Args:
+            camera (cv2.VideoCapture): Opened camera.
+            ring_size (int): Number of frame buffers; at least 2 so the published frame is never written to.
+            convert_to_rgb (bool): Convert frames to RGB in the capture thread. By default frames stay in
+                                   OpenCV's BGR order and the consumer converts only what it uses.
+            max_failures (int): Consecutive failed reads after which the grabber stops with an error.
+        """
+        if ring_size < 2:
+            raise SensorError("Camera", f"Frame ring needs at least 2 buffers, got {ring_size}")
+        self.camera = camera
+        self.ring_size = ring_size
+        self.convert_to_rgb = convert_to_rgb
+        self.max_failures = max_failures
+        self.ring = None
+        self.index = 0
+        self.timestamp = None
+        self.sequence = 0
+        self.error = None
+        self.condition = Condition()
+        self.stop_event = Event()
+        self.thread = None
+
+    def start(self):
+        """
+        Capture the first frame on the calling thread (sizing the ring from it), then start the capture thread.
+        """
+        ret, frame = self.camera.read()
+        if not ret:
+            raise SensorError("Camera", "Failed to read from camera")
+        self.ring = np.empty((self.ring_size,) + frame.shape, dtype=frame.dtype)
+        self.store(0, frame)
+        self.stop_event.clear()
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def store(self, index, frame):
+        """
+        Make sure the frame is in ring slot index (converting it if configured) and publish it.
+        """
+        ring = self.ring
+        slot = ring[index]
+        if frame is not slot:
+            # The backend could not decode into the slot, e.g. after a resolution change
+            if frame.shape != slot.shape or frame.dtype != slot.dtype:
+                ring = np.empty((self.ring_size,) + frame.shape, dtype=frame.dtype)
+                slot = ring[index]
+            np.copyto(slot, frame)
+        if self.convert_to_rgb:
+            cv2.cvtColor(slot, cv2.COLOR_BGR2RGB, dst=slot)
+        with self.condition:
+            self.ring = ring  # Published together with the index, so readers never see an unfilled slot
+            self.index = index
+            self.timestamp = time.monotonic()
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def run(self):
+        failures = 0
+        while not self.stop_event.is_set():
+            index = (self.index + 1) % self.ring_size
+            ret, frame = self.camera.read(self.ring[index])
+            if not ret:
+                failures += 1
+                if failures >= self.max_failures:
+                    with self.condition:
+                        self.error = SensorError("Camera", f"Capture stopped after {failures} failed reads")
+                        self.condition.notify_all()
+                    return
+                continue
+            failures = 0
+            self.store(index, frame)
+
+    def latest(self):
+        """
+        Return (frame, timestamp, sequence) for the freshest frame without copying it.
+        The timestamp is time.monotonic() when the frame was captured; the sequence counts captured frames.
+        """
+        with self.condition:
+            if self.error is not None:
+                raise self.error
+            return self.ring[self.index], self.timestamp, self.sequence
+
+    def wait_for_frame(self, after_sequence, timeout=1.0):
+        """
+        Wait for a frame newer than after_sequence and return it like latest().
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.sequence > after_sequence or self.error is not None, timeout):
+                raise SensorError("Camera", f"No new frame within {timeout} seconds")
+        return self.latest()
+
 
 class SensorInput:
     """
     Manages the acquisition of data from various sensors installed on the drone, including cameras and LiDAR.
     """
-    def __init__(self, camera_index, lidar_config):
+    def __init__(self, camera_index, lidar_config, background_capture=False, ring_size=3, convert_to_rgb=False,
+                 recorder=None):
+        """
+        Args:
+            camera_index (int): OpenCV camera index.
+            lidar_config (dict): LiDAR connection settings: 'port', and optionally 'baudrate', 'beams' and
+                                 'timeout' (seconds to wait for the first scan). Without an existing port,
+                                 LiDAR data is simulated.
+            background_capture (bool): Grab camera frames continuously in a background thread (see CameraGrabber).
+            ring_size (int): Frame buffers used by the background grabber.
+            convert_to_rgb (bool): Have the background grabber convert frames to RGB instead of leaving it
+                                   to the consumer.
+            recorder (SessionRecorder): Record every camera frame and LiDAR scan handed out, for replay
+                                        with ReplaySensorInput.
+        """
         self.camera = self.initialize_camera(camera_index)
+        self.grabber = CameraGrabber(self.camera, ring_size, convert_to_rgb).start() if background_capture else None
         self.lidar_config = lidar_config
+        self.recorder = recorder
         self.initialize_lidar()
 
     def initialize_camera(self, camera_index):
@@ -23,38 +152,85 @@ class SensorInput:
 
     def initialize_lidar(self):
         """
-        Initialize LiDAR hardware using the provided configuration.
+        Start streaming from the configured LiDAR port, or fall back to simulated scans if there is none.
         """
+        port = self.lidar_config.get('port')
+        if port is None or not os.path.exists(port):
+            self.lidar = None
+            print(f"LiDAR port {port} not found, simulating LiDAR data")
+            return
         try:
-            # Placeholder for LiDAR initialization code.
-            # suppose this involves setting up connection parameters and calibration.
+            self.lidar = LidarReader(port, beams=self.lidar_config.get('beams', 360),
+                                     baudrate=self.lidar_config.get('baudrate', 230400)).start()
             print("LiDAR initialized with config:", self.lidar_config)
         except Exception as e:
-            raise SensorError(f"Failed to initialize LiDAR with config {self.lidar_config}: {str(e)}")
+            raise SensorError("LiDAR", f"Failed to initialize LiDAR with config {self.lidar_config}: {str(e)}")
+
+    def get_camera_frame(self):
+        """
+        Capture a raw frame from the camera as the BGR ndarray OpenCV delivers, without conversion.
+        With background capture this is the freshest grabbed frame (RGB if the grabber converts), not a copy.
+        """
+        if self.grabber is not None:
+            frame, timestamp, _ = self.grabber.latest()
+        else:
+            ret, frame = self.camera.read()
+            if not ret:
+                raise SensorError("Failed to read from camera")
+            timestamp = time.monotonic()
+        if self.recorder is not None:
+            self.recorder.record_camera(frame, timestamp)
+        return frame
 
     def get_camera_data(self):
         """
         Capture an image frame from the camera.
         """
-        ret, frame = self.camera.read()
-        if not ret:
-            raise SensorError("Failed to read from camera")
+        frame = self.get_camera_frame()
+        if self.grabber is not None and self.grabber.convert_to_rgb:
+            return Image.fromarray(frame)
         return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
 
-    def get_lidar_data(self):
+    def get_latest_frame(self):
         """
-        Simulate the retrieval of LiDAR data. Replace with actual data retrieval logic.
+        Return (frame, timestamp) for the freshest frame from the background grabber, without copying.
         """
-        try:
-            # Simulate 360-degree LiDAR data as an array of distances
-            return np.random.rand(360) * 100  # Distances in meters
-        except Exception as e:
-            raise SensorError(f"Failed to retrieve LiDAR data: {str(e)}")
+        if self.grabber is None:
+            raise SensorError("Camera", "Background capture is not enabled")
+        frame, timestamp, _ = self.grabber.latest()
+        return frame, timestamp
+
+    def get_lidar_data(self, copy=True):
+        """
+        Return the latest complete LiDAR revolution: ranges in meters per beam, inf where nothing returned.
+        Without a LiDAR port, simulated distances are returned.
+
+        Args:
+            copy (bool): Return a copy of the scan. With False the scan is a view into the reader's ring,
+                which is overwritten two revolutions later; only use it for work finished before then.
+        """
+        if self.lidar is not None:
+            scan, timestamp, _ = self.lidar.wait_for_scan(0, self.lidar_config.get('timeout', 1.0))
+        else:
+            try:
+                # Simulate 360-degree LiDAR data as an array of distances
+                scan, timestamp = np.random.rand(360) * 100, time.monotonic()  # Distances in meters
+            except Exception as e:
+                raise SensorError(f"Failed to retrieve LiDAR data: {str(e)}")
+        if self.recorder is not None:
+            self.recorder.record_lidar(scan, timestamp)
+        return scan.copy() if copy and self.lidar is not None else scan
 
     def release_resources(self):
         """
         Release hardware resources properly to ensure a clean shutdown.
         """
+        if self.grabber is not None:
+            self.grabber.stop()
+        if self.lidar is not None:
+            self.lidar.stop()
+        if self.recorder is not None:
+            self.recorder.close()
         self.camera.release()
         cv2.destroyAllWindows()
 
@@ -62,6 +238,8 @@ class SensorInput:
 # try:
 #     sensor_system = SensorInput(camera_index=0, lidar_config={'port': '/dev/ttyUSB0'})
 #     camera_image = sensor_system.get_camera_data()
+#     grabbing = SensorInput(camera_index=0, lidar_config={}, background_capture=True)
+#     frame, captured_at = grabbing.get_latest_frame()  # Freshest frame, no copy, BGR order
 #     lidar_scan = sensor_system.get_lidar_data()
 #     camera_image.show()  # Display the captured image using PIL
 #     print("LiDAR Data:", lidar_scan)
@@ -0,0 +1,176 @@
+import heapq
+import logging
+import numpy as np
+from exceptions import CriticalNavigationError, SensorError
+
+class SensorFusion:
+    """
+    Timestamped multi-rate Kalman fusion over the NavigationSystem state (x, y, z, vx, vy, vz).
+    The transition and process noise are built from the actual time between measurements, and every
+    sensor has its own measurement matrix and noise, so partial measurements (an altimeter reading,
+    a velocity from the IMU) update the state without padding. Measurements are held for a short
+    reorder window and applied in timestamp order, so slightly out-of-sequence arrivals are fused correctly.
+    """
+    DEFAULT_SENSORS = {
+        'gps': ([0, 1, 2], 0.05),        # Position fix
+        'imu': ([3, 4, 5], 0.01),        # Velocity from the inertial unit
+        'altimeter': ([2], 0.02),        # Height only
+        'full': ([0, 1, 2, 3, 4, 5], 0.05),  # The full-state reading NavigationSystem expects
+    }
+
+    def __init__(self, process_noise=0.01, initial_uncertainty=1000.0, reorder_window=0.05, sensors=None):
+        """
+        Args:
+            process_noise (float): White-acceleration noise density used to build Q from dt.
+            initial_uncertainty (float): Initial variance of every state component.
+            reorder_window (float): Seconds a measurement is held back so later-arriving older
+                                    measurements can be applied before it.
+            sensors (dict): Optional mapping of sensor name to (state indices, variance) replacing the defaults.
+        """
+        self.state = np.zeros(6)
+        self.covariance = np.eye(6) * initial_uncertainty
+        self.process_noise = process_noise
+        self.reorder_window = reorder_window
+        self.sensors = {}
+        for name, (indices, variance) in (sensors or self.DEFAULT_SENSORS).items():
+            self.register_sensor(name, indices, variance)
+        self.time = None  # Timestamp the state refers to
+        self.pending = []  # Heap of (timestamp, sequence, sensor, values, R)
+        self.sequence = 0
+        self.latest_timestamp = -np.inf
+        self.late_measurements = 0
+        self.model_cache = (None, None, None)  # (dt, F, Q) for the most recent step length
+        self.logger = logging.getLogger('SensorFusion')
+
+    def register_sensor(self, name, indices, variance):
+        """
+        Add or replace a sensor that measures the given state components.
+
+        Args:
+            name (str): Sensor name used in add_measurement.
+            indices (list): State components the sensor measures, in the order of its readings.
+            variance (float or array): Measurement variance (scalar, per component, or a full R matrix).
+        """
+        indices = np.asarray(indices, dtype=int)
+        H = np.zeros((len(indices), 6))
+        H[np.arange(len(indices)), indices] = 1.0
+        variance = np.asarray(variance, dtype=float)
+        R = variance if variance.ndim == 2 else np.eye(len(indices)) * variance
+        self.sensors[name] = (H, R)
+
+    def transition(self, dt):
+        """
+        Return F and Q for a step of dt seconds under a constant-velocity model with white acceleration noise.
+        """
+        if self.model_cache[0] == dt:
+            return self.model_cache[1], self.model_cache[2]
+        eye = np.eye(3)
+        F = np.block([[eye, dt * eye], [np.zeros((3, 3)), eye]])
+        q = self.process_noise
+        Q = q * np.block([[dt ** 3 / 3 * eye, dt ** 2 / 2 * eye], [dt ** 2 / 2 * eye, dt * eye]])
+        self.model_cache = (dt, F, Q)
+        return F, Q
+
+    def add_measurement(self, sensor, timestamp, values, R=None):
+        """
+        Queue a timestamped measurement and fuse every queued measurement older than the reorder window.
+
+        Args:
+            sensor (str): Registered sensor name.
+            timestamp (float): Measurement time in seconds.
+            values (array): Reading with one value per measured component.
+            R (array): Optional measurement noise overriding the sensor's default for this reading.
+
+        Returns:
+            int: Number of measurements fused by this call.
+        """
+        if sensor not in self.sensors:
+            raise SensorError(sensor, "Unknown sensor")
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) != self.sensors[sensor][0].shape[0]:
+            raise SensorError(sensor, f"Expected {self.sensors[sensor][0].shape[0]} values, got {len(values)}")
+        if not np.all(np.isfinite(values)):
+            raise SensorError(sensor, "Invalid sensor data received")
+        if self.time is not None and timestamp < self.time:
+            # Older than what has already been fused; applying it would need a rollback
+            self.late_measurements += 1
+            self.logger.warning(f"Dropped late {sensor} measurement at {timestamp:.3f}s (state at {self.time:.3f}s)")
+            return 0
+        heapq.heappush(self.pending, (timestamp, self.sequence, sensor, values, R))
+        self.sequence += 1
+        self.latest_timestamp = max(self.latest_timestamp, timestamp)
+        return self.process(self.latest_timestamp - self.reorder_window)
+
+    def flush(self):
+        """
+        Fuse every queued measurement regardless of the reorder window. Returns the number fused.
+        """
+        return self.process(np.inf)
+
+    def process(self, horizon):
+        """
+        Fuse queued measurements with timestamps up to the horizon, oldest first.
+        """
+        fused = 0
+        while self.pending and self.pending[0][0] <= horizon:
+            timestamp, _, sensor, values, R = heapq.heappop(self.pending)
+            self.predict_to(timestamp)
+            self.update(sensor, values, R)
+            fused += 1
+        return fused
+
+    def predict_to(self, timestamp):
+        """
+        Propagate the state and covariance to the given time.
+        """
+        if self.time is not None and timestamp > self.time:
+            F, Q = self.transition(timestamp - self.time)
+            self.state = F @ self.state
+            self.covariance = F @ self.covariance @ F.T + Q
+        self.time = timestamp
+
+    def update(self, sensor, values, R=None):
+        """
+        Correct the state with one partial measurement using the sensor's H and R (Joseph form).
+        """
+        H, default_R = self.sensors[sensor]
+        R = default_R if R is None else np.asarray(R, dtype=float)
+        try:
+            PHT = self.covariance @ H.T
+            S = H @ PHT + R
+            K = np.linalg.solve(S, PHT.T).T
+            self.state = self.state + K @ (values - H @ self.state)
+            I_KH = np.eye(6) - K @ H
+            self.covariance = I_KH @ self.covariance @ I_KH.T + K @ R @ K.T
+        except np.linalg.LinAlgError as e:
+            raise CriticalNavigationError(f"Failed to fuse {sensor} measurement: {str(e)}")
+
+    def state_at(self, timestamp):
+        """
+        Return the state extrapolated to a time at or after the last fused measurement, without changing it.
+        """
+        if self.time is None or timestamp <= self.time:
+            return self.state.copy()
+        F, _ = self.transition(timestamp - self.time)
+        return F @ self.state
+
+    def get_position(self):
+        """
+        Return the current estimated position.
+        """
+        return self.state[:3]
+
+    def get_velocity(self):
+        """
+        Return the current estimated velocity.
+        """
+        return self.state[3:6]
+
+
+# Example usage can be:
+# fusion = SensorFusion(reorder_window=0.02)
+# fusion.add_measurement('imu', 0.000, [1.0, 0.0, 0.0])
+# fusion.add_measurement('gps', 0.010, [0.0, 0.0, 10.0])
+# fusion.add_measurement('imu', 0.005, [1.0, 0.0, 0.0])  # Arrived late but within the window
+# fusion.flush()
+# print("Fused position:", fusion.get_position(), "velocity:", fusion.get_velocity())
@@ -0,0 +1,269 @@
+import json
+import os
+import time
+import numpy as np
+import cv2
+from PIL import Image
+from exceptions import SensorError
+
+MANIFEST = 'session.json'
+
+
+class SessionRecorder:
+    """
+    Records timestamped sensor streams (camera frames, LiDAR scans, navigation measurements) into a session
+    directory. Each stream is written into fixed-size chunks of memory-mapped .npy files, so recording is a
+    copy into mapped pages with no per-record file I/O, and a replay can map any record without reading the
+    rest of the session. A session.json manifest lists each stream's dtype, shape and record count; it is
+    rewritten whenever a chunk is opened, and timestamps of rows not yet recorded are NaN, so a session cut
+    short by a crash or power loss still replays up to its last recorded row.
+    """
+    def __init__(self, directory, chunk_size=64):
+        """
+        Args:
+            directory (str): Session directory; created if missing.
+            chunk_size (int): Records per chunk file.
+        """
+        if chunk_size < 1:
+            raise SensorError("Recorder", f"Chunk size must be positive, got {chunk_size}")
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.streams = {}  # name -> {'dtype', 'shape', 'count', 'last', 'data', 'timestamps'}
+        os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_camera(self, frame, timestamp=None):
+        self.record('camera', frame, timestamp)
+
+    def record_lidar(self, scan, timestamp=None):
+        self.record('lidar', scan, timestamp)
+
+    def record_navigation(self, measurement, timestamp=None):
+        self.record('navigation', measurement, timestamp)
+
+    def record(self, name, value, timestamp=None):
+        """
+        Append one record to a stream. All records of a stream share the dtype and shape of its first one,
+        and timestamps (monotonic clock by default) must not decrease.
+        """
+        value = np.asarray(value)
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = self.streams[name] = {'dtype': value.dtype, 'shape': value.shape, 'count': 0,
+                                           'last': -np.inf, 'data': None, 'timestamps': None}
+            os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+        elif value.shape != stream['shape'] or value.dtype != stream['dtype']:
+            raise SensorError(name, f"Record of shape {value.shape} and dtype {value.dtype} does not match the "
+                                    f"stream's {stream['shape']} {stream['dtype']}")
+        if timestamp < stream['last']:
+            raise SensorError(name, f"Timestamps must not decrease ({timestamp} after {stream['last']})")
+        row = stream['count'] % self.chunk_size
+        if row == 0:
+            self.open_chunk(name, stream)
+        stream['data'][row] = value
+        stream['timestamps'][row] = timestamp
+        stream['last'] = timestamp
+        stream['count'] += 1
+
+    def open_chunk(self, name, stream):
+        """
+        Flush the stream's current chunk, map the next one and list it in the manifest.
+        """
+        if stream['data'] is not None:
+            self.flush_chunk(stream)
+        chunk = stream['count'] // self.chunk_size
+        data_path, timestamps_path = chunk_paths(self.directory, name, chunk)
+        stream['data'] = np.lib.format.open_memmap(data_path, mode='w+', dtype=stream['dtype'],
+                                                   shape=(self.chunk_size,) + stream['shape'])
+        stream['timestamps'] = np.lib.format.open_memmap(timestamps_path, mode='w+', dtype=np.float64,
+                                                         shape=(self.chunk_size,))
+        stream['timestamps'][:] = np.nan  # Marks the rows not recorded yet
+        stream['timestamps'].flush()
+        self.write_manifest()
+
+    @staticmethod
+    def flush_chunk(stream):
+        stream['data'].flush()
+        stream['timestamps'].flush()
+        stream['data'] = stream['timestamps'] = None
+
+    def write_manifest(self):
+        streams = {name: {'dtype': stream['dtype'].str, 'shape': list(stream['shape']), 'count': stream['count']}
+                   for name, stream in self.streams.items()}
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'chunk_size': self.chunk_size, 'streams': streams}, f, indent=2)
+        os.replace(path + '.tmp', path)  # A crash mid-write leaves the previous manifest in place
+
+    def close(self):
+        """
+        Flush all open chunks and write the final manifest.
+        """
+        for stream in self.streams.values():
+            if stream['data'] is not None:
+                self.flush_chunk(stream)
+        self.write_manifest()
+
+
+def chunk_paths(directory, name, chunk):
+    base = os.path.join(directory, name, f'{chunk:05d}')
+    return base + '.npy', base + '_timestamps.npy'
+
+
+class RecordedStream:
+    """
+    Read-only view of one recorded stream. Timestamps are loaded up front; records are memory-mapped from
+    their chunk files when first accessed. The record count comes from the chunk files rather than the
+    manifest, whose count lags behind a recording that was never closed: records run up to the first
+    unrecorded (NaN) timestamp.
+    """
+    def __init__(self, directory, name, chunk_size):
+        self.directory = directory
+        self.name = name
+        self.chunk_size = chunk_size
+        timestamps = []
+        while os.path.exists(chunk_paths(directory, name, len(timestamps))[1]):
+            try:
+                timestamps.append(np.load(chunk_paths(directory, name, len(timestamps))[1]))
+            except (OSError, ValueError):
+                break  # Chunk whose creation was cut short
+        timestamps = np.concatenate(timestamps) if timestamps else np.zeros(0)
+        missing = np.isnan(timestamps)
+        self.count = int(np.argmax(missing)) if missing.any() else len(timestamps)
+        self.timestamps = timestamps[:self.count]
+        self.chunks = [None] * -(-self.count // chunk_size)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise SensorError(self.name, f"Record {index} is outside the {self.count} recorded")
+        chunk, row = divmod(index, self.chunk_size)
+        if self.chunks[chunk] is None:
+            self.chunks[chunk] = np.load(chunk_paths(self.directory, self.name, chunk)[0], mmap_mode='r')
+        return self.chunks[chunk][row]
+
+    def latest(self, timestamp):
+        """
+        Index of the last record taken at or before the timestamp; the first record if there is none yet.
+        """
+        return max(int(np.searchsorted(self.timestamps, timestamp, side='right')) - 1, 0)
+
+
+class ReplaySensorInput:
+    """
+    Drop-in replacement for SensorInput that plays back a recorded session. Camera frames drive the replay
+    clock (LiDAR scans if no camera was recorded); the other streams return their latest record at that time.
+
+    As fast as possible (default), every frame request returns the next recorded frame, so a replay is
+    deterministic and runs at the speed of the consumer. In real time, the session clock follows the wall
+    clock (scaled by speed): frame requests wait for the next frame and skip frames the consumer was too
+    slow for, as a live camera would. Records are read-only views into memory-mapped chunks.
+    """
+    def __init__(self, directory, realtime=False, speed=1.0):
+        """
+        Args:
+            directory (str): Session directory written by SessionRecorder.
+            realtime (bool): Pace the replay by the recorded timestamps instead of running as fast as possible.
+            speed (float): Playback rate in real time mode.
+        """
+        try:
+            with open(os.path.join(directory, MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise SensorError("Replay", f"Failed to open recorded session {directory}: {str(e)}")
+        self.streams = {name: RecordedStream(directory, name, manifest['chunk_size'])
+                        for name in manifest['streams']}
+        self.driver = 'camera' if 'camera' in self.streams else 'lidar'
+        if not len(self.streams.get(self.driver, ())):
+            raise SensorError("Replay", f"Recorded session {directory} has no camera or LiDAR records")
+        self.realtime = realtime
+        self.speed = speed
+        self.grabber = None
+        self.lidar = None
+        self.position = -1  # Last record of the driving stream handed out
+        self.start_time = self.streams[self.driver].timestamps[0]
+        self.clock = self.start_time
+        self.started = None  # Wall time the real time replay started at
+
+    def session_time(self):
+        if self.started is None:
+            self.started = time.monotonic()
+        return self.start_time + (time.monotonic() - self.started) * self.speed
+
+    def advance(self):
+        """
+        Move the driving stream to its next record and the replay clock to that record's time.
+        """
+        stream = self.streams[self.driver]
+        if self.position + 1 >= len(stream):
+            raise SensorError("Replay", "Recorded session ended")
+        if self.realtime:
+            wait = (stream.timestamps[self.position + 1] - self.session_time()) / self.speed
+            if wait > 0:
+                time.sleep(wait)
+            self.clock = self.session_time()
+            self.position = stream.latest(self.clock)
+        else:
+            self.position += 1
+            self.clock = stream.timestamps[self.position]
+        return stream[self.position]
+
+    def current(self, name):
+        if name not in self.streams or not len(self.streams[name]):
+            raise SensorError("Replay", f"No {name} data in the recorded session")
+        stream = self.streams[name]
+        return stream[stream.latest(self.clock)]
+
+    @property
+    def exhausted(self):
+        return self.position + 1 >= len(self.streams[self.driver])
+
+    def get_camera_frame(self):
+        """
+        Return the next recorded camera frame as recorded (BGR for frames from SensorInput).
+        """
+        return self.advance() if self.driver == 'camera' else self.current('camera')
+
+    def get_camera_data(self):
+        return Image.fromarray(cv2.cvtColor(np.asarray(self.get_camera_frame()), cv2.COLOR_BGR2RGB))
+
+    def get_latest_frame(self):
+        """
+        Return (frame, timestamp) like SensorInput.get_latest_frame, with timestamps in the recording's clock.
+        """
+        frame = self.get_camera_frame()
+        stream = self.streams['camera']
+        return frame, stream.timestamps[stream.latest(self.clock)]
+
+    def get_lidar_data(self, copy=True):
+        """
+        Return the LiDAR scan recorded last before the replay clock; with copy=False, a read-only view.
+        """
+        scan = self.advance() if self.driver == 'lidar' else self.current('lidar')
+        return np.array(scan) if copy else scan
+
+    def get_navigation_data(self):
+        """
+        Return the navigation measurement recorded last before the replay clock.
+        """
+        return self.current('navigation')
+
+    def release_resources(self):
+        for stream in self.streams.values():
+            stream.chunks = [None] * len(stream.chunks)
+
+# Example usage can be:
+# with SessionRecorder('flight_001') as recorder:
+#     sensor = SensorInput(camera_index=0, lidar_config={'port': '/dev/ttyUSB0'}, recorder=recorder)
+#     frame, scan = sensor.get_camera_frame(), sensor.get_lidar_data()  # Recorded as they are read
+#     recorder.record_navigation(gps_imu_measurement)
+# replay = ReplaySensorInput('flight_001')  # Or realtime=True to keep the recorded pacing
+# frame, scan = replay.get_camera_frame(), replay.get_lidar_data()
@@ -0,0 +1,197 @@
+import numpy as np
+from scipy.interpolate import CubicSpline
+from exceptions import FlightPlanError
+
+class Trajectory:
+    """
+    Time-parameterized flight trajectory sampled at a fixed control rate.
+    Rows of the (T, 7) data array are [t, x, y, z, vx, vy, vz]; row i holds the setpoint for t = i / rate,
+    so the control loop looks setpoints up by index instead of interpolating every tick.
+    """
+    def __init__(self, data, rate):
+        self.data = data
+        self.rate = rate
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def duration(self):
+        return float(self.data[-1, 0])
+
+    @property
+    def positions(self):
+        return self.data[:, 1:4]
+
+    @property
+    def velocities(self):
+        return self.data[:, 4:7]
+
+    def index_at(self, elapsed):
+        """
+        Return the row index of the setpoint for the given time since the trajectory start.
+        Times past the end hold the final setpoint.
+        """
+        return min(max(int(elapsed * self.rate), 0), len(self.data) - 1)
+
+    def setpoint(self, elapsed):
+        """
+        Return the (position, velocity) setpoint for the given time as views into the trajectory array.
+        """
+        row = self.data[self.index_at(elapsed)]
+        return row[1:4], row[4:7]
+
+
+class TrajectoryGenerator:
+    """
+    Turns the waypoint lists returned by FlightPlanner.find_path into smooth trajectories.
+    Redundant waypoints are shortcut with one batched no-fly zone check, a cubic spline is fitted by arc
+    length, and a speed profile respecting velocity, acceleration and curvature limits is sampled at the
+    control rate.
+    """
+    def __init__(self, planner=None, max_velocity=10.0, max_acceleration=3.0, control_rate=50.0,
+                 resolution=0.5, max_refinements=5):
+        """
+        Args:
+            planner (FlightPlanner): Planner whose no-fly zones constrain shortcuts and the fitted curve.
+                                     None disables shortcutting and zone checks.
+            max_velocity (float): Speed limit in m/s.
+            max_acceleration (float): Limit in m/s^2 for both along-path and centripetal acceleration.
+            control_rate (float): Setpoint rate of the output trajectory in Hz.
+            resolution (float): Spacing in metres of the samples used to build the speed profile.
+            max_refinements (int): How often the curve is refitted with extra knots before falling
+                                   back to straight segments when it cuts into a no-fly zone.
+        """
+        if max_velocity <= 0 or max_acceleration <= 0 or control_rate <= 0 or resolution <= 0:
+            raise FlightPlanError((max_velocity, max_acceleration, control_rate, resolution),
+                                  "Trajectory limits must be positive")
+        self.planner = planner
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.control_rate = control_rate
+        self.resolution = resolution
+        self.max_refinements = max_refinements
+
+    def shortcut(self, path):
+        """
+        Drop waypoints that can be skipped by flying straight to a later one.
+        Every (i, j) segment of the path is checked in one batched call; the path then greedily jumps to
+        the farthest visible waypoint.
+        """
+        points = self.deduplicate(np.asarray(path, dtype=float).reshape(-1, 3))
+        if self.planner is None:
+            return points
+        count = len(points)
+        first, second = np.triu_indices(count, k=2)
+        visible = np.eye(count, k=1, dtype=bool)
+        visible[first, second] = ~self.planner.segments_in_no_fly_zone(points[first], points[second])
+        kept = [0]
+        while kept[-1] != count - 1:
+            kept.append(int(np.flatnonzero(visible[kept[-1]]).max()))
+        return points[kept]
+
+    @staticmethod
+    def deduplicate(points):
+        """
+        Remove consecutive repeated points, which would give the spline zero-length knot intervals.
+        """
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+        return points[keep]
+
+    def fit(self, points):
+        """
+        Fit a cubic spline through the points, parameterized by chord length. If a planner is set and the
+        curve swings into a no-fly zone, the offending spans get a midpoint knot and the spline is refitted;
+        after max_refinements the points are joined by straight segments instead.
+        """
+        for _ in range(self.max_refinements + 1):
+            knots = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+            spline = CubicSpline(knots, points, bc_type='natural')
+            if self.planner is None or len(points) < 3:
+                return spline
+            samples = np.linspace(0.0, knots[-1], max(int(knots[-1] / self.resolution), 1) + 1)
+            inside = self.planner.points_in_no_fly_zone(spline(samples))
+            if not inside.any():
+                return spline
+            spans = np.unique(np.clip(np.searchsorted(knots, samples[inside]) - 1, 0, len(points) - 2))
+            points = np.insert(points, spans + 1, (points[spans] + points[spans + 1]) / 2, axis=0)
+        knots = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+        return self.polyline(knots, points)
+
+    @staticmethod
+    def polyline(knots, points):
+        """
+        Piecewise-linear curve with the same call interface as a spline (value and first two derivatives).
+        """
+        def curve(u, nu=0):
+            if nu == 0:
+                return np.stack([np.interp(u, knots, points[:, axis]) for axis in range(3)], axis=-1)
+            if nu == 1:
+                span = np.clip(np.searchsorted(knots, u, side='right') - 1, 0, len(points) - 2)
+                return (points[span + 1] - points[span]) / (knots[span + 1] - knots[span])[:, None]
+            return np.zeros((len(u), 3))
+        curve.x = knots
+        return curve
+
+    def speed_profile(self, arc, curvature):
+        """
+        Return the fastest speed at each sample that respects the velocity limit, the centripetal limit
+        v^2 * curvature <= a_max and the along-path limit |d(v^2)/ds| <= 2 * a_max, starting and ending at rest.
+        Both passes use the closed form w[i] = min_j (cap[j] + 2a|s_i - s_j|) evaluated with cumulative minima.
+        """
+        a2 = 2.0 * self.max_acceleration
+        with np.errstate(divide='ignore'):
+            cap = np.minimum(self.max_velocity ** 2, self.max_acceleration / curvature)
+        cap[[0, -1]] = 0.0
+        forward = a2 * arc + np.minimum.accumulate(cap - a2 * arc)
+        backward = np.minimum.accumulate((forward + a2 * arc)[::-1])[::-1] - a2 * arc
+        return np.sqrt(np.maximum(backward, 0.0))
+
+    def generate(self, path, start_time=0.0):
+        """
+        Build the trajectory for a planned path.
+
+        Args:
+            path (list): Waypoints as returned by FlightPlanner.find_path.
+            start_time (float): Time stamp of the first setpoint.
+
+        Returns:
+            Trajectory: Setpoints at the control rate from rest at the first waypoint to rest at the last.
+        """
+        points = self.shortcut(path)
+        if len(points) < 2:
+            data = np.zeros((1, 7))
+            data[0, 0] = start_time
+            data[0, 1:4] = points[0]
+            return Trajectory(data, self.control_rate)
+        curve = self.fit(points)
+        length = curve.x[-1]
+
+        # Dense samples along the curve parameter; the chord-length parameter is close to arc length
+        u = np.linspace(0.0, length, max(int(np.ceil(length / self.resolution)), 2) + 1)
+        first, second = curve(u, 1), curve(u, 2)
+        speed = np.linalg.norm(first, axis=1)
+        arc = np.concatenate([[0.0], np.cumsum(0.5 * (speed[1:] + speed[:-1]) * np.diff(u))])
+        curvature = np.linalg.norm(np.cross(first, second), axis=1) / np.maximum(speed, 1e-12) ** 3
+        velocity = self.speed_profile(arc, curvature)
+        # Constant acceleration between samples gives dt = 2 ds / (v0 + v1)
+        times = np.concatenate([[0.0], np.cumsum(2.0 * np.diff(arc) / np.maximum(velocity[1:] + velocity[:-1], 1e-12))])
+
+        rows = int(np.ceil(times[-1] * self.control_rate)) + 1
+        data = np.empty((rows, 7))
+        data[:, 0] = np.minimum(np.arange(rows) / self.control_rate, times[-1])
+        sample_u = np.interp(data[:, 0], times, u)
+        data[:, 1:4] = curve(sample_u)
+        tangent = curve(sample_u, 1)
+        tangent /= np.maximum(np.linalg.norm(tangent, axis=1), 1e-12)[:, None]
+        data[:, 4:7] = tangent * np.interp(data[:, 0], times, velocity)[:, None]
+        data[-1, 4:7] = 0.0
+        data[:, 0] += start_time
+        return Trajectory(data, self.control_rate)
+
+# Example usage can be:
+# planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]))
+# trajectory = TrajectoryGenerator(planner, max_velocity=8.0, max_acceleration=2.0).generate(planner.find_path([0, 0, 0]))
+# position, velocity = trajectory.setpoint(2.5)
+# print("Duration:", trajectory.duration, "setpoint:", position, velocity)
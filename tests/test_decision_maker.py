@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from unittest.mock import patch, MagicMock
 from decision_maker import DecisionMaker
 
@@ -38,5 +39,17 @@ class TestDecisionMaker(unittest.TestCase):
         """
         self.assertIsNotNone(self.decision_maker.model)  # Updated to reflect current implementation
 
+    def test_decision_from_camera_frame(self):
+        """Captured BGR frames are used in memory, and scans are reduced to DecisionNet's 10 sensor inputs."""
+        frame = np.random.default_rng(0).integers(0, 256, (120, 160, 3), dtype=np.uint8)
+        scan = np.full(360, np.inf)
+        scan[40] = 3.0
+        features = DecisionMaker.lidar_features(scan)
+        self.assertEqual(features.shape, (10,))
+        self.assertEqual(features[1], 3.0)
+        self.assertTrue(np.all(np.delete(features, 1) == 100.0))
+        action = self.decision_maker.make_decision(frame, features)
+        self.assertIn(action, range(6))
+
 if __name__ == '__main__':
     unittest.main()
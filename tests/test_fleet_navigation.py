@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from fleet_navigation import FleetNavigationSystem
+from navigation import NavigationSystem
+from exceptions import SensorError
+
+class TestFleetNavigationSystem(unittest.TestCase):
+    def setUp(self):
+        self.fleet = FleetNavigationSystem(num_drones=4)
+        self.singles = [NavigationSystem() for _ in range(4)]
+        self.rng = np.random.default_rng(0)
+
+    def test_matches_separate_navigation_systems(self):
+        """Batched updates give the same estimates as one NavigationSystem per drone."""
+        for _ in range(5):
+            readings = self.rng.normal(size=(4, 6))
+            self.fleet.update_navigation_state(readings)
+            for single, reading in zip(self.singles, readings):
+                single.update_navigation_state(reading)
+        np.testing.assert_allclose(self.fleet.states, [single.state.ravel() for single in self.singles], atol=1e-9)
+        np.testing.assert_allclose(self.fleet.covariances, [single.kalman_filter.P for single in self.singles], atol=1e-9)
+
+    def test_drone_mask(self):
+        """Drones without a reading are only predicted and may carry NaN rows."""
+        readings = self.rng.normal(size=(4, 6))
+        readings[2] = np.nan
+        self.fleet.update_navigation_state(readings, mask=[True, True, False, True])
+        for index, single in enumerate(self.singles):
+            if index == 2:
+                single.kalman_filter.predict()
+            else:
+                single.update_navigation_state(readings[index])
+        np.testing.assert_allclose(self.fleet.states, [single.kalman_filter.x.ravel() for single in self.singles], atol=1e-9)
+        np.testing.assert_allclose(self.fleet.covariances[2], self.singles[2].kalman_filter.P)
+
+    def test_component_mask(self):
+        """A drone that only receives a position fix is filtered with the matching partial measurement model."""
+        readings = self.rng.normal(size=(4, 6))
+        components = np.ones((4, 6), dtype=bool)
+        components[1, 3:] = False
+        readings[1, 3:] = np.nan
+        self.fleet.update_navigation_state(readings, mask=components)
+        single = self.singles[1].kalman_filter
+        single.predict()
+        H, R = single.H[:3], single.R[:3, :3]
+        K = single.P @ H.T @ np.linalg.inv(H @ single.P @ H.T + R)
+        expected_state = single.x.ravel() + K @ (readings[1, :3] - H @ single.x.ravel())
+        I_KH = np.eye(6) - K @ H
+        expected_covariance = I_KH @ single.P @ I_KH.T + K @ R @ K.T
+        np.testing.assert_allclose(self.fleet.states[1], expected_state, atol=1e-9)
+        np.testing.assert_allclose(self.fleet.covariances[1], expected_covariance, atol=1e-9)
+
+    def test_invalid_readings_raise(self):
+        """Non-finite values in a used measurement raise SensorError."""
+        readings = np.zeros((4, 6))
+        readings[3, 0] = np.inf
+        with self.assertRaises(SensorError):
+            self.fleet.update_navigation_state(readings)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
+import os
+import unittest
+import tempfile
+from unittest.mock import patch
 import numpy as np
 from scipy.spatial import KDTree
 import networkx as nx
-from exceptions import NavigationError
+from exceptions import NavigationError, FlightPlanError
+import flight_plan
 
 class FlightPlanner:
     """
@@ -70,6 +75,12 @@ def weather_impact_adjustment(point1, point2):
     """
     return 1.1  # Simulates a 10% increase in path cost due to weather
 
+def batched_weather_impact_adjustment(starts, ends):
+    """
+    Dummy batched weather model returning one multiplier per edge.
+    """
+    return np.full(len(starts), 1.1)
+
 # Example usage can be:
 planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]), weather_impact_callback=weather_impact_adjustment)
 start_point = np.array([0, 0, 0])
@@ -78,3 +89,251 @@ try:
     print("Path:", path)
 except NavigationError as e:
     print(e)
+
+
+class TestFlightPlannerRoadmap(unittest.TestCase):
+    def test_complete_graph_by_default(self):
+        """Without a neighbour limit every pair of waypoints is connected, as in the original builder."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100])
+        count = len(planner.waypoints)
+        self.assertEqual(planner.graph.number_of_nodes(), count)
+        self.assertEqual(planner.graph.number_of_edges(), count * (count - 1))
+
+    def test_k_nearest_roadmap(self):
+        """The k-nearest builder links each waypoint to its neighbours in both directions."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=500, k_neighbors=6)
+        self.assertGreaterEqual(min(dict(planner.graph.out_degree()).values()), 6)
+        for u, v in planner.graph.edges():
+            self.assertTrue(planner.graph.has_edge(v, u))
+        path = planner.find_path(np.array([0, 0, 0]))
+        self.assertEqual(path[-1], (100, 100, 100))
+
+    def test_no_fly_zone_filtering_matches_midpoint_check(self):
+        """Batched filtering keeps exactly the edges whose midpoint is outside every zone."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                            num_waypoints=200, connection_radius=30)
+        for u, v in planner.graph.edges():
+            self.assertFalse(planner.is_point_in_no_fly_zone((np.array(u) + np.array(v)) / 2))
+
+    def test_edges_never_cross_no_fly_zones(self):
+        """Edges are rejected when any part of the segment passes through a zone, not only the midpoint."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[25, 25, 25]]))
+        self.assertFalse(planner.graph.has_edge((0.0, 0.0, 0.0), (100.0, 100.0, 100.0)))
+        starts, ends = zip(*planner.graph.edges())
+        self.assertFalse(planner.segments_in_no_fly_zone(starts, ends).any())
+
+    def test_weather_callback_scales_weights(self):
+        """Edge weights are the Euclidean length scaled by the weather callback."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], weather_impact_callback=weather_impact_adjustment)
+        for u, v, weight in planner.graph.edges(data='weight'):
+            self.assertAlmostEqual(weight, np.linalg.norm(np.subtract(u, v)) * 1.1)
+
+    def test_incremental_mode_tracks_edge_updates(self):
+        """Incremental replanning after weight changes and a new zone matches a fresh search."""
+        np.random.seed(7)
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=300, k_neighbors=6, incremental=True)
+        start = (0.0, 0.0, 0.0)
+        path = planner.find_path(start)
+        edge_ids = planner.edge_ids(path[:-1], path[1:])
+        self.assertTrue(np.all(edge_ids >= 0))
+        planner.update_edge_weights(edge_ids[:2], planner.edge_weights[edge_ids[:2]] * 5)
+        planner.add_no_fly_zone([path[len(path) // 2]], radii=2.0)
+        repaired = planner.find_path(start)
+        cost = sum(planner.graph[u][v]['weight'] for u, v in zip(repaired, repaired[1:]))
+        self.assertAlmostEqual(cost, nx.dijkstra_path_length(planner.graph, start, (100.0, 100.0, 100.0)))
+        self.assertFalse(planner.graph.has_edge(path[len(path) // 2 - 1], path[len(path) // 2]))
+
+    def test_add_cylinder_zone_to_planner_without_zones(self):
+        """The first runtime zone creates the map with the requested shape and height."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], seed=0)
+        planner.add_no_fly_zone([[50, 50, 0]], radii=10.0, heights=20, shape='cylinder')
+        self.assertEqual(planner.no_fly_zones.shape, 'cylinder')
+        np.testing.assert_array_equal(planner.no_fly_zones.heights, [20])
+        np.testing.assert_array_equal(planner.points_in_no_fly_zone([[50, 50, 10], [50, 50, 40]]), [True, False])
+        with self.assertRaises(FlightPlanError):
+            planner.add_no_fly_zone([[0, 0, 0]], shape='sphere')
+
+    def test_edge_ids_on_fully_blocked_roadmap(self):
+        """Without any edges every lookup reports the pair as not connected."""
+        zones = flight_plan.NoFlyZoneMap([[50, 50, 50]], radii=500.0)
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=zones, seed=0)
+        self.assertEqual(len(planner.edge_sources), 0)
+        np.testing.assert_array_equal(planner.edge_ids([0, 1], [1, 0]), [-1, -1])
+
+    def test_missing_edges_are_rejected(self):
+        """Updating the weight of a pair that is not connected raises and leaves every weight as it was."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], seed=0)
+        weights = planner.edge_weights.copy()
+        missing = planner.edge_ids([0], [0])
+        self.assertEqual(missing[0], -1)
+        for edge_ids in (missing, [0, len(weights)]):
+            with self.assertRaises(FlightPlanError):
+                planner.update_edge_weights(edge_ids, 999.0)
+        np.testing.assert_array_equal(planner.edge_weights, weights)
+
+    def test_path_cache_hits_and_invalidation(self):
+        """Repeated queries from the same snapped node hit the cache until an edge weight changes."""
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], snap_tolerance=0.5)
+        first = planner.find_path([0.1, -0.1, 0.2])
+        second = planner.find_path([0, 0, 0])
+        self.assertEqual(first, second)
+        self.assertEqual(planner.path_cache.hits, 1)
+        version = planner.graph_version
+        edge_ids = planner.edge_ids(first[:1], first[1:2])
+        planner.update_edge_weights(edge_ids, planner.edge_weights[edge_ids] * 100)
+        self.assertGreater(planner.graph_version, version)
+        planner.find_path([0, 0, 0])
+        self.assertEqual(planner.path_cache.stats()['misses'], 2)
+
+    def test_find_path_from_live_position(self):
+        """Off-graph start and goal positions are attached temporarily and the graph is left unchanged."""
+        np.random.seed(11)
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                            num_waypoints=400, k_neighbors=6)
+        node_count, edge_count = planner.graph.number_of_nodes(), planner.graph.number_of_edges()
+        start, goal = np.array([12.3, 45.6, 7.8]), np.array([80.1, 20.2, 60.3])
+        path = planner.find_path(start, goal_point=goal)
+        self.assertEqual(path[0], tuple(start))
+        self.assertEqual(path[-1], tuple(goal))
+        self.assertEqual((planner.graph.number_of_nodes(), planner.graph.number_of_edges()), (node_count, edge_count))
+        self.assertFalse(planner.segments_in_no_fly_zone(path[:-1], path[1:]).any())
+
+    def test_same_off_graph_start_and_goal(self):
+        """A start that is also the goal is the whole path, and the graph is left unchanged."""
+        for backend in ('networkx', 'csr'):
+            planner = flight_plan.FlightPlanner(destination=[100, 100, 100], seed=0, backend=backend)
+            node_count = len(planner.node_keys)
+            self.assertEqual(planner.find_path([10.5, 10.5, 10.5], goal_point=[10.5, 10.5, 10.5]), [(10.5, 10.5, 10.5)])
+            self.assertEqual(len(planner.node_keys), node_count)
+            if backend == 'networkx':
+                self.assertEqual(planner.graph.number_of_nodes(), node_count)
+
+    def test_incremental_mode_with_live_positions(self):
+        """Attached starts in incremental mode give the optimal cost over the graph plus connectors."""
+        np.random.seed(5)
+        planner = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=300, k_neighbors=6, incremental=True)
+        for start in np.random.rand(4, 3) * 100:
+            path = planner.find_path(start)
+            node, indices, weights = planner.attach_point(start)
+            graph = planner.graph.copy()
+            graph.add_weighted_edges_from((node, planner.node_keys[i], w) for i, w in zip(indices, weights))
+            cost = sum(graph[u][v]['weight'] for u, v in zip(path, path[1:]))
+            self.assertAlmostEqual(cost, nx.dijkstra_path_length(graph, node, (100.0, 100.0, 100.0)))
+
+    def test_csr_backend_matches_networkx(self):
+        """The CSR backend returns the same paths as the networkx backend, including attached positions."""
+        planners = []
+        for backend in ('networkx', 'csr'):
+            np.random.seed(21)
+            planners.append(flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                                      num_waypoints=500, k_neighbors=6, backend=backend))
+        reference, compact = planners
+        for start in [np.zeros(3), np.array([10.5, 80.2, 33.3]), np.array([70.0, 5.0, 90.0])]:
+            self.assertEqual(reference.find_path(start), compact.find_path(start))
+        blocked = np.arange(0, len(reference.edge_weights), 5)
+        reference.update_edge_weights(blocked, np.inf)
+        compact.update_edge_weights(blocked, np.inf)
+        self.assertEqual(reference.find_path([0, 0, 0]), compact.find_path([0, 0, 0]))
+
+    def test_batched_weather_callback(self):
+        """A batched callback gives the same weights as the per-edge callback in a single call."""
+        calls = []
+        def headwind(starts, ends):
+            calls.append(len(starts))
+            return 1.0 + 0.001 * np.abs(ends[:, 0] - starts[:, 0])
+        np.random.seed(2)
+        batched = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=200, k_neighbors=5,
+                                            weather_impact_callback=headwind, batched_weather=True)
+        np.random.seed(2)
+        scalar = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=200, k_neighbors=5,
+                                           weather_impact_callback=lambda a, b: headwind(a[None], b[None])[0])
+        self.assertEqual(calls[0], len(batched.edge_weights))
+        np.testing.assert_allclose(batched.edge_weights, scalar.edge_weights)
+
+    def test_reweight_edges_in_place(self):
+        """Weather updates change edge weights without rebuilding the graph and keep blocked edges blocked."""
+        for backend in ('networkx', 'csr'):
+            planner = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=50, k_neighbors=4, backend=backend)
+            graph = planner.graph
+            planner.update_edge_weights([0], np.inf)
+            changed = planner.reweight_edges(batched_weather_impact_adjustment, batched_weather=True)
+            self.assertIs(planner.graph, graph)
+            self.assertEqual(len(changed), len(planner.edge_weights) - 1)
+            self.assertTrue(np.isinf(planner.edge_weights[0]))
+            np.testing.assert_allclose(planner.edge_weights[1:], planner.edge_lengths[1:] * 1.1)
+        u, v = planner.node_keys[planner.edge_sources[1]], planner.node_keys[planner.edge_targets[1]]
+        self.assertAlmostEqual(planner.graph.forward[planner.node_index[u], planner.node_index[v]], planner.edge_weights[1])
+
+    def test_batched_weather_callback_shape_check(self):
+        """A batched callback returning the wrong shape is reported as a flight plan error."""
+        with self.assertRaises(FlightPlanError):
+            flight_plan.FlightPlanner(destination=[100, 100, 100], weather_impact_callback=lambda s, e: 1.1,
+                                      batched_weather=True)
+
+    def test_seeded_waypoints_are_reproducible(self):
+        """The same seed generates the same roadmap."""
+        first = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=20, seed=9)
+        second = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=20, seed=9)
+        np.testing.assert_array_equal(first.waypoints, second.waypoints)
+
+    def test_saved_roadmap_round_trip(self):
+        """A saved roadmap loads memory-mapped, plans identically and keeps local updates private."""
+        zones = np.array([[50, 50, 50]])
+        with tempfile.TemporaryDirectory() as directory:
+            original = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=zones, num_waypoints=300,
+                                                 k_neighbors=6, backend='csr', seed=4)
+            original.save_roadmap(directory)
+            for backend in ('csr', 'networkx'):
+                loaded = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=zones,
+                                                   backend=backend, roadmap_path=directory)
+                self.assertIsInstance(loaded.waypoints, np.memmap)
+                self.assertEqual(loaded.seed, 4)
+                for start in ([0, 0, 0], [30.5, 60.1, 10.2]):
+                    self.assertEqual(loaded.find_path(start), original.find_path(start))
+            loaded.update_edge_weights([0], np.inf)
+            reloaded = flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=zones, roadmap_path=directory)
+            self.assertEqual(reloaded.edge_weights[0], original.edge_weights[0])
+
+    def test_stale_roadmap_is_rejected(self):
+        """Loading a roadmap saved for other no-fly zones or another destination raises FlightPlanError."""
+        with tempfile.TemporaryDirectory() as directory:
+            flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                      num_waypoints=30, seed=1).save_roadmap(directory)
+            with self.assertRaises(FlightPlanError):
+                flight_plan.FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[40, 40, 40]]),
+                                          roadmap_path=directory)
+            with self.assertRaises(FlightPlanError):
+                flight_plan.FlightPlanner(destination=[90, 90, 90], no_fly_zones=np.array([[50, 50, 50]]),
+                                          roadmap_path=directory)
+
+    def test_roadmap_saves_replace_the_whole_roadmap(self):
+        """A save that fails part-way leaves the previous roadmap loadable; a completed one replaces every array."""
+        with tempfile.TemporaryDirectory() as directory:
+            first = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=40, k_neighbors=4, seed=1)
+            first.save_roadmap(directory)
+            second = flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=60, k_neighbors=4, seed=2)
+            with patch('roadmap.np.save', side_effect=[None, OSError("disk full")]):
+                with self.assertRaises(OSError):
+                    second.save_roadmap(directory)
+            loaded = flight_plan.FlightPlanner(destination=[100, 100, 100], roadmap_path=directory)
+            np.testing.assert_array_equal(loaded.waypoints, first.waypoints)
+            np.testing.assert_array_equal(loaded.edge_targets, first.edge_targets)
+            second.save_roadmap(directory)
+            loaded = flight_plan.FlightPlanner(destination=[100, 100, 100], roadmap_path=directory)
+            np.testing.assert_array_equal(loaded.waypoints, second.waypoints)
+            np.testing.assert_array_equal(loaded.edge_targets, second.edge_targets)
+            self.assertEqual(len([entry for entry in os.listdir(directory) if entry.startswith('generation-')]), 1)
+
+    def test_roadmap_build_parameters_must_match(self):
+        """Unset build parameters are taken from the roadmap; conflicting ones raise FlightPlanError."""
+        with tempfile.TemporaryDirectory() as directory:
+            flight_plan.FlightPlanner(destination=[100, 100, 100], num_waypoints=30, k_neighbors=4,
+                                      seed=1).save_roadmap(directory)
+            loaded = flight_plan.FlightPlanner(destination=[100, 100, 100], k_neighbors=4, roadmap_path=directory)
+            self.assertEqual((loaded.seed, loaded.k_neighbors, loaded.connection_radius), (1, 4, None))
+            for parameters in ({'k_neighbors': 8}, {'connection_radius': 20.0}, {'seed': 2}):
+                with self.assertRaises(FlightPlanError):
+                    flight_plan.FlightPlanner(destination=[100, 100, 100], roadmap_path=directory, **parameters)
+
+if __name__ == '__main__':
+    unittest.main()
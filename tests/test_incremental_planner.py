@@ -0,0 +1,62 @@
+import unittest
+import math
+import networkx as nx
+import numpy as np
+from incremental_planner import DStarLite
+from exceptions import PathfindingError
+
+def euclidean(a, b):
+    return math.dist(a, b)
+
+class TestDStarLite(unittest.TestCase):
+    def setUp(self):
+        # Small grid roadmap with unit edges in both directions
+        self.graph = nx.DiGraph()
+        for x in range(6):
+            for y in range(6):
+                for dx, dy in ((1, 0), (0, 1)):
+                    if x + dx < 6 and y + dy < 6:
+                        self.graph.add_edge((x, y, 0), (x + dx, y + dy, 0), weight=1.0)
+                        self.graph.add_edge((x + dx, y + dy, 0), (x, y, 0), weight=1.0)
+        self.goal = (5, 5, 0)
+        self.planner = DStarLite(self.graph, self.goal, heuristic=euclidean)
+
+    def path_cost(self, path):
+        return sum(self.graph[u][v]['weight'] for u, v in zip(path, path[1:]))
+
+    def test_initial_plan_is_optimal(self):
+        """The first plan matches a from-scratch shortest path."""
+        path = self.planner.plan((0, 0, 0))
+        self.assertEqual(path[0], (0, 0, 0))
+        self.assertEqual(path[-1], self.goal)
+        self.assertAlmostEqual(self.path_cost(path), nx.dijkstra_path_length(self.graph, (0, 0, 0), self.goal))
+
+    def test_repair_after_cost_changes(self):
+        """After edges on the path get more expensive the repaired path is still optimal."""
+        path = self.planner.plan((0, 0, 0))
+        changed = list(zip(path[1:4], path[2:5]))
+        for u, v in changed:
+            self.graph[u][v]['weight'] = 10.0
+        self.planner.update_edges(changed)
+        expansions = self.planner.expansions
+        repaired = self.planner.plan((0, 0, 0))
+        self.assertAlmostEqual(self.path_cost(repaired), nx.dijkstra_path_length(self.graph, (0, 0, 0), self.goal))
+        self.assertLess(self.planner.expansions - expansions, self.graph.number_of_nodes())
+
+    def test_moving_start_and_removed_edges(self):
+        """The planner follows a moving start and routes around removed edges."""
+        path = self.planner.plan((0, 0, 0))
+        self.graph.remove_edge(path[2], path[3])
+        self.planner.update_edges([(path[2], path[3])])
+        repaired = self.planner.plan(path[1])
+        self.assertEqual(repaired[0], path[1])
+        self.assertAlmostEqual(self.path_cost(repaired), nx.dijkstra_path_length(self.graph, path[1], self.goal))
+
+    def test_unreachable_goal(self):
+        """A disconnected start raises a PathfindingError."""
+        self.graph.add_node((9, 9, 9))
+        with self.assertRaises(PathfindingError):
+            self.planner.plan((9, 9, 9))
+
+if __name__ == '__main__':
+    unittest.main()
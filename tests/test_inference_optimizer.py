@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import torch
+from inference_optimizer import OptimizedModel
+from decision_maker import DecisionMaker
+from decision_net import DecisionNet
+from obstacle import ObstacleDetector
+from exceptions import ObstacleDetectionError, NavigationError
+
+def small_camera_model():
+    return torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3, stride=4), torch.nn.BatchNorm2d(8), torch.nn.ReLU(),
+                               torch.nn.AdaptiveAvgPool2d(1), torch.nn.Flatten(), torch.nn.Linear(8, 4)).eval()
+
+def relative_error(actual, expected):
+    return ((actual - expected).abs().max() / expected.abs().max()).item()
+
+class TestOptimizedModel(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = DecisionNet().eval()
+        self.inputs = (torch.randn(4, 3, 64, 64), torch.randn(4, 10))
+        with torch.no_grad():
+            self.expected = self.model(*self.inputs)
+
+    def test_traced_channels_last_matches_eager(self):
+        """The float fast path gives the eager outputs, including for a batch size it was not traced with."""
+        example = (torch.zeros(1, 3, 64, 64), torch.zeros(1, 10))
+        optimized = OptimizedModel(self.model, example)
+        torch.testing.assert_close(optimized(*self.inputs), self.expected, atol=1e-4, rtol=1e-4)
+        untraced = OptimizedModel(self.model, example, trace=False, channels_last=False)
+        torch.testing.assert_close(untraced(*self.inputs), self.expected)
+
+    def test_original_model_is_untouched(self):
+        state = {name: tensor.clone() for name, tensor in self.model.state_dict().items()}
+        OptimizedModel(self.model, self.inputs, quantize='dynamic')
+        self.assertTrue(self.model.conv1.weight.is_contiguous())
+        for name, tensor in self.model.state_dict().items():
+            torch.testing.assert_close(tensor, state[name])
+
+    def test_dynamic_quantization_parity(self):
+        optimized = OptimizedModel(self.model, self.inputs, quantize='dynamic')
+        self.assertLess(relative_error(optimized(*self.inputs), self.expected), 0.05)
+        self.assertTrue((optimized(*self.inputs).argmax(1) == self.expected.argmax(1)).float().mean() >= 0.75)
+
+    def test_static_quantization_parity(self):
+        """Static int8 quantization calibrated on sample inputs stays close to the float model."""
+        model = small_camera_model()
+        calibration = [(torch.randn(2, 3, 224, 224),) for _ in range(8)]
+        optimized = OptimizedModel(model, calibration[0], quantize='static', calibration_inputs=calibration)
+        inputs = torch.randn(3, 3, 224, 224)
+        with torch.no_grad():
+            expected = model(inputs)
+        self.assertLess(relative_error(optimized(inputs), expected), 0.1)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            OptimizedModel(self.model, self.inputs, quantize='int4')
+
+    def test_thread_count_is_set_once(self):
+        """The thread count is set when the model is built, not toggled on every call."""
+        class ThreadProbe(torch.nn.Module):
+            def forward(self, x):
+                self.seen = torch.get_num_threads()
+                return x
+        process_threads = torch.get_num_threads()
+        self.addCleanup(torch.set_num_threads, process_threads)
+        optimized = OptimizedModel(ThreadProbe(), (torch.zeros(1, 4),), trace=False, channels_last=False,
+                                   threads=process_threads + 1)
+        self.assertEqual(torch.get_num_threads(), process_threads + 1)
+        with patch('torch.set_num_threads') as set_num_threads:
+            optimized(torch.zeros(1, 4))
+        set_num_threads.assert_not_called()
+        self.assertEqual(optimized.model.seen, process_threads + 1)
+        with self.assertRaises(ValueError):
+            OptimizedModel(ThreadProbe(), (torch.zeros(1, 4),), quantize='int4', threads=1)
+        self.assertEqual(torch.get_num_threads(), process_threads + 1)  # A failed configuration changes nothing
+
+    def test_unsupported_configurations_raise_component_errors(self):
+        with patch('obstacle.ObstacleDetector.load_model', side_effect=lambda path, kind: small_camera_model()):
+            detector = ObstacleDetector('camera.pth', 'lidar.pth')
+        with self.assertRaises(ObstacleDetectionError):
+            detector.optimize_inference(quantize='int4')
+        with self.assertRaises(NavigationError):
+            DecisionMaker().optimize_inference(quantize='int4')
+
+    def test_detector_and_decision_maker_modes(self):
+        """Both components switch to the optimized model and keep their outputs."""
+        with patch('obstacle.ObstacleDetector.load_model', side_effect=lambda path, kind: small_camera_model()):
+            detector = ObstacleDetector('camera.pth', 'lidar.pth')
+        frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        expected = detector.detect_obstacles_frame(frame).clone()
+        detector.optimize_inference(threads=torch.get_num_threads())
+        self.assertIsInstance(detector.camera_model, OptimizedModel)
+        torch.testing.assert_close(detector.detect_obstacles_frame(frame), expected, atol=1e-4, rtol=1e-4)
+
+        decision_maker = DecisionMaker()
+        with torch.no_grad():
+            expected = decision_maker.model(*self.inputs)
+        decision_maker.optimize_inference(quantize=None)
+        torch.testing.assert_close(decision_maker.model(*self.inputs), expected, atol=1e-3, rtol=1e-4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import torch
+from inference_server import InferenceServer
+from obstacle import ObstacleDetector
+from exceptions import ObstacleDetectionError
+
+class RecordingModel(torch.nn.Module):
+    """Sums each input and remembers the batch sizes it was called with."""
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.batch_sizes = []
+        self.delay = delay
+
+    def forward(self, batch):
+        self.batch_sizes.append(batch.shape[0])
+        time.sleep(self.delay)
+        return batch.sum(dim=(1, 2, 3)).unsqueeze(1)
+
+def identity_preprocess(frame):
+    return torch.as_tensor(frame, dtype=torch.float32)
+
+class TestInferenceServer(unittest.TestCase):
+    def test_results_match_per_frame_inputs(self):
+        """Every future resolves to the output of its own frame."""
+        model = RecordingModel()
+        frames = [np.full((1, 2, 2), i, dtype=np.float32) for i in range(10)]
+        with InferenceServer(model, max_batch_size=4, max_delay=0.05, preprocess=identity_preprocess) as server:
+            futures = [server.submit(frame) for frame in frames]
+            results = [future.result(timeout=5) for future in futures]
+        for i, result in enumerate(results):
+            self.assertEqual(tuple(result.shape), (1, 1))
+            self.assertAlmostEqual(result.item(), 4.0 * i)
+        self.assertEqual(sum(model.batch_sizes), 10)
+        self.assertLessEqual(max(model.batch_sizes), 4)
+
+    def test_concurrent_submitters_are_batched(self):
+        """Frames submitted from several threads while the model is busy share forward passes."""
+        model = RecordingModel(delay=0.02)
+        results = {}
+        with InferenceServer(model, max_batch_size=8, max_delay=0.05, preprocess=identity_preprocess) as server:
+            def drone(index):
+                results[index] = server.submit(np.full((1, 1, 1), index, dtype=np.float32)).result(timeout=5)
+            threads = [threading.Thread(target=drone, args=(i,)) for i in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = server.stats()
+        self.assertEqual({i: results[i].item() for i in range(16)}, {i: float(i) for i in range(16)})
+        self.assertEqual(stats['frames'], 16)
+        self.assertLess(stats['batches'], 16)
+        self.assertGreater(stats['mean_batch_size'], 1.0)
+
+    def test_deadline_bounds_waiting(self):
+        """A lone frame is run once the deadline passes instead of waiting for a full batch."""
+        model = RecordingModel()
+        with InferenceServer(model, max_batch_size=32, max_delay=0.02, preprocess=identity_preprocess) as server:
+            start = time.perf_counter()
+            server.submit(np.ones((1, 1, 1), dtype=np.float32)).result(timeout=5)
+            elapsed = time.perf_counter() - start
+        self.assertGreaterEqual(elapsed, 0.015)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(model.batch_sizes, [1])
+
+    def test_errors_reach_every_future_in_the_batch(self):
+        """A failing forward pass fails the whole batch without stopping the server."""
+        model = MagicMock(side_effect=RuntimeError("model failure"))
+        with InferenceServer(model, max_batch_size=4, max_delay=0.05, preprocess=identity_preprocess) as server:
+            futures = [server.submit(np.ones((1, 1, 1), dtype=np.float32)) for _ in range(3)]
+            for future in futures:
+                with self.assertRaises(ObstacleDetectionError):
+                    future.result(timeout=5)
+            server.model = RecordingModel()
+            self.assertEqual(server.submit(np.ones((1, 1, 1), dtype=np.float32)).result(timeout=5).item(), 1.0)
+
+    def test_submit_requires_running_server(self):
+        server = InferenceServer(RecordingModel(), preprocess=identity_preprocess)
+        with self.assertRaises(ObstacleDetectionError):
+            server.submit(np.ones((1, 1, 1), dtype=np.float32))
+        with self.assertRaises(ObstacleDetectionError):
+            InferenceServer(RecordingModel(), max_batch_size=0)
+
+    def test_detector_server_uses_camera_model(self):
+        """ObstacleDetector.create_inference_server batches raw BGR frames through the camera model."""
+        with patch('obstacle.ObstacleDetector.load_model', return_value=MagicMock()):
+            detector = ObstacleDetector('camera.pth', 'lidar.pth')
+        detector.camera_model = RecordingModel()
+        frames = np.random.default_rng(0).integers(0, 256, (3, 224, 224, 3), dtype=np.uint8)
+        with detector.create_inference_server(max_batch_size=4, max_delay=0.05) as server:
+            results = [future.result(timeout=5) for future in [server.submit(frame) for frame in frames]]
+        for frame, result in zip(frames, results):
+            expected = detector.preprocess_frame(frame).sum().item()
+            self.assertAlmostEqual(result.item(), expected, places=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+from lidar_processing import LidarObstacleExtractor
+from obstacle import ObstacleDetector
+from exceptions import ObstacleDetectionError
+
+def empty_scan(beams=360):
+    return np.full(beams, np.inf)
+
+class TestLidarObstacleExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = LidarObstacleExtractor(jump_threshold=0.5, min_points=2)
+
+    def test_single_wall_segment(self):
+        """A constant-range arc becomes one obstacle with the expected geometry."""
+        scan = empty_scan()
+        scan[80:101] = 10.0  # Beams 80..100 degrees, centred straight along +y
+        obstacles = self.extractor.extract(scan)
+        self.assertEqual(len(obstacles['distances']), 1)
+        self.assertEqual(obstacles['counts'][0], 21)
+        self.assertAlmostEqual(obstacles['distances'][0], 10.0)
+        self.assertAlmostEqual(obstacles['bearings'][0], np.pi / 2)
+        self.assertAlmostEqual(obstacles['centroids'][0, 0], 0.0)
+        self.assertAlmostEqual(obstacles['extents'][0, 0], 2 * 10.0 * np.sin(np.radians(10)))
+
+    def test_range_jumps_split_segments(self):
+        """A range discontinuity separates two objects that are adjacent in bearing."""
+        scan = empty_scan()
+        scan[10:20] = 5.0
+        scan[20:30] = 8.0
+        scan[30:40] = np.linspace(8.0, 9.0, 10)  # Smooth slope stays in the same segment
+        obstacles = self.extractor.extract(scan)
+        np.testing.assert_array_equal(obstacles['counts'], [10, 20])
+        np.testing.assert_allclose(obstacles['distances'], [5.0, 8.0])
+
+    def test_segments_wrap_around(self):
+        """An object across beam 0 is one obstacle, not two halves."""
+        scan = empty_scan()
+        scan[-5:] = 4.0
+        scan[:6] = 4.0
+        obstacles = self.extractor.extract(scan)
+        self.assertEqual(obstacles['counts'].tolist(), [11])
+        self.assertAlmostEqual(obstacles['bearings'][0], 0.0)
+
+    def test_invalid_returns_and_small_segments_are_ignored(self):
+        """Missing, out-of-range and isolated returns never form obstacles."""
+        scan = empty_scan()
+        scan[50] = 3.0                 # Single return: below min_points
+        scan[100:110] = 0.01           # Closer than min_range
+        scan[200:210] = 150.0          # Beyond max_range
+        scan[300:310] = np.nan
+        self.assertEqual(len(self.extractor.extract(scan)['distances']), 0)
+        full_ring = self.extractor.extract(np.full(360, 7.0))
+        self.assertEqual(full_ring['counts'].tolist(), [360])
+
+    def test_batch_matches_single_scans(self):
+        """The batched path gives the same obstacles as extracting every scan separately."""
+        rng = np.random.default_rng(0)
+        scans = np.repeat(rng.uniform(2, 30, (6, 36)), 10, axis=1)  # Blocky scans with many segments
+        scans[rng.random(scans.shape) < 0.05] = np.inf
+        batch = self.extractor.extract_batch(scans)
+        for drone, scan in enumerate(scans):
+            single = self.extractor.extract(scan)
+            rows = batch['drones'] == drone
+            for key in ('centroids', 'extents', 'distances', 'bearings', 'counts'):
+                np.testing.assert_allclose(batch[key][rows], single[key])
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ObstacleDetectionError):
+            self.extractor.extract_batch(np.zeros((2, 3, 4)))
+
+    def test_detector_locates_lidar_obstacles(self):
+        """ObstacleDetector uses the geometric extractor for single and batched scans."""
+        with patch('obstacle.ObstacleDetector.load_model', return_value=MagicMock()):
+            detector = ObstacleDetector('camera.pth', 'lidar.pth')
+        scan = empty_scan()
+        scan[0:10] = 6.0
+        self.assertEqual(len(detector.locate_lidar_obstacles(scan.tolist())['distances']), 1)
+        self.assertEqual(detector.locate_lidar_obstacles(np.stack([scan, scan]))['drones'].tolist(), [0, 1])
+        detector.lidar_model.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
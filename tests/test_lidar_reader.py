@@ -0,0 +1,92 @@
+import os
+import pty
+import tempfile
+import unittest
+import numpy as np
+from lidar_reader import LidarReader, PACKET_SIZE
+from exceptions import SensorError
+
+def revolutions(count, beams=360):
+    """Packets for count revolutions; beam b of revolution r reads 1 + b / 100 + r meters."""
+    starts = np.tile(np.arange(0.0, 360.0, 12.0), count)
+    ranges = np.arange(beams) / 100.0 + 1.0
+    distances = np.concatenate([ranges.reshape(-1, 12) + r for r in range(count)])
+    return LidarReader.encode_packets(starts, distances, end_angles=starts + 11.0), ranges
+
+class TestPacketParsing(unittest.TestCase):
+    def test_revolutions_are_assembled(self):
+        """Only complete revolutions are published, into the preallocated ring."""
+        data, ranges = revolutions(4)
+        reader = LidarReader('unused')
+        self.assertEqual(reader.feed(data, timestamp=12.5), 120)
+        scan, timestamp, sequence = reader.latest()
+        # The first revolution may have started mid-way and the fourth is still open: two are published
+        self.assertEqual(sequence, 2)
+        np.testing.assert_allclose(scan, ranges + 2, atol=1e-3)
+        self.assertTrue(np.shares_memory(scan, reader.scans))
+        self.assertEqual(timestamp, 12.5)
+
+    def test_split_chunks_and_noise(self):
+        """Packets split across reads, line noise and corrupted packets are all handled."""
+        data, ranges = revolutions(3)
+        corrupted = bytearray(data[:PACKET_SIZE])
+        corrupted[10] ^= 0xFF
+        stream = b'\x54\x2c\x00noise' + bytes(corrupted) + data
+        reader = LidarReader('unused')
+        for offset in range(0, len(stream), 50):
+            reader.feed(stream[offset:offset + 50])
+        self.assertEqual(reader.packets, 90)
+        self.assertEqual(reader.crc_errors, 2)  # The header-like noise and the corrupted packet
+        self.assertLess(reader.length, PACKET_SIZE)
+        np.testing.assert_allclose(reader.latest()[0], ranges + 1, atol=1e-3)
+
+    def test_missing_returns_are_infinite(self):
+        starts = np.tile(np.arange(0.0, 360.0, 12.0), 3)
+        distances = np.ones((len(starts), 12))
+        distances[:, 0] = 0
+        reader = LidarReader('unused')
+        reader.feed(LidarReader.encode_packets(starts, distances))
+        scan = reader.latest()[0]
+        self.assertTrue(np.all(np.isinf(scan[::12])))
+        self.assertTrue(np.all(scan[1::12] == 1))
+
+    def test_no_scan_yet(self):
+        with self.assertRaises(SensorError):
+            LidarReader('unused').latest()
+        with self.assertRaises(SensorError):
+            LidarReader('unused', ring_size=1)
+
+class TestStandInDevices(unittest.TestCase):
+    def test_pty_stream(self):
+        """The reader thread parses a pty in raw mode like a USB serial adapter."""
+        master, slave = pty.openpty()
+        self.addCleanup(os.close, master)
+        self.addCleanup(os.close, slave)
+        reader = LidarReader(os.ttyname(slave)).start()
+        self.addCleanup(reader.stop)
+        data, ranges = revolutions(5)
+        for offset in range(0, len(data), 1024):
+            os.write(master, data[offset:offset + 1024])
+        scan, _, sequence = reader.wait_for_scan(2, timeout=2.0)
+        self.assertEqual(sequence, 3)
+        np.testing.assert_allclose(scan, ranges + 3, atol=1e-3)
+
+    def test_recorded_file(self):
+        """A recorded byte stream can be replayed from a file; the reader finishes at its end."""
+        data, ranges = revolutions(3)
+        with tempfile.NamedTemporaryFile(suffix='.bin', delete=False) as recording:
+            recording.write(data)
+        self.addCleanup(os.remove, recording.name)
+        reader = LidarReader(recording.name).start()
+        self.addCleanup(reader.stop)
+        self.assertTrue(reader.finished.wait(2.0))
+        scan, _, sequence = reader.latest()
+        self.assertEqual(sequence, 1)
+        np.testing.assert_allclose(scan, ranges + 1, atol=1e-3)
+
+    def test_missing_port(self):
+        with self.assertRaises(SensorError):
+            LidarReader('/nonexistent/ttyUSB9').start()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import itertools
+import unittest
+import numpy as np
+from exceptions import PathfindingError
+from flight_plan import FlightPlanner
+from mission_planner import MissionPlanner
+
+class TestMissionPlanner(unittest.TestCase):
+    def setUp(self):
+        self.planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                     num_waypoints=400, k_neighbors=8, backend='csr', seed=0)
+        self.mission = MissionPlanner(self.planner)
+        self.targets = np.random.default_rng(3).random((7, 3)) * 100
+
+    def test_visits_every_target_once(self):
+        """The order is a permutation of the targets and the path starts at the start position."""
+        result = self.mission.plan_mission([0, 0, 0], self.targets)
+        self.assertEqual(sorted(result['order']), list(range(len(self.targets))))
+        self.assertEqual(result['path'][0], (0.0, 0.0, 0.0))
+        last = tuple(self.targets[result['order'][-1]].tolist())
+        self.assertEqual(result['path'][-1], last)
+        for target in self.targets:
+            self.assertIn(tuple(target.tolist()), result['path'])
+
+    def test_path_stays_clear_of_no_fly_zones(self):
+        """Every segment of the concatenated path avoids the no-fly zones."""
+        path = np.array(self.mission.plan_mission([0, 0, 0], self.targets, return_to_start=True)['path'])
+        self.assertEqual(tuple(path[-1]), (0.0, 0.0, 0.0))
+        self.assertFalse(self.planner.segments_in_no_fly_zone(path[:-1], path[1:]).any())
+
+    def test_order_is_close_to_optimal(self):
+        """On a small mission the refined tour is within a few percent of the brute-force optimum."""
+        result = self.mission.plan_mission([0, 0, 0], self.targets, return_to_start=True)
+        anchored = [self.mission.anchor(point) for point in np.vstack([[0, 0, 0], self.targets])]
+        costs, _, _ = self.mission.cost_matrix(*(np.array([a[i] for a in anchored]) for i in range(3)))
+        optimum = min(sum(costs[a, b] for a, b in zip((0,) + order, order + (0,)))
+                      for order in itertools.permutations(range(1, len(self.targets) + 1)))
+        self.assertLessEqual(result['cost'], optimum * 1.05)
+
+    def test_backends_agree(self):
+        """The networkx backend plans the same mission as the CSR backend."""
+        planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                num_waypoints=400, k_neighbors=8, seed=0)
+        expected = self.mission.plan_mission([0, 0, 0], self.targets)
+        result = MissionPlanner(planner).plan_mission([0, 0, 0], self.targets)
+        np.testing.assert_array_equal(result['order'], expected['order'])
+        self.assertAlmostEqual(result['cost'], expected['cost'])
+
+    def test_target_inside_zone_raises(self):
+        """A target that cannot be connected to the roadmap raises PathfindingError."""
+        with self.assertRaises(PathfindingError):
+            self.mission.plan_mission([0, 0, 0], np.vstack([self.targets, [[50, 50, 50]]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+import torch
+from torchvision import models
+from model_registry import ModelRegistry, LazyModel
+from decision_maker import DecisionMaker
+from decision_net import DecisionNet
+from obstacle import ObstacleDetector
+from exceptions import ObstacleDetectionError, NavigationError
+
+def small_model():
+    return torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.BatchNorm1d(8), torch.nn.Linear(8, 2))
+
+class TestModelRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        torch.manual_seed(0)
+        cls.reference = small_model().eval()
+        cls.path = os.path.join(cls.directory.name, 'small.pth')
+        torch.save(cls.reference.state_dict(), cls.path)
+        cls.resnet_path = os.path.join(cls.directory.name, 'resnet50.pth')
+        torch.save(models.resnet50(weights=None).state_dict(), cls.resnet_path)
+        cls.decision_path = os.path.join(cls.directory.name, 'decision.pth')
+        torch.save(DecisionNet().state_dict(), cls.decision_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_lazy_loading_and_sharing(self):
+        """Nothing is loaded until first use, and every handle then runs one shared module."""
+        registry = ModelRegistry()
+        first = registry.lazy(self.path, small_model)
+        second = registry.lazy(self.path, small_model)
+        self.assertFalse(first.loaded)
+        inputs = torch.randn(3, 4)
+        with torch.no_grad():
+            torch.testing.assert_close(first(inputs), self.reference(inputs))
+        self.assertTrue(second.loaded)
+        self.assertIs(first.resolve(), second.resolve())
+        self.assertFalse(first.training)  # Attributes are forwarded to the module, which is in eval mode
+
+    @unittest.skipUnless(os.path.exists('/proc/self/maps'), "Needs /proc to inspect memory mappings")
+    def test_weights_are_memory_mapped(self):
+        """The module's tensors come from a mapping of the checkpoint file rather than private copies."""
+        model = ModelRegistry().get(self.path, small_model)
+        with open('/proc/self/maps') as maps:
+            self.assertIn(os.path.realpath(self.path), maps.read())
+        self.assertFalse(any(parameter.is_meta for parameter in model.parameters()))
+
+    def test_incomplete_checkpoint(self):
+        registry = ModelRegistry()
+        with self.assertRaises(RuntimeError):
+            registry.get(self.path, lambda: torch.nn.Sequential(small_model(), torch.nn.Linear(2, 2)))
+
+    def test_detectors_share_lazy_models(self):
+        """Detectors load nothing at construction and share the camera model once it is used."""
+        registry = ModelRegistry()
+        first = ObstacleDetector(self.resnet_path, self.resnet_path, registry=registry)
+        second = ObstacleDetector(self.resnet_path, self.resnet_path, registry=registry)
+        self.assertIsInstance(first.camera_model, LazyModel)
+        self.assertFalse(registry.is_loaded(self.resnet_path, models.resnet50))
+        self.assertIs(first.camera_model.resolve(), second.lidar_model.resolve())
+        with self.assertRaises(ObstacleDetectionError):
+            ObstacleDetector('missing_camera.pth', self.resnet_path, registry=registry)
+
+    def test_decision_makers_share_model(self):
+        registry = ModelRegistry()
+        first = DecisionMaker(self.decision_path, registry=registry)
+        second = DecisionMaker(self.decision_path, registry=registry)
+        self.assertIs(first.model.resolve(), second.model.resolve())
+        with self.assertRaises(FileNotFoundError):
+            DecisionMaker('missing_decision.pth', registry=registry)
+
+    def test_unloadable_checkpoints_fail_at_construction(self):
+        """Missing or corrupt checkpoints are rejected from the header, in the callers' own error types."""
+        corrupt = os.path.join(self.directory.name, 'corrupt.pth')
+        with open(corrupt, 'wb') as f:
+            f.write(b'not a checkpoint')
+        registry = ModelRegistry()
+        with self.assertRaises(ObstacleDetectionError):
+            ObstacleDetector(corrupt, self.resnet_path, registry=registry)
+        with self.assertRaises(NavigationError):
+            DecisionMaker(corrupt, registry=registry)
+        with self.assertRaises(FileNotFoundError):
+            DecisionMaker('missing_decision.pth', registry=registry)
+
+    def test_lazy_load_failures_are_wrapped(self):
+        """A checkpoint that only fails on loading raises the caller's error type on first use."""
+        registry = ModelRegistry()
+        detector = ObstacleDetector(self.path, self.path, registry=registry)  # Not a ResNet-50 state_dict
+        with self.assertRaises(ObstacleDetectionError):
+            detector.camera_model.resolve()
+        decision_maker = DecisionMaker(self.path, registry=registry)
+        with self.assertRaises(NavigationError):
+            decision_maker.model.resolve()
+
+if __name__ == '__main__':
+    unittest.main()
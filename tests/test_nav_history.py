@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from nav_history import NavigationHistory
+from exceptions import NavigationError
+
+class TestNavigationHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = NavigationHistory(capacity=4, state_dim=2)
+
+    def fill(self, count):
+        for step in range(count):
+            self.history.append(float(step), [step, 2.0 * step], [0.1 * step, 0.0])
+
+    def test_window_is_contiguous_view(self):
+        """After wrapping around the latest samples are one chronological view into the buffer."""
+        self.fill(6)
+        timestamps, states, variances = self.history.window()
+        np.testing.assert_array_equal(timestamps, [2, 3, 4, 5])
+        np.testing.assert_array_equal(states[:, 0], [2, 3, 4, 5])
+        self.assertTrue(np.shares_memory(states, self.history.states))
+        np.testing.assert_array_equal(self.history.window(2)[0], [4, 5])
+        np.testing.assert_array_equal(self.history.since(3.5)[0], [4, 5])
+        self.assertEqual(self.history.latest()[0], 5.0)
+
+    def test_interpolation(self):
+        """States are interpolated at arbitrary times and NaN outside the recorded span."""
+        self.fill(6)
+        states, variances = self.history.interpolate([2.0, 3.25, 5.0, 1.0, 6.5])
+        np.testing.assert_allclose(states[:3], [[2, 4], [3.25, 6.5], [5, 10]])
+        np.testing.assert_allclose(variances[1], [0.325, 0.0])
+        self.assertTrue(np.isnan(states[3:]).all())
+
+    def test_single_sample_and_errors(self):
+        """A single sample answers its own timestamp; empty queries and decreasing timestamps raise."""
+        with self.assertRaises(NavigationError):
+            self.history.interpolate(0.0)
+        self.history.append(1.0, [1.0, 1.0])
+        np.testing.assert_array_equal(self.history.interpolate(1.0)[0], [[1.0, 1.0]])
+        with self.assertRaises(NavigationError):
+            self.history.append(0.5, [0.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
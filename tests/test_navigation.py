@@ -1,7 +1,7 @@
 import unittest
 import numpy as np
 from navigation import NavigationSystem
-from exceptions import SensorError, CriticalNavigationError
+from exceptions import SensorError, CriticalNavigationError, NavigationError
 
 class TestNavigationSystem(unittest.TestCase):
     def setUp(self):
@@ -25,5 +25,43 @@ class TestNavigationSystem(unittest.TestCase):
         with self.assertRaises(SensorError):
             self.nav_system.update_navigation_state(sensor_data)
 
+    def test_fast_mode_matches_full_filter(self):
+        """After convergence the steady-state gain path tracks the full Kalman update."""
+        fast_system = NavigationSystem(fast_mode=True)
+        readings = np.random.default_rng(0).normal(size=(200, 6))
+        for reading in readings:
+            self.nav_system.update_navigation_state(reading)
+            fast_system.update_navigation_state(reading)
+        self.assertIsNotNone(fast_system.steady_state, "Covariance should have converged.")
+        np.testing.assert_allclose(fast_system.get_position(), self.nav_system.get_position(), atol=1e-8)
+
+    def test_fast_mode_falls_back_on_model_change(self):
+        """Changing the noise settings or measurement model drops the steady-state gain."""
+        fast_system = NavigationSystem(fast_mode=True)
+        for reading in np.random.default_rng(1).normal(size=(100, 6)):
+            fast_system.update_navigation_state(reading)
+        self.assertIsNotNone(fast_system.steady_state)
+        fast_system.kalman_filter.R *= 10
+        fast_system.update_navigation_state(np.zeros(6))
+        self.assertIsNone(fast_system.steady_state)
+        for reading in np.random.default_rng(2).normal(size=(100, 6)):
+            fast_system.update_navigation_state(reading)
+        self.assertIsNotNone(fast_system.steady_state, "Gain should be recomputed for the new noise settings.")
+        fast_system.kalman_filter.H = np.eye(6) * 2
+        fast_system.update_navigation_state(np.zeros(6))
+        self.assertIsNone(fast_system.steady_state)
+
+    def test_history_records_estimates(self):
+        """With a history the estimates are recorded and can be queried at past timestamps."""
+        nav_system = NavigationSystem(fast_mode=True, history_capacity=50)
+        for step in range(60):
+            nav_system.update_navigation_state(np.array([step, 0, 10, 1, 0, 0], dtype=float), timestamp=step * 0.1)
+        self.assertEqual(len(nav_system.history), 50)
+        positions, velocities = nav_system.pose_at([5.55])
+        timestamps, states, _ = nav_system.history.window()
+        np.testing.assert_allclose(positions[0], (states[45, :3] + states[46, :3]) / 2)
+        with self.assertRaises(NavigationError):
+            self.nav_system.pose_at(1.0)
+
 if __name__ == '__main__':
     unittest.main()
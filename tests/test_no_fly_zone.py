@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from no_fly_zone import NoFlyZoneMap
+from exceptions import FlightPlanError
+
+class TestNoFlyZoneMap(unittest.TestCase):
+    def setUp(self):
+        self.spheres = NoFlyZoneMap(np.array([[50, 50, 50], [10, 90, 20]]), radii=2.0, buffer=5.0)
+        self.cylinders = NoFlyZoneMap(np.array([[50, 50, 0]]), radii=10.0, buffer=5.0, shape='cylinder', heights=40)
+
+    def test_point_queries(self):
+        """Points inside the buffered radius are reported, points outside are not."""
+        inside = self.spheres.contains_points([[50, 50, 56.9], [10, 90, 20], [0, 0, 0]])
+        np.testing.assert_array_equal(inside, [True, True, False])
+
+    def test_segment_passing_through_sphere(self):
+        """A segment whose endpoints and midpoint are clear is still blocked if it crosses a zone."""
+        starts = np.array([[0, 0, 0], [0, 0, 0], [45, 40, 50]])
+        ends = np.array([[100, 100, 100], [100, 0, 0], [45, 60, 50]])
+        np.testing.assert_array_equal(self.spheres.segments_blocked(starts, ends), [True, False, True])
+
+    def test_segment_against_cylinder_height(self):
+        """Cylinders block segments crossing their footprint only within the buffered height range."""
+        starts = np.array([[0, 50, 20], [0, 50, 60], [0, 50, 44]])
+        ends = np.array([[100, 50, 20], [100, 50, 60], [100, 50, 44]])
+        np.testing.assert_array_equal(self.cylinders.segments_blocked(starts, ends), [True, False, True])
+
+    def test_matches_brute_force(self):
+        """KDTree pruning must not change the result of the exact segment test."""
+        rng = np.random.default_rng(3)
+        centers = rng.random((40, 3)) * 100
+        zones = NoFlyZoneMap(centers, radii=rng.random(40) * 3, chunk_size=500)
+        starts = rng.random((2000, 3)) * 100
+        ends = starts + rng.normal(size=(2000, 3)) * 15
+        direction = ends - starts
+        offset = centers[None] - starts[:, None]
+        t = np.clip((offset * direction[:, None]).sum(-1) / (direction * direction).sum(-1)[:, None], 0, 1)
+        gap = offset - direction[:, None] * t[..., None]
+        expected = ((gap ** 2).sum(-1) < zones.reach[None] ** 2).any(axis=1)
+        np.testing.assert_array_equal(zones.segments_blocked(starts, ends), expected)
+
+    def test_add_zones_and_invalid_shape(self):
+        """Zones can be added after construction; unknown shapes are rejected."""
+        self.spheres.add_zones([[0, 0, 0]])
+        self.assertTrue(self.spheres.contains_points([[1, 1, 1]])[0])
+        with self.assertRaises(FlightPlanError):
+            NoFlyZoneMap([[0, 0, 0]], shape='cube')
+
+    def test_add_zones_with_heights(self):
+        """Heights given to add_zones are kept, both on an empty map and on one with unbounded cylinders."""
+        empty = NoFlyZoneMap(np.zeros((0, 3)), radii=10.0, buffer=0.0, shape='cylinder')
+        empty.add_zones([[0, 0, 0]], radii=10.0, heights=20)
+        np.testing.assert_array_equal(empty.contains_points([[0, 0, 10], [0, 0, 30]]), [True, False])
+        unbounded = NoFlyZoneMap([[50, 50, 0]], radii=10.0, buffer=0.0, shape='cylinder')
+        unbounded.add_zones([[0, 0, 0]], radii=10.0, heights=20)
+        np.testing.assert_array_equal(unbounded.heights, [np.inf, 20])
+        # The existing zone stays unbounded in both directions, the new one ends at its height
+        np.testing.assert_array_equal(unbounded.contains_points([[50, 50, -100], [50, 50, 500], [0, 0, 30]]),
+                                      [True, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import numpy as np
+from PIL import Image
 from obstacle import ObstacleDetector
+from exceptions import ObstacleDetectionError
 
 class TestObstacleDetector(unittest.TestCase):
     def setUp(self):
@@ -20,5 +23,32 @@ class TestObstacleDetector(unittest.TestCase):
         lidar_obstacles = self.obstacle_detector.detect_obstacles_lidar([0.1, 0.2, 0.3])  # Example LiDAR data array
         self.assertEqual(lidar_obstacles, "Detected objects")
 
+    def test_frame_preprocessing_matches_transform(self):
+        """The fused frame path gives the same tensor as the PIL transform for a model-sized RGB frame."""
+        frame = np.random.default_rng(0).integers(0, 256, (224, 224, 3), dtype=np.uint8)
+        expected = self.obstacle_detector.transform(Image.fromarray(frame)).unsqueeze(0)
+        tensor = self.obstacle_detector.preprocess_frame(frame[:, :, ::-1])  # OpenCV delivers BGR
+        np.testing.assert_allclose(tensor.numpy(), expected.numpy(), atol=1e-5)
+        self.assertTrue(np.shares_memory(tensor.numpy(), self.obstacle_detector.preprocess_frame.input_buffer))
+
+    def test_frame_preprocessing_resizes(self):
+        """Large frames are resized into the model input size close to the PIL transform."""
+        frame = np.random.default_rng(1).integers(0, 256, (30, 40, 3), dtype=np.uint8)
+        frame = np.kron(frame, np.ones((16, 16, 1), dtype=np.uint8))  # 480x640 made of flat blocks
+        expected = self.obstacle_detector.transform(Image.fromarray(frame[:, :, ::-1])).unsqueeze(0)
+        tensor = self.obstacle_detector.preprocess_frame(frame)
+        self.assertEqual(tuple(tensor.shape), (1, 3, 224, 224))
+        self.assertLess(np.abs(tensor.numpy() - expected.numpy()).mean(), 0.05)
+
+    def test_camera_accepts_frames_and_pil_images(self):
+        """ndarray frames and PIL images both reach the model through the frame path."""
+        self.obstacle_detector.camera_model = MagicMock(side_effect=lambda tensor: tensor.clone())
+        frame = np.random.default_rng(2).integers(0, 256, (224, 224, 3), dtype=np.uint8)
+        from_frame = self.obstacle_detector.detect_obstacles_camera(frame[:, :, ::-1].copy())
+        from_image = self.obstacle_detector.detect_obstacles_camera(Image.fromarray(frame))
+        np.testing.assert_allclose(from_frame.numpy(), from_image.numpy())
+        with self.assertRaises(ObstacleDetectionError):
+            self.obstacle_detector.detect_obstacles_frame(np.zeros((10, 10), dtype=np.uint8))
+
 if __name__ == '__main__':
     unittest.main()
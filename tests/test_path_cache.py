@@ -0,0 +1,36 @@
+import unittest
+from path_cache import PathCache
+
+class TestPathCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = PathCache(maxsize=2)
+
+    def test_hits_and_misses(self):
+        """Lookups are counted as hits or misses."""
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', [(0, 0, 0), (1, 1, 1)])
+        self.assertEqual(self.cache.get('a'), ((0, 0, 0), (1, 1, 1)))
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.5)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when the cache is full."""
+        self.cache.put('a', [1])
+        self.cache.put('b', [2])
+        self.cache.get('a')
+        self.cache.put('c', [3])
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_clear(self):
+        """Clearing drops entries but keeps the counters."""
+        self.cache.put('a', [1])
+        self.cache.get('a')
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from perception_gate import PerceptionGate
+
+class TestPerceptionGate(unittest.TestCase):
+    def setUp(self):
+        self.detector = MagicMock()
+        self.detector.detect_obstacles_camera.side_effect = lambda image: {'centroids': np.array([[10.0, 2.0, 0.0]])}
+        self.navigation = MagicMock()
+        self.position = np.zeros(3)
+        self.navigation.get_position.side_effect = lambda: self.position
+        self.gate = PerceptionGate(self.detector, navigation=self.navigation, threshold=3.0, max_staleness=0.5,
+                                   max_displacement=2.0)
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+    def test_static_scene_reuses_detections(self):
+        """Nearly identical frames reuse the last detections, shifted against the drone's motion."""
+        self.gate.detect(self.frame, timestamp=0.0)
+        noisy = np.clip(self.frame.astype(int) + 1, 0, 255).astype(np.uint8)
+        self.position = np.array([0.5, 0.0, 0.0])
+        detections = self.gate.detect(noisy, timestamp=0.1)
+        self.assertEqual(self.detector.detect_obstacles_camera.call_count, 1)
+        np.testing.assert_allclose(detections['centroids'], [[9.5, 2.0, 0.0]])
+        stats = self.gate.stats()
+        self.assertEqual((stats['frames'], stats['inferred'], stats['reused']), (2, 1, 1))
+        self.assertEqual(stats['skip_ratio'], 0.5)
+
+    def test_scene_change_runs_model(self):
+        self.gate.detect(self.frame, timestamp=0.0)
+        self.gate.detect(255 - self.frame, timestamp=0.1)
+        self.assertEqual(self.detector.detect_obstacles_camera.call_count, 2)
+        self.assertGreater(self.gate.last_score, 3.0)
+
+    def test_staleness_and_displacement_bounds(self):
+        """Unchanged frames still run the model once detections are too old or the drone moved too far."""
+        self.gate.detect(self.frame, timestamp=0.0)
+        self.gate.detect(self.frame, timestamp=0.4)
+        self.gate.detect(self.frame, timestamp=0.6)  # 0.6 s after the last model run
+        self.assertEqual(self.detector.detect_obstacles_camera.call_count, 2)
+        self.position = np.array([0.0, 3.0, 0.0])
+        self.gate.detect(self.frame, timestamp=0.7)
+        self.assertEqual(self.detector.detect_obstacles_camera.call_count, 3)
+
+    def test_reference_is_last_inferred_frame(self):
+        """Slow drift accumulates against the last inferred frame instead of being hidden frame to frame."""
+        gate = PerceptionGate(self.detector, threshold=3.0, max_staleness=10.0)
+        for step in range(6):
+            gate.detect(np.clip(self.frame.astype(int) + 2 * step, 0, 255).astype(np.uint8), timestamp=0.1 * step)
+        # Consecutive frames differ by 2 gray levels, but every second frame is 4 away from the reference
+        self.assertEqual(self.detector.detect_obstacles_camera.call_count, 3)
+
+    def test_paths_always_run_model(self):
+        self.gate.detect('frame.jpg', timestamp=0.0)
+        self.gate.detect('frame.jpg', timestamp=0.1)
+        self.assertEqual(self.detector.detect_obstacles_camera.call_count, 2)
+        self.assertEqual(self.gate.stats()['skip_ratio'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import itertools
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+import torch
+from pipeline import LatestValueQueue, Pipeline, PipelineClosed
+
+class TestLatestValueQueue(unittest.TestCase):
+    def test_drop_oldest(self):
+        """A full queue keeps the newest items and counts what it dropped."""
+        values = LatestValueQueue(maxsize=2)
+        self.assertEqual([values.put(i) for i in range(5)], [False, False, True, True, True])
+        self.assertEqual([values.get(), values.get()], [3, 4])
+        stats = values.stats()
+        self.assertEqual((stats['depth'], stats['max_depth'], stats['dropped']), (0, 2, 3))
+
+    def test_close_wakes_consumers(self):
+        values = LatestValueQueue()
+        with self.assertRaises(TimeoutError):
+            values.get(timeout=0.01)
+        errors = []
+        def consume():
+            try:
+                values.get()
+            except PipelineClosed as e:
+                errors.append(e)
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        values.close()
+        consumer.join(timeout=2)
+        self.assertEqual(len(errors), 1)
+
+class TestPipeline(unittest.TestCase):
+    def test_stages_overlap(self):
+        """Stages run concurrently, so throughput follows the slowest stage rather than the sum."""
+        counter = itertools.count()
+        results = []
+        def slow(delay):
+            def stage(value):
+                time.sleep(delay)
+                return value
+            return stage
+        pipeline = Pipeline(queue_size=1)
+        pipeline.add_stage('source', lambda: (time.sleep(0.02), next(counter))[1])
+        pipeline.add_stage('first', slow(0.02)).add_stage('second', slow(0.02))
+        pipeline.add_stage('sink', results.append)
+        pipeline.start()
+        time.sleep(0.6)
+        pipeline.stop()
+        # Run back to back, each item would take 60 ms; pipelined, one finishes about every 20 ms
+        self.assertGreater(len(results), 15)
+        self.assertEqual(results, sorted(results))
+        stats = pipeline.stats()
+        self.assertEqual(set(stats['stages']), {'source', 'first', 'second', 'sink'})
+        self.assertIsNone(stats['stages']['source']['queue'])
+        self.assertGreater(stats['latency_p50'], 0.035)  # At least the two 20 ms stages after capture
+        self.assertLess(stats['latency_p50'], 0.5)
+
+    def test_slow_stage_gets_latest_item(self):
+        """A slow stage skips stale items instead of building a backlog."""
+        counter = itertools.count()
+        seen = []
+        pipeline = Pipeline(queue_size=1, source_period=0.005)
+        pipeline.add_stage('source', lambda: next(counter))
+        pipeline.add_stage('slow', lambda value: (time.sleep(0.05), seen.append(value)))
+        pipeline.start()
+        time.sleep(0.4)
+        pipeline.stop()
+        self.assertGreater(pipeline.stats()['stages']['slow']['queue']['dropped'], 0)
+        self.assertLessEqual(pipeline.stats()['stages']['slow']['queue']['max_depth'], 1)
+        self.assertGreater(seen[-1], len(seen) * 2)
+
+    def test_error_handler_controls_stopping(self):
+        """Errors drop the item; the pipeline stops once the handler says so."""
+        handled = []
+        def handler(error):
+            handled.append(error)
+            return len(handled) < 3
+        def failing(value):
+            raise ValueError("stage failure")
+        pipeline = Pipeline(source_period=0.001, error_handler=handler)
+        pipeline.add_stage('source', lambda: 1).add_stage('failing', failing)
+        pipeline.start()
+        deadline = time.time() + 2
+        while pipeline.running and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(pipeline.running)
+        pipeline.stop()
+        self.assertEqual(len(handled), 3)
+        self.assertEqual(pipeline.stats()['errors'], 3)
+
+class TestOperationPipeline(unittest.TestCase):
+    def test_real_stages_process_a_frame(self):
+        """The stages main.py wires together carry a captured frame through to a decision."""
+        from main import DroneNavigationSystem
+        from sensor import SensorInput
+        from navigation import NavigationSystem
+        from obstacle import ObstacleDetector
+        from perception_gate import PerceptionGate
+        from flight_plan import FlightPlanner
+        from trajectory import TrajectoryGenerator
+        from decision_maker import DecisionMaker
+        camera = MagicMock()
+        camera.read.return_value = (True, np.random.default_rng(0).integers(0, 256, (120, 160, 3), dtype=np.uint8))
+        system = DroneNavigationSystem.__new__(DroneNavigationSystem)  # Without the Tk control panel
+        system.ui = MagicMock()
+        with patch('cv2.VideoCapture', return_value=camera):
+            system.sensor = SensorInput(camera_index=0, lidar_config={})
+        system.navigation = NavigationSystem()
+        with tempfile.NamedTemporaryFile(suffix='.pth') as weights:
+            # Only the checkpoint header is checked up front; the stubbed camera model never loads the weights
+            torch.save({}, weights.name)
+            system.obstacle_detector = ObstacleDetector(weights.name, weights.name)
+        system.obstacle_detector.detect_obstacles_camera = MagicMock(return_value=[])
+        system.perception_gate = PerceptionGate(system.obstacle_detector, navigation=system.navigation)
+        system.flight_planner = FlightPlanner(destination=[100, 100, 100], seed=0)
+        system.trajectory_generator = TrajectoryGenerator(system.flight_planner)
+        system.decision_maker = DecisionMaker()
+        decisions = []
+        pipeline = system.build_pipeline()
+        pipeline.add_stage('record', decisions.append)
+        pipeline.start()
+        deadline = time.time() + 30
+        while not decisions and pipeline.running and time.time() < deadline:
+            time.sleep(0.01)
+        pipeline.stop()
+        self.assertEqual(pipeline.stats()['errors'], 0)
+        self.assertGreaterEqual(len(decisions), 1)
+        self.assertIn(decisions[0], range(6))
+        system.ui.log_data.assert_called()
+
+if __name__ == '__main__':
+    unittest.main()
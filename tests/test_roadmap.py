@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from roadmap import CSRRoadmap
+from exceptions import PathfindingError
+
+class TestCSRRoadmap(unittest.TestCase):
+    def setUp(self):
+        # Square 0-1-2-3 with a costly diagonal 0->2
+        nodes = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=float)
+        sources = np.array([0, 0, 0, 1, 1, 2, 2, 3, 3])
+        targets = np.array([1, 2, 3, 0, 2, 1, 3, 0, 2])
+        weights = np.array([1.0, 5.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        self.roadmap = CSRRoadmap(nodes, sources, targets, weights)
+
+    def test_shortest_path_between_nodes(self):
+        """The search avoids the expensive diagonal."""
+        path, cost = self.roadmap.shortest_path(0, 2)
+        self.assertEqual(cost, 2.0)
+        self.assertIn(path, ([0, 1, 2], [0, 3, 2]))
+
+    def test_weight_updates(self):
+        """In-place weight updates are seen by the next search; blocked edges are never used."""
+        self.roadmap.shortest_path(0, 2)
+        self.roadmap.set_weights([0, 2], np.inf)
+        path, cost = self.roadmap.shortest_path(0, 2)
+        self.assertEqual((path, cost), ([0, 2], 5.0))
+        self.roadmap.set_weights([1], np.inf)
+        with self.assertRaises(PathfindingError):
+            self.roadmap.shortest_path(0, 2)
+
+    def test_connector_endpoints(self):
+        """Off-graph start and goal positions are described by connector indices and weights."""
+        path, cost = self.roadmap.shortest_path((np.array([1, 3]), np.array([0.5, 0.2])), (np.array([0, 2]), np.array([3.0, 0.1])))
+        self.assertEqual(path, [3, 2])
+        self.assertAlmostEqual(cost, 1.3)
+
+    def test_memory_footprint(self):
+        """The compact backend reports its array memory."""
+        self.assertGreater(self.roadmap.nbytes(), 0)
+        self.assertEqual(self.roadmap.number_of_edges(), 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from rts_smoother import RTSSmoother
+from navigation import NavigationSystem
+from exceptions import SensorError
+
+class TestRTSSmoother(unittest.TestCase):
+    def setUp(self):
+        self.smoother = RTSSmoother()
+        self.rng = np.random.default_rng(0)
+
+    def reference(self, measurements):
+        kf = NavigationSystem().kalman_filter
+        means, covariances, _, _ = kf.batch_filter(measurements)
+        smoothed, smoothed_covariances, _, _ = kf.rts_smoother(means, covariances)
+        return (means.reshape(len(measurements), -1), np.diagonal(covariances, axis1=1, axis2=2),
+                smoothed.reshape(len(measurements), -1), np.diagonal(smoothed_covariances, axis1=1, axis2=2))
+
+    def test_matches_filterpy(self):
+        """Filtered and smoothed estimates match filterpy's batch filter and RTS smoother."""
+        for steps in (1, 3, 500):
+            measurements = np.cumsum(self.rng.normal(size=(steps, 6)), axis=0)
+            means, variances, smoothed, smoothed_variances = self.reference(measurements)
+            states, filtered_variances = self.smoother.filter(measurements)
+            np.testing.assert_allclose(states, means, atol=1e-8)
+            np.testing.assert_allclose(filtered_variances, variances, atol=1e-10)
+            states, variances = self.smoother.smooth(measurements)
+            np.testing.assert_allclose(states, smoothed, atol=1e-8)
+            np.testing.assert_allclose(variances, smoothed_variances, atol=1e-10)
+
+    def test_smoothing_reduces_error(self):
+        """Smoothed positions are closer to the true trajectory than the filtered ones."""
+        truth = np.cumsum(np.tile([0.5, -0.2, 0.1], (2000, 1)), axis=0)
+        measurements = np.hstack([truth, np.tile([0.5, -0.2, 0.1], (2000, 1))]) + self.rng.normal(scale=0.3, size=(2000, 6))
+        filtered, _ = self.smoother.filter(measurements)
+        smoothed, _ = self.smoother.smooth(measurements)
+        self.assertLess(np.abs(smoothed[:, :3] - truth).mean(), np.abs(filtered[:, :3] - truth).mean())
+
+    def test_multiple_logs(self):
+        """Logs smoothed in the process pool give the same result as smoothing them one by one."""
+        logs = [np.cumsum(self.rng.normal(size=(steps, 6)), axis=0) for steps in (50, 200)]
+        results = self.smoother.smooth_logs(logs, workers=2)
+        for log, (states, variances) in zip(logs, results):
+            np.testing.assert_allclose(states, self.smoother.smooth(log)[0])
+
+    def test_invalid_logs(self):
+        """Logs with the wrong shape or non-finite values raise SensorError."""
+        with self.assertRaises(SensorError):
+            self.smoother.smooth(np.zeros((10, 3)))
+        log = np.zeros((10, 6))
+        log[4, 2] = np.nan
+        with self.assertRaises(SensorError):
+            self.smoother.smooth(log)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
+import os
+import pty
+import time
 import unittest
 import numpy as np
 import cv2
 from PIL import Image
 from unittest.mock import patch, MagicMock
 from sensor import SensorInput
+from lidar_reader import LidarReader
 from exceptions import SensorError
 
 class TestSensorInput(unittest.TestCase):
@@ -23,6 +27,11 @@ class TestSensorInput(unittest.TestCase):
         frame = self.sensor_input.get_camera_data()
         self.assertIsInstance(frame, Image.Image)
 
+    def test_camera_frame_is_raw(self):
+        """The raw frame accessor returns the BGR ndarray from the camera unchanged."""
+        frame = self.sensor_input.get_camera_frame()
+        self.assertIs(frame, self.mock_camera_instance.read.return_value[1])
+
     def test_camera_data_retrieval_failure(self):
         """Test handling failure in camera data retrieval."""
         self.mock_camera_instance.read.return_value = (False, None)
@@ -40,5 +49,106 @@ class TestSensorInput(unittest.TestCase):
         self.sensor_input.release_resources()
         self.mock_camera_instance.release.assert_called_once()
 
+class TestLidarStreaming(unittest.TestCase):
+    def test_scans_from_configured_port(self):
+        """An existing LiDAR port is streamed from; get_lidar_data returns the latest revolution."""
+        master, slave = pty.openpty()
+        self.addCleanup(os.close, master)
+        self.addCleanup(os.close, slave)
+        with patch('cv2.VideoCapture'):
+            sensor = SensorInput(camera_index=0, lidar_config={'port': os.ttyname(slave), 'timeout': 2.0})
+        self.addCleanup(sensor.lidar.stop)
+        starts = np.tile(np.arange(0.0, 360.0, 12.0), 3)
+        os.write(master, LidarReader.encode_packets(starts, np.full((len(starts), 12), 7.5)))
+        scan = sensor.get_lidar_data()
+        self.assertEqual(scan.shape, (360,))
+        self.assertTrue(np.all(scan == 7.5))
+
+    def test_scans_outlive_the_ring(self):
+        """A returned scan is not overwritten when the reader's ring wraps; the view is opt-in."""
+        with patch('cv2.VideoCapture'):
+            sensor = SensorInput(camera_index=0, lidar_config={})
+        sensor.lidar = LidarReader('unused')
+        starts = np.arange(0.0, 360.0, 12.0)
+        revolution = lambda r: LidarReader.encode_packets(starts, np.full((len(starts), 12), 1.0 + r))
+        sensor.lidar.feed(revolution(0) + revolution(1) + revolution(2))
+        scan, view = sensor.get_lidar_data(), sensor.get_lidar_data(copy=False)
+        self.assertTrue(np.all(scan == 2.0))
+        self.assertFalse(np.shares_memory(scan, sensor.lidar.scans))
+        self.assertTrue(np.shares_memory(view, sensor.lidar.scans))
+        for r in range(3, 8):  # Well past the three slots of the ring
+            sensor.lidar.feed(revolution(r))
+        self.assertTrue(np.all(scan == 2.0))
+        self.assertFalse(np.all(view == 2.0))
+
+class FakeCamera:
+    """Fills the buffer it is given, like cv2.VideoCapture.read(image), with an increasing frame number."""
+    def __init__(self, shape=(48, 64, 3), period=0.002, fail_after=None):
+        self.shape = shape
+        self.period = period
+        self.fail_after = fail_after
+        self.count = 0
+        self.buffers = set()
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        time.sleep(self.period)
+        if self.fail_after is not None and self.count >= self.fail_after:
+            return False, None
+        self.count += 1
+        if image is None:
+            image = np.empty(self.shape, dtype=np.uint8)
+        self.buffers.add(image.__array_interface__['data'][0])
+        image[:] = 0
+        image[..., 0] = self.count % 256  # Blue channel carries the frame number
+        return True, image
+
+    def release(self):
+        pass
+
+class TestBackgroundCapture(unittest.TestCase):
+    def make_sensor(self, camera, **options):
+        with patch('cv2.VideoCapture', return_value=camera):
+            sensor = SensorInput(camera_index=0, lidar_config={}, background_capture=True, **options)
+        self.addCleanup(sensor.grabber.stop)  # release_resources also closes OpenCV windows, which needs a GUI build
+        return sensor
+
+    def test_latest_frame_without_copies(self):
+        """Frames are read into the preallocated ring and handed out as views of it."""
+        camera = FakeCamera()
+        sensor = self.make_sensor(camera, ring_size=3)
+        grabber = sensor.grabber
+        _, _, sequence = grabber.latest()
+        frame, timestamp, newer = grabber.wait_for_frame(sequence)
+        self.assertGreater(newer, sequence)
+        self.assertTrue(np.shares_memory(frame, grabber.ring))
+        self.assertLessEqual(time.monotonic() - timestamp, 1.0)
+        time.sleep(0.05)
+        ring_addresses = {grabber.ring[i].__array_interface__['data'][0] for i in range(3)}
+        self.assertEqual(len(camera.buffers - ring_addresses), 1)  # Only the first, sizing read allocates
+        latest, _ = sensor.get_latest_frame()
+        self.assertIs(sensor.get_camera_frame().base, latest.base)
+
+    def test_colour_conversion_is_optional(self):
+        """Frames stay BGR for the consumer by default, or arrive as RGB when the grabber converts them."""
+        deferred = self.make_sensor(FakeCamera())
+        frame, _ = deferred.get_latest_frame()
+        self.assertEqual(frame[..., 1:].max(), 0)  # Only blue, first in BGR order
+        self.assertEqual(np.asarray(deferred.get_camera_data())[..., :2].max(), 0)  # Converted on request
+        converted = self.make_sensor(FakeCamera(), convert_to_rgb=True)
+        frame, _ = converted.get_latest_frame()
+        self.assertEqual(frame[..., :2].max(), 0)  # Blue is last in RGB order
+        self.assertEqual(np.asarray(converted.get_camera_data())[..., :2].max(), 0)
+
+    def test_capture_failure_is_reported(self):
+        sensor = self.make_sensor(FakeCamera(period=0.0, fail_after=1))
+        sensor.grabber.thread.join(timeout=2)
+        with self.assertRaises(SensorError):
+            sensor.get_camera_frame()
+        with self.assertRaises(SensorError):
+            SensorInput.get_latest_frame(MagicMock(grabber=None))
+
 if __name__ == '__main__':
     unittest.main()
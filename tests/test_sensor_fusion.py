@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from sensor_fusion import SensorFusion
+from exceptions import SensorError
+
+class TestSensorFusion(unittest.TestCase):
+    def setUp(self):
+        self.fusion = SensorFusion(reorder_window=0.02)
+
+    def simulate(self, fusion, measurements):
+        for sensor, timestamp, values in measurements:
+            fusion.add_measurement(sensor, timestamp, values)
+        fusion.flush()
+
+    def flight(self, duration=2.0):
+        """Constant-velocity flight sampled by a 200 Hz IMU, 10 Hz GPS and 20 Hz altimeter."""
+        velocity = np.array([2.0, -1.0, 0.5])
+        measurements = [('imu', t, velocity) for t in np.arange(0, duration, 0.005)]
+        measurements += [('gps', t, velocity * t) for t in np.arange(0, duration, 0.1)]
+        measurements += [('altimeter', t, [velocity[2] * t]) for t in np.arange(0, duration, 0.05)]
+        return sorted(measurements, key=lambda m: m[1]), velocity
+
+    def test_multi_rate_tracking(self):
+        """Partial measurements at different rates recover position and velocity."""
+        measurements, velocity = self.flight()
+        self.simulate(self.fusion, measurements)
+        np.testing.assert_allclose(self.fusion.get_velocity(), velocity, atol=1e-3)
+        np.testing.assert_allclose(self.fusion.get_position(), velocity * self.fusion.time, atol=0.05)
+
+    def test_out_of_sequence_within_window(self):
+        """Measurements arriving out of order within the window give the in-order result."""
+        measurements, _ = self.flight(0.5)
+        shuffled = list(measurements)
+        for index in range(0, len(shuffled) - 1, 2):
+            shuffled[index], shuffled[index + 1] = shuffled[index + 1], shuffled[index]
+        reordered = SensorFusion(reorder_window=0.02)
+        self.simulate(self.fusion, measurements)
+        self.simulate(reordered, shuffled)
+        np.testing.assert_allclose(reordered.state, self.fusion.state)
+        np.testing.assert_allclose(reordered.covariance, self.fusion.covariance)
+        self.assertEqual(reordered.late_measurements, 0)
+
+    def test_late_measurement_is_dropped(self):
+        """A measurement older than the fused state is counted and ignored."""
+        self.fusion.add_measurement('gps', 1.0, [1, 1, 1])
+        self.fusion.add_measurement('gps', 1.1, [1, 1, 1])
+        self.assertEqual(self.fusion.add_measurement('imu', 0.5, [0, 0, 0]), 0)
+        self.assertEqual(self.fusion.late_measurements, 1)
+
+    def test_partial_update_leaves_unobserved_components(self):
+        """An altimeter reading only moves the height estimate."""
+        self.fusion.add_measurement('altimeter', 0.0, [12.0])
+        self.fusion.flush()
+        self.assertAlmostEqual(self.fusion.state[2], 12.0, places=3)
+        np.testing.assert_array_equal(self.fusion.state[[0, 1, 3, 4, 5]], 0.0)
+
+    def test_invalid_measurements(self):
+        """Unknown sensors, wrong lengths and non-finite readings raise SensorError."""
+        with self.assertRaises(SensorError):
+            self.fusion.add_measurement('sonar', 0.0, [1.0])
+        with self.assertRaises(SensorError):
+            self.fusion.add_measurement('gps', 0.0, [1.0, 2.0])
+        with self.assertRaises(SensorError):
+            self.fusion.add_measurement('imu', 0.0, [np.nan, 0.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from unittest.mock import patch, MagicMock
+from sensor import SensorInput
+from sensor_replay import ReplaySensorInput, SessionRecorder
+from exceptions import SensorError
+
+def record_session(directory, frames=10, period=0.1, chunk_size=4):
+    """Frame i is filled with i; LiDAR scans run at half the camera rate; navigation fixes every frame."""
+    with SessionRecorder(directory, chunk_size=chunk_size) as recorder:
+        for i in range(frames):
+            timestamp = 100.0 + i * period
+            recorder.record_camera(np.full((6, 8, 3), i, dtype=np.uint8), timestamp)
+            if i % 2 == 0:
+                recorder.record_lidar(np.full(360, float(i)), timestamp + period / 2)
+            recorder.record_navigation(np.arange(6) + i, timestamp)
+
+class TestSessionRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_chunked_memory_mapped_files(self):
+        record_session(self.directory, frames=10, chunk_size=4)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.directory, 'camera'))),
+                         ['00000.npy', '00000_timestamps.npy', '00001.npy', '00001_timestamps.npy',
+                          '00002.npy', '00002_timestamps.npy'])
+        chunk = np.load(os.path.join(self.directory, 'camera', '00001.npy'), mmap_mode='r')
+        self.assertEqual(chunk.shape, (4, 6, 8, 3))
+        self.assertTrue(np.all(chunk[1] == 5))
+
+    def test_records_must_match(self):
+        with SessionRecorder(self.directory) as recorder:
+            recorder.record_lidar(np.zeros(360), 1.0)
+            with self.assertRaises(SensorError):
+                recorder.record_lidar(np.zeros(180), 2.0)
+            with self.assertRaises(SensorError):
+                recorder.record_lidar(np.zeros(360), 0.5)
+
+    def test_unclosed_session_replays(self):
+        """A recorder that is never closed (crash, power loss) leaves a session that replays every record."""
+        recorder = SessionRecorder(self.directory, chunk_size=4)
+        for i in range(6):
+            recorder.record_camera(np.full((6, 8, 3), i, dtype=np.uint8), 100.0 + i * 0.1)
+        recorder.record_lidar(np.zeros(360), 100.0)
+        recorder.streams['camera']['data'].flush()
+        recorder.streams['camera']['timestamps'].flush()
+        replay = ReplaySensorInput(self.directory)
+        self.assertEqual(len(replay.streams['camera']), 6)
+        self.assertEqual(len(replay.streams['lidar']), 1)
+        frames = []
+        while not replay.exhausted:
+            frames.append(int(replay.get_camera_frame()[0, 0, 0]))
+        self.assertEqual(frames, list(range(6)))
+
+    def test_sensor_input_records_what_it_reads(self):
+        camera = MagicMock()
+        camera.read.return_value = (True, np.full((6, 8, 3), 7, dtype=np.uint8))
+        recorder = SessionRecorder(self.directory)
+        with patch('cv2.VideoCapture', return_value=camera):
+            sensor = SensorInput(camera_index=0, lidar_config={}, recorder=recorder)
+        scans = []
+        for _ in range(3):
+            sensor.get_camera_frame()
+            scans.append(sensor.get_lidar_data())
+        recorder.close()
+        replay = ReplaySensorInput(self.directory)
+        self.assertEqual(len(replay.streams['camera']), 3)
+        for _ in range(3):
+            self.assertTrue(np.all(replay.get_camera_frame() == 7))
+        # At the third frame's time the third scan has not been taken yet
+        np.testing.assert_array_equal(replay.get_lidar_data(), scans[1])
+
+class TestReplaySensorInput(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        record_session(self.directory)
+
+    def test_as_fast_as_possible_is_deterministic(self):
+        """Every frame is replayed in order; the other streams follow the recorded clock."""
+        replay = ReplaySensorInput(self.directory)
+        frames, scans, fixes = [], [], []
+        start = time.perf_counter()
+        while not replay.exhausted:
+            frames.append(int(replay.get_camera_frame()[0, 0, 0]))
+            scans.append(replay.get_lidar_data()[0])
+            fixes.append(replay.get_navigation_data()[0])
+        self.assertLess(time.perf_counter() - start, 0.5)  # The recording spans a second
+        self.assertEqual(frames, list(range(10)))
+        # The scan taken after frame i arrives only with frame i + 1; the first frame falls back to the first scan
+        self.assertEqual(scans, [0, 0, 0, 2, 2, 4, 4, 6, 6, 8])
+        self.assertEqual(fixes, list(range(10)))
+        with self.assertRaises(SensorError):
+            replay.get_camera_frame()
+
+    def test_real_time_pacing(self):
+        """In real time the replay keeps the recorded frame rate (scaled by speed)."""
+        replay = ReplaySensorInput(self.directory, realtime=True, speed=2.0)
+        start = time.perf_counter()
+        frames = [int(replay.get_camera_frame()[0, 0, 0]) for _ in range(5)]
+        elapsed = time.perf_counter() - start
+        self.assertEqual(frames, [0, 1, 2, 3, 4])
+        self.assertGreater(elapsed, 0.18)  # Four 100 ms frame periods at double speed
+        self.assertLess(elapsed, 0.5)
+
+    def test_real_time_skips_frames_for_slow_consumers(self):
+        replay = ReplaySensorInput(self.directory, realtime=True)
+        replay.get_camera_frame()
+        time.sleep(0.33)  # Three frame periods pass while the consumer is busy
+        frame, timestamp = replay.get_latest_frame()
+        self.assertEqual(int(frame[0, 0, 0]), 3)
+        self.assertAlmostEqual(timestamp, 100.3)
+
+    def test_missing_session(self):
+        with self.assertRaises(SensorError):
+            ReplaySensorInput(os.path.join(self.directory, 'missing'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from exceptions import FlightPlanError
+from flight_plan import FlightPlanner
+from trajectory import TrajectoryGenerator
+
+class TestTrajectoryGenerator(unittest.TestCase):
+    def setUp(self):
+        self.planner = FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50], [30, 60, 40]]),
+                                     num_waypoints=500, k_neighbors=8, backend='csr', seed=0)
+        self.generator = TrajectoryGenerator(self.planner, max_velocity=8.0, max_acceleration=2.0, control_rate=50.0)
+        self.path = self.planner.find_path([0, 0, 0])
+
+    def test_shortcut_keeps_endpoints_and_avoids_zones(self):
+        """Shortcutting drops waypoints but keeps the endpoints and clear segments."""
+        points = self.generator.shortcut(self.path)
+        self.assertLessEqual(len(points), len(self.path))
+        np.testing.assert_array_equal(points[0], self.path[0])
+        np.testing.assert_array_equal(points[-1], self.path[-1])
+        self.assertFalse(self.planner.segments_in_no_fly_zone(points[:-1], points[1:]).any())
+
+    def test_limits_are_respected(self):
+        """The sampled trajectory starts and ends at rest and stays within the speed and acceleration limits."""
+        trajectory = self.generator.generate(self.path)
+        self.assertEqual(trajectory.data.shape[1], 7)
+        np.testing.assert_allclose(trajectory.positions[0], self.path[0])
+        np.testing.assert_allclose(trajectory.positions[-1], self.path[-1], atol=1e-6)
+        speeds = np.linalg.norm(trajectory.velocities, axis=1)
+        self.assertEqual(speeds[0], 0.0)
+        self.assertEqual(speeds[-1], 0.0)
+        self.assertLessEqual(speeds.max(), 8.0 + 1e-6)
+        accelerations = np.diff(speeds) * trajectory.rate
+        self.assertLessEqual(np.abs(accelerations).max(), 2.0 * 1.05)
+        self.assertFalse(self.planner.points_in_no_fly_zone(trajectory.positions).any())
+
+    def test_setpoint_lookup_by_time(self):
+        """Setpoints are indexed by elapsed time and hold the final row after the end."""
+        trajectory = self.generator.generate(self.path, start_time=10.0)
+        self.assertEqual(trajectory.data[0, 0], 10.0)
+        position, velocity = trajectory.setpoint(1.0)
+        np.testing.assert_array_equal(position, trajectory.data[50, 1:4])
+        np.testing.assert_array_equal(velocity, trajectory.data[50, 4:7])
+        np.testing.assert_array_equal(trajectory.setpoint(trajectory.duration + 5.0)[0], trajectory.positions[-1])
+
+    def test_curve_is_refitted_out_of_zones(self):
+        """A spline that swings into a zone gets extra knots until it clears the zone."""
+        generator = TrajectoryGenerator(FlightPlanner(destination=[100, 100, 100], no_fly_zones=np.array([[50, 50, 50]]),
+                                                      num_waypoints=20, seed=0))
+        points = np.array([[37.3, 35.3, 50], [43.8, 47.0, 50], [64.1, 37.1, 50], [58.4, 49.3, 50]])
+        curve = generator.fit(points)
+        self.assertGreater(len(curve.x), len(points))
+        self.assertFalse(generator.planner.points_in_no_fly_zone(curve(np.linspace(0, curve.x[-1], 2000))).any())
+
+    def test_single_point_and_invalid_limits(self):
+        """A path that is already at its goal gives one setpoint; non-positive limits raise FlightPlanError."""
+        trajectory = self.generator.generate([(1.0, 2.0, 3.0), (1.0, 2.0, 3.0)])
+        self.assertEqual(len(trajectory), 1)
+        np.testing.assert_array_equal(trajectory.positions[0], [1.0, 2.0, 3.0])
+        with self.assertRaises(FlightPlanError):
+            TrajectoryGenerator(max_velocity=0.0)
+
+if __name__ == '__main__':
+    unittest.main()